@@ -1,8 +1,104 @@
-floor = 0
-with open('input.txt') as f:
-  while (byte := f.read(1)):
-    match byte:
-      case '(': floor += 1
-      case ')': floor -= 1
-      case _: raise RuntimeError(f'Unexpected byte: {byte}')
-print(floor)
\ No newline at end of file
+import numpy as np
+import argparse
+import unittest
+import tempfile
+import typing
+import sys
+import io
+import os
+
+import reader
+import parens
+
+CHUNK_SIZE = 1 << 20 # characters per read
+WINDOW_SIZE = 1 << 18 # bytes compared at a time, small enough to stay in cache
+
+def byte_windows(stream: typing.TextIO) -> typing.Iterator[np.ndarray]:
+  """The stream's bytes as uint8 arrays of up to WINDOW_SIZE, viewed straight from the page cache for regular files"""
+  for view in reader.views(stream, WINDOW_SIZE):
+    yield np.frombuffer(view, dtype=np.uint8)
+
+def count_byte_moves(window: np.ndarray, scratch: np.ndarray) -> tuple[int, int]:
+  """parens.count_moves() over a window of bytes, comparing into scratch instead of allocating a mask per window"""
+  mask = scratch[:len(window)]
+  up = int(np.count_nonzero(np.equal(window, parens.UP, out=mask)))
+  down = int(np.count_nonzero(np.equal(window, parens.DOWN, out=mask)))
+  if up + down != len(window):
+    raise parens.unexpected(window, int(np.flatnonzero((window != parens.UP) & (window != parens.DOWN))[0]))
+  return up, down
+
+def final_floor(stream: typing.TextIO) -> int:
+  floor = 0
+  scratch = np.empty(WINDOW_SIZE, dtype=np.bool_)
+  for window in byte_windows(stream):
+    up, down = count_byte_moves(window, scratch)
+    floor += up - down
+  return floor
+
+def final_floor_reference(stream: typing.TextIO) -> int:
+  floor = 0
+  while (chunk := stream.read(CHUNK_SIZE)):
+    up, down = parens.count_moves(chunk)
+    floor += up - down
+  return floor
+
+class Tests(unittest.TestCase):
+  def test_final_floor(self):
+    for text, floor in [('', 0), ('(())', 0), ('(((', 3), ('))(((((', 3), (')())())', -3)]:
+      self.assertEqual(final_floor(io.StringIO(text)), floor)
+    self.assertRaises(RuntimeError, lambda: final_floor(io.StringIO('(()\n')))
+    
+  def test_byte_windows(self):
+    text = '(()' * WINDOW_SIZE
+    with tempfile.TemporaryDirectory() as tmp:
+      path = os.path.join(tmp, 'input.txt')
+      with open(path, 'w') as f:
+        f.write(text)
+      with open(path) as f:
+        self.assertIsNotNone(reader.mapped(f))
+        self.assertEqual(final_floor(f), WINDOW_SIZE)
+        
+    # a pipe can be neither mapped nor sought, so it is read through the text layer that may already hold some of it
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b'(()' * 100)
+    os.close(write_fd)
+    with open(read_fd) as f:
+      self.assertIsNone(reader.mapped(f))
+      self.assertEqual(f.read(3), '(()')
+      self.assertEqual(final_floor(f), 99)
+      
+    # as does a file something has already started reading
+    with tempfile.TemporaryDirectory() as tmp:
+      path = os.path.join(tmp, 'input.txt')
+      with open(path, 'w') as f:
+        f.write('((' * 100)
+      with open(path) as f:
+        self.assertEqual(f.read(3), '(((')
+        self.assertIsNone(reader.mapped(f))
+        self.assertIsNone(reader.binary(f))
+        self.assertEqual(final_floor(f), 197)
+      
+    self.assertEqual([len(window) for window in byte_windows(io.StringIO('(' * (WINDOW_SIZE + 1)))], [WINDOW_SIZE, 1])
+    with self.assertRaisesRegex(RuntimeError, 'Unexpected byte: é'):
+      final_floor(io.StringIO('(' * WINDOW_SIZE + '()é'))
+
+def solve(stream: typing.TextIO) -> int:
+  return final_floor(stream)
+
+# str.count over decoded chunks, kept as the reference the byte engine is checked against
+def solve_reference(stream: typing.TextIO) -> int:
+  return final_floor_reference(stream)
+
+ENGINES = {'reference': solve_reference}
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
+  if args.test:
+    unittest.main(argv=[sys.argv[0]])
+  else:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
@@ -1,12 +1,291 @@
-floor = 0
-p = 0
-with open('input.txt') as f:
-  while (byte := f.read(1)):
-    p += 1
+import concurrent.futures
+import collections
+import numpy as np
+import argparse
+import unittest
+import tempfile
+import random
+import typing
+import json
+import mmap
+import sys
+import io
+import os
+
+import reader
+import parens
+
+CHUNK_SIZE = 1 << 20 # characters per read
+WINDOW_SIZE = 1 << 20 # bytes summarised at a time
+BLOCK_SIZE = 32 # moves per block when working out a window's lowest floor, few enough for int8 running sums
+SPAN_SIZE = 1 << 26 # bytes a worker summarises per task, files of a single span are summarised in process
+
+class Summary(typing.NamedTuple):
+  """What a window of moves does to the floor, over its bytes up to the first one that is not a parenthesis"""
+  delta: int
+  # the lowest floor reached relative to the start of the window, 0 when it never goes below it, or only -downs when
+  # the window was summarised knowing it could not reach the basement
+  lowest: int
+  bad: typing.Optional[int] # index of the first unexpected byte
+
+def walk_to_basement(chunk: str, floor: int) -> tuple[int, typing.Optional[int]]:
+  """Walks the chunk one byte at a time, returning the floor it ends on, or where in the chunk (1-based) it first
+  reaches the basement"""
+  for p, byte in enumerate(chunk, 1):
     match byte:
       case '(': floor += 1
       case ')': floor -= 1
       case _: raise RuntimeError(f"Unexpected byte: {byte}")
     if floor == -1:
-      print(p)
-      break
\ No newline at end of file
+      return floor, p
+  return floor, None
+
+def floors(window: np.ndarray) -> np.ndarray:
+  """The floor after each move in the window, relative to its start"""
+  return np.cumsum(np.int8(parens.MIDPOINT) - 2 * window.view(np.int8), dtype=np.int64)
+
+def lowest_floor(window: np.ndarray) -> int:
+  """min(floors(window)) and 0, but from running sums kept for every BLOCK_SIZE block of the window at once, several
+  times faster than a single np.cumsum over the whole window"""
+  body = len(window) // BLOCK_SIZE * BLOCK_SIZE
+  lowest = floor = 0
+  if body:
+    # row i holds the i-th move of every block
+    moves = np.int8(parens.MIDPOINT) - 2 * np.ascontiguousarray(window[:body].reshape(-1, BLOCK_SIZE).T).view(np.int8)
+    block_floor = moves[0].copy()
+    block_lowest = block_floor.copy()
+    for row in moves[1:]:
+      block_floor += row
+      np.minimum(block_lowest, block_floor, out=block_lowest)
+    starts = np.cumsum(block_floor, dtype=np.int64) - block_floor
+    lowest = min(lowest, int((starts + block_lowest).min()))
+    floor = int(starts[-1] + block_floor[-1])
+  if body < len(window):
+    lowest = min(lowest, floor + int(floors(window[body:]).min()))
+  return lowest
+
+def summarize(window: np.ndarray, floor: typing.Optional[int] = None) -> Summary:
+  """Summarises the window, skipping the lowest floor when the walk is known to start on a floor it cannot bring
+  down to the basement"""
+  up, down = int(np.count_nonzero(window == parens.UP)), int(np.count_nonzero(window == parens.DOWN))
+  bad = None
+  if up + down != len(window):
+    bad = int(np.flatnonzero((window != parens.UP) & (window != parens.DOWN))[0])
+    window = window[:bad]
+    up, down = int(np.count_nonzero(window == parens.UP)), int(np.count_nonzero(window == parens.DOWN))
+  lowest = -down if floor is not None and floor - down >= 0 else lowest_floor(window)
+  return Summary(delta=up - down, lowest=lowest, bad=bad)
+
+def summarize_span(path: str, start: int, stop: int) -> list[Summary]:
+  """Summarises the windows of a span of the file, run in a worker that maps the file for itself"""
+  with open(path, 'rb') as f:
+    view = np.frombuffer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), dtype=np.uint8)
+    return [summarize(view[offset:min(offset + WINDOW_SIZE, stop)]) for offset in range(start, stop, WINDOW_SIZE)]
+
+def window_summaries(
+  stream: typing.TextIO,
+  *,
+  workers: typing.Optional[int] = None,
+  span_size: int = SPAN_SIZE,
+) -> typing.Iterator[tuple[int, np.ndarray, Summary]]:
+  """(offset, window, summary) for every window of the stream in order. A mapped file of more than one span has its
+  spans summarised by a process pool, a few spans ahead of the one being consumed. Windows summarised in this
+  process know the floor they start on, so those that cannot reach the basement skip their lowest floor."""
+  workers = workers or os.cpu_count() or 1
+  data = reader.mapped(stream)
+  path = reader.mapped_path(stream) if data is not None else None
+  if data is None or path is None or workers < 2 or len(data) <= span_size:
+    del data # views() maps the file again when it can
+    floor = offset = 0
+    for chunk in reader.views(stream, WINDOW_SIZE):
+      window = np.frombuffer(chunk, dtype=np.uint8)
+      summary = summarize(window, floor)
+      yield offset, window, summary
+      floor += summary.delta
+      offset += len(window)
+    return
+  
+  view = np.frombuffer(data, dtype=np.uint8)
+  spans = iter(range(0, len(view), span_size))
+  with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+    pending: collections.deque[tuple[int, concurrent.futures.Future[list[Summary]]]] = collections.deque()
+    
+    def submit_next() -> None:
+      if (start := next(spans, None)) is not None:
+        pending.append((start, executor.submit(summarize_span, path, start, min(start + span_size, len(view)))))
+        
+    for _ in range(2 * workers):
+      submit_next()
+    try:
+      while pending:
+        start, future = pending.popleft()
+        submit_next()
+        for offset, summary in zip(range(start, len(view), WINDOW_SIZE), future.result()):
+          yield offset, view[offset:offset + WINDOW_SIZE], summary
+    finally:
+      # stopping early, the spans still queued are not needed
+      for _, future in pending:
+        future.cancel()
+
+def basement_in(window: np.ndarray, floor: int) -> int:
+  """Where in the window (1-based) the walk starting on floor first reaches the basement, which it must"""
+  return int(np.argmax(floors(window) <= -1 - floor)) + 1
+
+def first_basement_position(
+  stream: typing.TextIO,
+  *,
+  workers: typing.Optional[int] = None,
+  span_size: int = SPAN_SIZE,
+) -> typing.Optional[int]:
+  floor = 0
+  for offset, window, summary in window_summaries(stream, workers=workers, span_size=span_size):
+    if floor + summary.lowest <= -1:
+      return offset + basement_in(window, floor)
+    if summary.bad is not None:
+      raise parens.unexpected(window, summary.bad)
+    floor += summary.delta
+  return None
+
+def floor_and_first_basement_position(stream: typing.TextIO) -> tuple[int, typing.Optional[int]]:
+  floor = 0
+  basement_p: typing.Optional[int] = None
+  for offset, window, summary in window_summaries(stream):
+    if basement_p is None and floor + summary.lowest <= -1:
+      basement_p = offset + basement_in(window, floor)
+    if summary.bad is not None:
+      raise parens.unexpected(window, summary.bad)
+    floor += summary.delta
+  return floor, basement_p
+
+class TrackerState(typing.TypedDict):
+  floor: int
+  consumed: int # bytes fed so far
+  basement_p: typing.Optional[int]
+
+class FloorTracker:
+  """The floor and first basement position of a stream handed over a chunk at a time, for inputs that keep growing.
+  Each chunk costs only its own length, and state() is all another process needs to pick up where this one stopped."""
+  __slots__ = ('floor', 'consumed', 'basement_p')
+  
+  def __init__(self, floor: int = 0, consumed: int = 0, basement_p: typing.Optional[int] = None):
+    self.floor = floor
+    self.consumed = consumed
+    self.basement_p = basement_p
+    
+  @classmethod
+  def restore(cls, state: TrackerState) -> 'FloorTracker':
+    return cls(state['floor'], state['consumed'], state['basement_p'])
+    
+  def state(self) -> TrackerState:
+    return TrackerState(floor=self.floor, consumed=self.consumed, basement_p=self.basement_p)
+    
+  def feed(self, chunk: typing.Union[bytes, str]) -> None:
+    """Moves on past the chunk. A chunk with an unexpected byte raises RuntimeError and leaves the tracker as it was,
+    so the producer can resend it corrected."""
+    data = chunk.encode() if isinstance(chunk, str) else chunk
+    floor, basement_p = self.floor, self.basement_p
+    for offset in range(0, len(data), WINDOW_SIZE):
+      window = np.frombuffer(data, dtype=np.uint8, count=min(WINDOW_SIZE, len(data) - offset), offset=offset)
+      summary = summarize(window, floor)
+      if summary.bad is not None:
+        raise parens.unexpected(window, summary.bad)
+      if basement_p is None and floor + summary.lowest <= -1:
+        basement_p = self.consumed + offset + basement_in(window, floor)
+      floor += summary.delta
+    self.floor, self.consumed, self.basement_p = floor, self.consumed + len(data), basement_p
+    
+def first_basement_position_reference(stream: typing.TextIO) -> typing.Optional[int]:
+  floor = 0
+  p = 0
+  while (chunk := stream.read(CHUNK_SIZE)):
+    if floor - chunk.count(')') >= 0:
+      # the basement is out of reach within this chunk, counting is enough
+      up, down = parens.count_moves(chunk)
+      floor += up - down
+    else:
+      floor, basement_p = walk_to_basement(chunk, floor)
+      if basement_p is not None:
+        return p + basement_p
+    p += len(chunk)
+  return None
+
+class Tests(unittest.TestCase):
+  def test_first_basement_position(self):
+    for text, p in [('', None), (')', 1), ('()())', 5), ('(((', None), ('())(', 3)]:
+      self.assertEqual(first_basement_position(io.StringIO(text)), p)
+      self.assertEqual(first_basement_position_reference(io.StringIO(text)), p)
+      
+    # an unexpected byte only counts if it comes before the basement
+    self.assertEqual(first_basement_position(io.StringIO('())x')), 3)
+    self.assertRaises(RuntimeError, lambda: first_basement_position(io.StringIO('(x))')))
+    self.assertEqual(floor_and_first_basement_position(io.StringIO('())((')), (1, 3))
+    self.assertRaises(RuntimeError, lambda: floor_and_first_basement_position(io.StringIO('())x')))
+    
+  def test_window_summaries(self):
+    self.assertEqual(summarize(np.frombuffer(b'(()))(', dtype=np.uint8)), Summary(delta=0, lowest=-1, bad=None))
+    self.assertEqual(summarize(np.frombuffer(b'((x)', dtype=np.uint8)), Summary(delta=2, lowest=0, bad=2))
+    self.assertEqual(summarize(np.frombuffer(b'(()))(', dtype=np.uint8), 3), Summary(delta=0, lowest=-3, bad=None))
+    
+    moves = np.array(random.Random(1).choices(b'()', k=5 * BLOCK_SIZE + 7), dtype=np.uint8)
+    for stop in [0, 1, BLOCK_SIZE, 3 * BLOCK_SIZE + 1, len(moves)]:
+      self.assertEqual(lowest_floor(moves[:stop]), min([0, *floors(moves[:stop])]))
+      
+    # the basement is first reached in the first window of the third span
+    text = '(' * (2 * WINDOW_SIZE) + ')' * (2 * WINDOW_SIZE + 1) + '()' * (WINDOW_SIZE // 2)
+    with tempfile.TemporaryDirectory() as tmp:
+      path = os.path.join(tmp, 'input.txt')
+      with open(path, 'w') as f:
+        f.write(text)
+      for workers in [1, 2]:
+        with open(path) as f:
+          self.assertEqual(first_basement_position(f, workers=workers, span_size=2 * WINDOW_SIZE), 4 * WINDOW_SIZE + 1)
+      with open(path) as f:
+        self.assertEqual(floor_and_first_basement_position(f), (-1, 4 * WINDOW_SIZE + 1))
+      with open(path) as f:
+        f.read(1) # the text layer now holds more than it handed out, which the binary buffer is past
+        self.assertIsNone(reader.binary(f))
+        self.assertEqual(first_basement_position(f), 4 * WINDOW_SIZE - 1) # one up fewer to walk back down
+        
+  def test_floor_tracker(self):
+    text = '((()' + ')' * 5 + '(' * 3
+    tracker = FloorTracker()
+    for start in range(0, len(text), 5):
+      tracker.feed(text[start:start + 5].encode())
+    self.assertEqual(tracker.state(), TrackerState(floor=0, consumed=12, basement_p=7))
+    self.assertEqual((tracker.floor, tracker.basement_p), floor_and_first_basement_position(io.StringIO(text)))
+    
+    # picked up from its serialized state, it carries on as if it had never stopped
+    resumed = FloorTracker.restore(json.loads(json.dumps(FloorTracker(consumed=3, floor=3).state())))
+    resumed.feed(')' * 4)
+    self.assertEqual(resumed.state(), TrackerState(floor=-1, consumed=7, basement_p=7))
+    
+    self.assertRaises(RuntimeError, lambda: resumed.feed('))\n'))
+    self.assertEqual(resumed.state(), TrackerState(floor=-1, consumed=7, basement_p=7))
+    resumed.feed('')
+    self.assertEqual(resumed.consumed, 7)
+    
+def solve_both(stream: typing.TextIO) -> tuple[int, typing.Optional[int]]:
+  return floor_and_first_basement_position(stream)
+
+def solve(stream: typing.TextIO) -> typing.Optional[int]:
+  return first_basement_position(stream)
+
+# walks byte by byte once the basement is within reach of a decoded chunk, kept as the reference the windowed
+# prefix minimum is checked against
+def solve_reference(stream: typing.TextIO) -> typing.Optional[int]:
+  return first_basement_position_reference(stream)
+
+ENGINES = {'reference': solve_reference}
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
+  if args.test:
+    unittest.main(argv=[sys.argv[0]])
+  else:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      if (p := solve(f)) is not None:
+        print(p)
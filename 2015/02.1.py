@@ -1,10 +1,48 @@
-w_sqft = 0
-with open('input.txt') as f:
-  line = f.readline()
-  while line:
+import numpy as np
+import unittest
+import typing
+import sys
+import io
+
+import presents
+
+def wrapping_paper_sqft_reference(stream: typing.TextIO) -> int:
+  w_sqft = 0
+  for line in stream:
     l, w, h = map(lambda x: int(x), line.strip().split('x'))
     s_areas = (2*l*w, 2*l*h, 2*w*h)
-    w_total = sum(s_areas) + (min(s_areas) / 2)
+    w_total = sum(s_areas) + (min(s_areas) // 2)
     w_sqft += w_total
-    line = f.readline()
-print(w_sqft)
\ No newline at end of file
+  return w_sqft
+
+class Tests(unittest.TestCase):
+  def test_paper_sqft(self):
+    for text, sqft in [('2x3x4\n', 58), ('1x1x10', 43), ('2x3x4\n1x1x10\n', 101), ('', 0)]:
+      self.assertEqual(solve(io.StringIO(text)), sqft)
+      self.assertEqual(solve_reference(io.StringIO(text)), sqft)
+      self.assertEqual(solve_streaming(io.StringIO(text)), sqft)
+    self.assertRaises(RuntimeError, lambda: solve(io.StringIO('2x3x4\n1x1\n')))
+
+def parse(stream: typing.TextIO) -> np.ndarray:
+  return presents.read_sides(stream)
+
+def solve_parsed(sides: np.ndarray) -> int:
+  return presents.paper_sqft(sides)
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
+
+# splits and sums one line at a time, kept as the reference the columnar engine is checked against
+def solve_reference(stream: typing.TextIO) -> int:
+  return wrapping_paper_sqft_reference(stream)
+
+# the same blocks totalled as they are read, for manifests too large to hold as an array
+def solve_streaming(stream: typing.TextIO) -> int:
+  return presents.streamed_total(stream, presents.paper_sqft)
+
+ENGINES = {'reference': solve_reference, 'streaming': solve_streaming}
+
+if __name__ == '__main__':
+  path = sys.argv[1] if len(sys.argv) > 1 else 'input.txt' # - reads stdin
+  with (sys.stdin if path == '-' else open(path)) as f:
+    print(solve(f))
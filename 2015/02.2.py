@@ -1,3 +1,11 @@
+import numpy as np
+import unittest
+import typing
+import sys
+import io
+
+import presents
+
 # ribbon:
 #   shortest distance around sides
 #   or
@@ -6,11 +14,10 @@
 # bow:
 #   cubic feet of volume of the present
 
-total_ft = 0
-
-with open('input.txt') as f:
-  line = f.readline()
-  while line:
+def ribbon_ft_reference(stream: typing.TextIO) -> int:
+  total_ft = 0
+  
+  for line in stream:
     l, w, h = map(lambda x: int(x), line.strip().split('x'))
     
     # ribbon
@@ -22,6 +29,39 @@ with open('input.txt') as f:
     bow_ft = l * w * h # volume of present
     total_ft += bow_ft
     
-    line = f.readline()
-    
-print(total_ft)
\ No newline at end of file
+  return total_ft
+
+class Tests(unittest.TestCase):
+  def test_ribbon_ft(self):
+    for text, ft in [('2x3x4\n', 34), ('1x1x10', 14), ('2x3x4\n1x1x10\n', 48), ('', 0)]:
+      self.assertEqual(solve(io.StringIO(text)), ft)
+      self.assertEqual(solve_reference(io.StringIO(text)), ft)
+      self.assertEqual(solve_streaming(io.StringIO(text)), ft)
+    self.assertEqual(solve_both(parse(io.StringIO('2x3x4\n1x1x10\n'))), (101, 48))
+
+def parse(stream: typing.TextIO) -> np.ndarray:
+  return presents.read_sides(stream)
+
+def solve_parsed(sides: np.ndarray) -> int:
+  return presents.ribbon_ft(sides)
+
+def solve_both(sides: np.ndarray) -> tuple[int, int]:
+  return presents.paper_sqft_and_ribbon_ft(sides)
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
+
+# splits, sorts and sums one line at a time, kept as the reference the columnar engine is checked against
+def solve_reference(stream: typing.TextIO) -> int:
+  return ribbon_ft_reference(stream)
+
+# the same blocks totalled as they are read, for manifests too large to hold as an array
+def solve_streaming(stream: typing.TextIO) -> int:
+  return presents.streamed_total(stream, presents.ribbon_ft)
+
+ENGINES = {'reference': solve_reference, 'streaming': solve_streaming}
+
+if __name__ == '__main__':
+  path = sys.argv[1] if len(sys.argv) > 1 else 'input.txt' # - reads stdin
+  with (sys.stdin if path == '-' else open(path)) as f:
+    print(solve(f))
@@ -1,31 +1,100 @@
-visited: set[tuple[int, int]] = set()
-s_x = s_y = 0 # Santa
-rb_x = rb_y = 0 # Robot Santa
-rb_turn = False
-with open('input.txt') as f:
-  while (byte := f.read(1)):
-    match byte:
-      case '>':
-        if rb_turn:
-          rb_x += 1
-        else:
-          s_x += 1
-      case '<':
-        if rb_turn:
-          rb_x -= 1
-        else:
-          s_x -= 1
-      case '^':
-        if rb_turn:
-          rb_y += 1
-        else:
-          s_y += 1
-      case 'v':
-        if rb_turn:
-          rb_y -= 1
-        else:
-          s_y -= 1
-      case _: raise RuntimeError(f'Unexpected byte: {byte}')
-    visited.add((rb_x, rb_y) if rb_turn else (s_x, s_y))
-    rb_turn = not rb_turn
-print(len(visited))
\ No newline at end of file
+import numpy as np
+import unittest
+import typing
+import sys
+import io
+
+import reader
+import grids
+
+CHUNK_SIZE = 1 << 16 # bytes, or characters for the reference, per read
+
+# per byte moves, bytes that are not a direction are left invalid
+DX = np.zeros(256, dtype=np.int64)
+DY = np.zeros(256, dtype=np.int64)
+VALID = np.zeros(256, dtype=np.bool_)
+for direction, dx, dy in [('>', 1, 0), ('<', -1, 0), ('^', 0, 1), ('v', 0, -1)]:
+  DX[ord(direction)], DY[ord(direction)], VALID[ord(direction)] = dx, dy, True
+
+def chunk_bytes(chunk: memoryview) -> np.ndarray:
+  data = np.frombuffer(chunk, dtype=np.uint8)
+  if not (valid := VALID[data]).all():
+    bad = int(np.argmin(valid))
+    raise RuntimeError(f'Unexpected byte: {bytes(data[bad:bad + 4]).decode(errors="replace")[0]}')
+  return data
+
+def positions(data: np.ndarray, x: int, y: int) -> tuple[np.ndarray, np.ndarray]:
+  """The xs and ys of every house visited on the moves in data starting from (x, y)"""
+  return x + np.cumsum(DX[data]), y + np.cumsum(DY[data])
+
+def count_visited(stream: typing.TextIO) -> int:
+  visited = grids.Marks()
+  houses = [(0, 0), (0, 0)] # where Santa and Robot Santa are
+  read = 0 # moves before this chunk, Santa takes the even ones and Robot Santa the odd ones
+  for chunk in reader.views(stream, CHUNK_SIZE):
+    data = chunk_bytes(chunk)
+    for turn in (0, 1):
+      if len(moves := data[(turn - read) % 2::2]):
+        xs, ys = positions(moves, *houses[turn])
+        houses[turn] = (int(xs[-1]), int(ys[-1]))
+        visited.mark(xs, ys)
+    read += len(chunk)
+  return len(visited)
+
+def count_visited_reference(stream: typing.TextIO) -> int:
+  visited: set[tuple[int, int]] = set()
+  s_x = s_y = 0 # Santa
+  rb_x = rb_y = 0 # Robot Santa
+  rb_turn = False
+  while (chunk := stream.read(CHUNK_SIZE)):
+    for byte in chunk:
+      match byte:
+        case '>':
+          if rb_turn:
+            rb_x += 1
+          else:
+            s_x += 1
+        case '<':
+          if rb_turn:
+            rb_x -= 1
+          else:
+            s_x -= 1
+        case '^':
+          if rb_turn:
+            rb_y += 1
+          else:
+            s_y += 1
+        case 'v':
+          if rb_turn:
+            rb_y -= 1
+          else:
+            s_y -= 1
+        case _: raise RuntimeError(f'Unexpected byte: {byte}')
+      visited.add((rb_x, rb_y) if rb_turn else (s_x, s_y))
+      rb_turn = not rb_turn
+  return len(visited)
+
+class Tests(unittest.TestCase):
+  def test_count_visited(self):
+    for text, expected in [('>', 1), ('^v', 2), ('^>v<', 3), ('^v^v^v^v^v', 10), ('>' * 5 + '<' * 5, 5)]:
+      self.assertEqual(count_visited(io.StringIO(text)), expected)
+      self.assertEqual(count_visited_reference(io.StringIO(text)), expected)
+    self.assertRaises(RuntimeError, lambda: count_visited(io.StringIO('^>\n')))
+    
+  def test_chunks(self):
+    text = '^>v<<<vv>>' * (CHUNK_SIZE // 4) # spans several reads
+    self.assertEqual(count_visited(io.StringIO(text)), count_visited_reference(io.StringIO(text)))
+
+def solve(stream: typing.TextIO) -> int:
+  return count_visited(stream)
+
+# the set of coordinate tuples walked byte by byte, kept as the reference the array engine is checked against
+def solve_reference(stream: typing.TextIO) -> int:
+  return count_visited_reference(stream)
+
+ENGINES = {'reference': solve_reference}
+
+if __name__ == '__main__':
+  path = sys.argv[1] if len(sys.argv) > 1 else 'input.txt' # - reads stdin
+  with (sys.stdin if path == '-' else open(path)) as f:
+    print(solve(f))
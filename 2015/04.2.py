@@ -1,12 +1,26 @@
 import hashlib
+import typing
+import sys
 
-input = 'yzbqklnj'
-guess = 1
+INPUTS: list[str] = [] # puzzle input is the secret key below, solve() also takes it as an optional stream
+SECRET_KEY = 'yzbqklnj'
 
 def md5(s: str) -> str:
   return hashlib.md5(s.encode('utf-8')).hexdigest()
 
-while not md5(input+str(guess)).startswith('000000'):
-  guess += 1
+def lowest_guess(secret_key: str) -> int:
+  guess = 1
+  while not md5(secret_key+str(guess)).startswith('000000'):
+    guess += 1
+  return guess
 
-print(guess)
\ No newline at end of file
+def solve(stream: typing.Optional[typing.TextIO] = None) -> int:
+  return lowest_guess(stream.read().strip() if stream else SECRET_KEY)
+
+if __name__ == '__main__':
+  # an input file, or - for stdin, replaces the secret key above
+  if len(sys.argv) > 1:
+    with (sys.stdin if sys.argv[1] == '-' else open(sys.argv[1])) as f:
+      print(solve(f))
+  else:
+    print(solve())
@@ -1,7 +1,13 @@
-nice = 0
-with open('input.txt') as f:
-  s = f.readline().strip()
-  while s:
+import typing
+import sys
+
+import reader
+
+def count_nice(stream: typing.TextIO) -> int:
+  nice = 0
+  for line in reader.lines(stream):
+    if not (s := line.strip()):
+      break
     vowels = 0
     rtwice = False
     passed = True
@@ -20,5 +26,12 @@ with open('input.txt') as f:
         break
     if passed and vowels >= 3 and rtwice:
       nice += 1
-    s = f.readline().strip()
-print(nice)
\ No newline at end of file
+  return nice
+
+def solve(stream: typing.TextIO) -> int:
+  return count_nice(stream)
+
+if __name__ == '__main__':
+  path = sys.argv[1] if len(sys.argv) > 1 else 'input.txt' # - reads stdin
+  with (sys.stdin if path == '-' else open(path)) as f:
+    print(solve(f))
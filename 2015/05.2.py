@@ -1,7 +1,13 @@
-nice_ctn = 0
-with open('input.txt') as f:
-  s = f.readline().strip()
-  while s:
+import typing
+import sys
+
+import reader
+
+def count_nice(stream: typing.TextIO) -> int:
+  nice_ctn = 0
+  for line in reader.lines(stream):
+    if not (s := line.strip()):
+      break
     pair_repeat = False
     pairs_seen: list[str] = []
     repeat_around_1_letter = False
@@ -15,5 +21,12 @@ with open('input.txt') as f:
       if pair_repeat and repeat_around_1_letter:
         nice_ctn += 1
         break
-    s = f.readline().strip()
-print(nice_ctn)
\ No newline at end of file
+  return nice_ctn
+
+def solve(stream: typing.TextIO) -> int:
+  return count_nice(stream)
+
+if __name__ == '__main__':
+  path = sys.argv[1] if len(sys.argv) > 1 else 'input.txt' # - reads stdin
+  with (sys.stdin if path == '-' else open(path)) as f:
+    print(solve(f))
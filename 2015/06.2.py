@@ -1,13 +1,49 @@
-from typing import TextIO
+from typing import NamedTuple, TextIO
 from enum import Enum
 from io import StringIO
+import numpy as np
+import argparse
+import unittest
 import sys
+import re
+
+import reader
+import grids
 
 class Action(Enum):
   ON = 1
   OFF = 2
   TOGGLE = 3
 
+GRID_SIZE = 1000
+ACTION_PATTERN = re.compile(
+  r'^(turn on|turn off|toggle) (\d+),(\d+) through (\d+),(\d+)$|^(?P<invalid>[^\n]+)$',
+  re.MULTILINE,
+)
+ACTIONS = {'turn on': Action.ON, 'turn off': Action.OFF, 'toggle': Action.TOGGLE}
+
+class Instruction(NamedTuple):
+  action: Action
+  x1: int
+  y1: int
+  x2: int
+  y2: int
+
+def parse_instructions(stream: TextIO, *, size: int = GRID_SIZE) -> list[Instruction]:
+  instructions: list[Instruction] = []
+  for match in ACTION_PATTERN.finditer(reader.read_text(stream)):
+    action, *coords, invalid = match.groups()
+    if invalid:
+      raise RuntimeError(f'Unexpected line: "{invalid}"')
+    
+    c1x, c1y, c2x, c2y = map(int, coords)
+    if c1x > c2x or c1y > c2y:
+      raise RuntimeError(f'Coords given not in lower right to upper left format: ({c1x}, {c1y}), ({c2x}, {c2y})')
+    if c2x >= size or c2y >= size:
+      raise RuntimeError(f'Coords given outside the {size}x{size} grid: ({c2x}, {c2y})')
+    instructions.append(Instruction(ACTIONS[action], c1x, c1y, c2x, c2y))
+  return instructions
+
 def count_lit_cnt(actions_io: TextIO, grid: list[list[int]]) -> int:
   brightness = 0
   
@@ -61,40 +97,69 @@ def count_lit_cnt(actions_io: TextIO, grid: list[list[int]]) -> int:
     line = actions_io.readline()
     
   return brightness
-    
-test = False
-    
-if __name__ == '__main__':
-  if test:
+
+def total_brightness_dense(stream: TextIO, *, size: int = GRID_SIZE) -> int:
+  """Applies each instruction to a whole rectangle of an int32 grid at once"""
+  cells = grids.empty(size, size, np.int32)
+  for action, c1x, c1y, c2x, c2y in parse_instructions(stream, size=size):
+    lights = grids.rect(cells, c1x, c1y, c2x, c2y)
+    match action:
+      case Action.ON:
+        grids.add(lights, 1)
+      case Action.OFF:
+        grids.add(lights, -1, minimum=0)
+      case Action.TOGGLE:
+        grids.add(lights, 2)
+  return int(cells.sum(dtype=np.int64))
+
+class Tests(unittest.TestCase):
+  def test_count_lit_cnt(self):
     def make_grid(x: int, y: int) -> list[list[int]]:
       return [[0 for _ in range(x)] for _ in range(y)]
     
-    actual = count_lit_cnt(StringIO(''), make_grid(3, 3))
-    if actual != 0:
-      raise RuntimeError(f"Expected {0} but got {actual}")
-    
-    actual = count_lit_cnt(StringIO('turn off 0,0 through 2,2'), make_grid(3, 3))
-    if actual != 0:
-      raise RuntimeError(f"Expected {0} but got {actual}")
-    
-    actual = count_lit_cnt(StringIO('turn on 0,0 through 2,2'), make_grid(3, 3))
-    if actual != 9:
-      raise RuntimeError(f"Expected {9} but got {actual}")
+    self.assertEqual(count_lit_cnt(StringIO(''), make_grid(3, 3)), 0)
+    self.assertEqual(count_lit_cnt(StringIO('turn off 0,0 through 2,2'), make_grid(3, 3)), 0)
+    self.assertEqual(count_lit_cnt(StringIO('turn on 0,0 through 2,2'), make_grid(3, 3)), 9)
+    self.assertEqual(count_lit_cnt(StringIO('turn on 0,0 through 2,2\nturn on 0,0 through 2,2'), make_grid(3, 3)), 18)
+    self.assertEqual(count_lit_cnt(StringIO('toggle 0,0 through 2,2'), make_grid(3, 3)), 18)
+    self.assertEqual(count_lit_cnt(StringIO('turn on 0,0 through 1,1\nturn off 0,0 through 0,1'), make_grid(3, 3)), 2)
     
-    actual = count_lit_cnt(StringIO('turn on 0,0 through 2,2\nturn on 0,0 through 2,2'), make_grid(3, 3))
-    if actual != 18:
-      raise RuntimeError(f"Expected {18} but got {actual}")
+  def test_total_brightness_dense(self):
+    self.assertEqual(total_brightness_dense(StringIO(''), size=3), 0)
+    self.assertEqual(total_brightness_dense(StringIO('turn off 0,0 through 2,2'), size=3), 0)
+    self.assertEqual(total_brightness_dense(StringIO('turn on 0,0 through 2,2'), size=3), 9)
+    self.assertEqual(total_brightness_dense(StringIO('turn on 0,0 through 2,2\nturn on 0,0 through 2,2'), size=3), 18)
+    self.assertEqual(total_brightness_dense(StringIO('toggle 0,0 through 2,2'), size=3), 18)
+    self.assertEqual(total_brightness_dense(StringIO('turn on 0,0 through 1,1\nturn off 0,0 through 0,1'), size=3), 2)
     
-    actual = count_lit_cnt(StringIO('toggle 0,0 through 2,2'), make_grid(3, 3))
-    if actual != 18:
-      raise RuntimeError(f"Expected {18} but got {actual}")
+    self.assertRaises(RuntimeError, lambda: total_brightness_dense(StringIO('turn on 0,0 through 3,1'), size=3))
+    self.assertRaises(RuntimeError, lambda: total_brightness_dense(StringIO('turn on 2,2 through 1,1'), size=3))
+    self.assertRaises(RuntimeError, lambda: total_brightness_dense(StringIO('turn up 0,0 through 1,1'), size=3))
+    self.assertRaises(RuntimeError, lambda: total_brightness_dense(StringIO('turn on 0,0 through 1,1 and 2,2'), size=3))
     
-    actual = count_lit_cnt(StringIO('turn on 0,0 through 1,1\nturn off 0,0 through 0,1'), make_grid(3, 3))
-    if actual != 2:
-      raise RuntimeError(f"Expected {2} but got {actual}")
-    
-    print('All tests passed!')
-    sys.exit()
-    
-  with open('input.txt') as f:
-    print(count_lit_cnt(f, [[False for _ in range(1000)] for _ in range(1000)]))
\ No newline at end of file
+  def test_parse_instructions(self):
+    self.assertEqual(
+      parse_instructions(StringIO('toggle 0,1 through 2,3\nturn off 4,5 through 6,7\n')),
+      [Instruction(Action.TOGGLE, 0, 1, 2, 3), Instruction(Action.OFF, 4, 5, 6, 7)],
+    )
+
+def solve(stream: TextIO) -> int:
+  return total_brightness_dense(stream)
+
+# the cell by cell list grid, kept as the reference the dense engine is checked against
+def solve_reference(stream: TextIO) -> int:
+  return count_lit_cnt(stream, [[False for _ in range(1000)] for _ in range(1000)])
+
+ENGINES = {'reference': solve_reference}
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
+  if args.test:
+    unittest.main(argv=[sys.argv[0]])
+  else:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
@@ -1,102 +1,117 @@
 import collections
 import argparse
+import unittest
 import typing
 import pprint
 import sys
 import io
 import re
 
+import reader
+
 uint16max = (1 << 16) - 1
 
+# a gate per line: a signal or wire, NOT of one, or a binary operator over two, wired to a destination
+GATE_PATTERN = re.compile(
+  r'^(?:(?:(?P<left>\w+) )?(?P<op>AND|OR|LSHIFT|RSHIFT|NOT) )?(?P<right>\w+) -> (?P<dest>\w+)$'
+  r'|^(?P<invalid>[^\n]+)$',
+  re.MULTILINE,
+)
+
+class Gate(typing.NamedTuple):
+  op: str # SET for a plain signal or wire
+  inputs: tuple[str, ...] # wire names or literal signals
+  dest: str
+
+def parse_gates(stream: typing.TextIO) -> list[Gate]:
+  gates: list[Gate] = []
+  for match in GATE_PATTERN.finditer(reader.read_text(stream)):
+    left, op, right, dest, invalid = match.groups()
+    if invalid or (op is not None and (left is None) != (op == 'NOT')):
+      raise RuntimeError(f'Invalid instruction: "{match.group()}"')
+    gates.append(Gate(op=op or 'SET', inputs=(left, right) if left else (right,), dest=dest))
+  return gates
+
 def assemble(instructions: typing.TextIO) -> dict[str, int]:
+  return assemble_gates(parse_gates(instructions))
+
+def assemble_gates(parsed: list[Gate]) -> dict[str, int]:
   wire_map: dict[str, int] = {}
-  lines: collections.deque[str] = collections.deque()
-  
-  if line := instructions.readline().strip():
-    lines.append(line)
+  gates = collections.deque(parsed)
   
   def get(x: str) -> typing.Optional[int]:
     if x == 'b': return 46065
     return int(x) if x.isdigit() else wire_map.get(x)
   
-  def parse_instruction(line: str) -> typing.Optional[tuple[str, int]]:
-    if match := re.match(r'(\w+) -> (\w+)', line):
-      src, dest = match.groups()
-      val = get(src)
-      if val is not None:
-        return dest, val
-    elif match := re.match(r'NOT (\w+) -> (\w+)', line):
-      src, dest = match.groups()
-      val = get(src)
-      if val is not None:
-        return dest, ~val & uint16max
-    elif match := re.match(r'(\w+) AND (\w+) -> (\w+)', line):
-      src1, src2, dest = match.groups()
-      val1, val2 = get(src1), get(src2)
-      if val1 is not None and val2 is not None:
-        return dest, (val1 & val2) & uint16max
-    elif match := re.match(r'(\w+) OR (\w+) -> (\w+)', line):
-      src1, src2, dest = match.groups()
-      val1, val2 = get(src1), get(src2)
-      if val1 is not None and val2 is not None:
-        return dest, (val1 | val2) & uint16max
-    elif match := re.match(r'(\w+) LSHIFT (\d+) -> (\w+)', line):
-      src, n, dest = match.groups()
-      val = get(src)
-      if val is not None:
-        return dest, (val << int(n)) & uint16max
-    elif match := re.match(r'(\w+) RSHIFT (\d+) -> (\w+)', line):
-      src, n, dest = match.groups()
-      val = get(src)
-      if val is not None:
-        return dest, (val >> int(n)) & uint16max
-    else:
+  def evaluate(gate: Gate) -> typing.Optional[int]:
+    values = [get(x) for x in gate.inputs]
+    if None in values:
       return None # not calculable yet
+    match gate.op, values:
+      case 'SET', [val]: return val
+      case 'NOT', [val]: return ~val & uint16max
+      case 'AND', [val1, val2]: return (val1 & val2) & uint16max
+      case 'OR', [val1, val2]: return (val1 | val2) & uint16max
+      case 'LSHIFT', [val, n]: return (val << n) & uint16max
+      case 'RSHIFT', [val, n]: return (val >> n) & uint16max
+      case _: raise RuntimeError(f'Unknown gate: {gate}')
     
-  while lines:
-    line = lines.popleft()
+  while gates:
+    gate = gates.popleft()
     
-    result = parse_instruction(line)
-    if result:
-      dest, value = result
-      wire_map[dest] = value
+    value = evaluate(gate)
+    if value is not None:
+      wire_map[gate.dest] = value
     else:
-      lines.append(line) # try again later
-      
-    if line := instructions.readline().strip():
-      lines.append(line)
+      gates.append(gate) # try again later
   
   return wire_map
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
-
-if __name__ == '__main__':
-  if args.test:
-    def assert_equal(expected: typing.Any, actual: typing.Any) -> None:
-      if expected != actual:
-        raise RuntimeError(f'Expected {expected} but got {actual}')
-      
-    # sanity
-    assert_equal({'x': 1}, assemble(io.StringIO('1 -> x')))
-  
-    # given in order
-    assert_equal({'x': 1, 'y': 2, 'z': 0}, assemble(io.StringIO('1 -> x\n2 -> y\nx AND y -> z')))
-    assert_equal({'x': 1, 'y': 2, 'z': 3}, assemble(io.StringIO('1 -> x\n2 -> y\nx OR y -> z')))
-    assert_equal({'x': 1, 'y': 4}, assemble(io.StringIO('1 -> x\nx LSHIFT 2 -> y')))
-    assert_equal({'x': 1, 'y': 0}, assemble(io.StringIO('1 -> x\nx RSHIFT 2 -> y')))
-    assert_equal({'x': 1, 'y': 65534}, assemble(io.StringIO('1 -> x\nNOT x -> y')))
+class Tests(unittest.TestCase):
+  def test_sanity(self):
+    self.assertEqual(assemble(io.StringIO('1 -> x')), {'x': 1})
     
-    # give out of order
-    assert_equal({'x': 1, 'y': 2, 'z': 0}, assemble(io.StringIO('x AND y -> z\n1 -> x\n2 -> y')))
-    assert_equal({'x': 1, 'y': 2, 'z': 3}, assemble(io.StringIO('x OR y -> z\n1 -> x\n2 -> y')))
-    assert_equal({'x': 1, 'y': 4}, assemble(io.StringIO('x LSHIFT 2 -> y\n1 -> x')))
-    assert_equal({'x': 1, 'y': 0}, assemble(io.StringIO('x RSHIFT 2 -> y\n1 -> x')))
-    assert_equal({'x': 1, 'y': 65534}, assemble(io.StringIO('NOT x -> y\n1 -> x')))
+  def test_in_order(self):
+    self.assertEqual(assemble(io.StringIO('1 -> x\n2 -> y\nx AND y -> z')), {'x': 1, 'y': 2, 'z': 0})
+    self.assertEqual(assemble(io.StringIO('1 -> x\n2 -> y\nx OR y -> z')), {'x': 1, 'y': 2, 'z': 3})
+    self.assertEqual(assemble(io.StringIO('1 -> x\nx LSHIFT 2 -> y')), {'x': 1, 'y': 4})
+    self.assertEqual(assemble(io.StringIO('1 -> x\nx RSHIFT 2 -> y')), {'x': 1, 'y': 0})
+    self.assertEqual(assemble(io.StringIO('1 -> x\nNOT x -> y')), {'x': 1, 'y': 65534})
     
-    print('All tests passed!')
-    sys.exit()
+  def test_out_of_order(self):
+    self.assertEqual(assemble(io.StringIO('x AND y -> z\n1 -> x\n2 -> y')), {'x': 1, 'y': 2, 'z': 0})
+    self.assertEqual(assemble(io.StringIO('x OR y -> z\n1 -> x\n2 -> y')), {'x': 1, 'y': 2, 'z': 3})
+    self.assertEqual(assemble(io.StringIO('x LSHIFT 2 -> y\n1 -> x')), {'x': 1, 'y': 4})
+    self.assertEqual(assemble(io.StringIO('x RSHIFT 2 -> y\n1 -> x')), {'x': 1, 'y': 0})
+    self.assertEqual(assemble(io.StringIO('NOT x -> y\n1 -> x')), {'x': 1, 'y': 65534})
     
-  with open('input.txt') as f:
-    pprint.pprint(assemble(f)['a'])
\ No newline at end of file
+  def test_parse_gates(self):
+    self.assertEqual(parse_gates(io.StringIO('123 -> x\nNOT x -> h\nx LSHIFT 2 -> f\n')), [
+      Gate(op='SET', inputs=('123',), dest='x'),
+      Gate(op='NOT', inputs=('x',), dest='h'),
+      Gate(op='LSHIFT', inputs=('x', '2'), dest='f'),
+    ])
+    self.assertRaises(RuntimeError, lambda: parse_gates(io.StringIO('x XOR y -> z')))
+    self.assertRaises(RuntimeError, lambda: parse_gates(io.StringIO('x NOT y -> z')))
+    self.assertRaises(RuntimeError, lambda: parse_gates(io.StringIO('x -> y z')))
+
+def parse(stream: typing.TextIO) -> list[Gate]:
+  return parse_gates(stream)
+
+def solve_parsed(gates: list[Gate]) -> int:
+  return assemble_gates(gates)['a']
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
+  if args.test:
+    unittest.main(argv=[sys.argv[0]])
+  else:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      pprint.pprint(solve(f))
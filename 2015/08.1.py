@@ -1,4 +1,5 @@
 import argparse
+import unittest
 import typing
 import sys
 import io
@@ -7,22 +8,27 @@ def next_line_raw_to_memory_ch_diff(stream: typing.TextIO) -> typing.Optional[in
   line = stream.readline().strip()
   return len(line) - len(eval(line)) if line else None
   
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+class Tests(unittest.TestCase):
+  def test_next_line_raw_to_memory_ch_diff(self):
+    self.assertEqual(next_line_raw_to_memory_ch_diff(io.StringIO('""')), 2)
+    self.assertEqual(next_line_raw_to_memory_ch_diff(io.StringIO('"abc"')), 2)
+    self.assertEqual(next_line_raw_to_memory_ch_diff(io.StringIO('"aaa\\"aaa"')), 3)
+    self.assertEqual(next_line_raw_to_memory_ch_diff(io.StringIO('"\\x27"')), 5)
+
+def solve(stream: typing.TextIO) -> int:
+  diff_total = 0
+  while diff := next_line_raw_to_memory_ch_diff(stream):
+    diff_total += diff
+  return diff_total
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
-    assert next_line_raw_to_memory_ch_diff(io.StringIO('""')) == 2
-    assert next_line_raw_to_memory_ch_diff(io.StringIO('"abc"')) == 2
-    assert next_line_raw_to_memory_ch_diff(io.StringIO('"aaa\\"aaa"')) == 3
-    assert next_line_raw_to_memory_ch_diff(io.StringIO('"\\x27"')) == 5
-    
-    print('All tests passed!')
-    sys.exit()
-    
-  with open('input.txt') as f:
-    diff_total = 0
-    while diff := next_line_raw_to_memory_ch_diff(f):
-      diff_total += diff
-    print(diff_total)
\ No newline at end of file
+    unittest.main(argv=[sys.argv[0]])
+  else:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
@@ -1,4 +1,5 @@
 import argparse
+import unittest
 import typing
 import sys
 import io
@@ -13,26 +14,27 @@ def next_line_encode_ch_diff(stream: typing.TextIO) -> typing.Optional[int]:
   return 2 + len(newline) - len(line)
   
   
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+class Tests(unittest.TestCase):
+  def test_next_line_encode_ch_diff(self):
+    self.assertEqual(next_line_encode_ch_diff(io.StringIO('""')), 4)
+    self.assertEqual(next_line_encode_ch_diff(io.StringIO('"abc"')), 4)
+    self.assertEqual(next_line_encode_ch_diff(io.StringIO('"aaa\\"aaa"')), 6)
+    self.assertEqual(next_line_encode_ch_diff(io.StringIO('"\\x27"')), 5)
+
+def solve(stream: typing.TextIO) -> int:
+  diff_total = 0
+  while diff := next_line_encode_ch_diff(stream):
+    diff_total += diff
+  return diff_total
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
-    def assert_equal(expected: typing.Any, actual: typing.Any) -> None:
-      if actual != expected:
-        raise RuntimeError(f'Expected {expected} but got {actual}')
-    
-    assert_equal(4, next_line_encode_ch_diff(io.StringIO('""')))
-    assert_equal(4, next_line_encode_ch_diff(io.StringIO('"abc"')))
-    assert_equal(6, next_line_encode_ch_diff(io.StringIO('"aaa\\"aaa"')))
-    assert_equal(5, next_line_encode_ch_diff(io.StringIO('"\\x27"')))
-    
-    print('All tests passed!')
-    sys.exit()
-    
-  with open('input.txt') as f:
-    diff_total = 0
-    while diff := next_line_encode_ch_diff(f):
-      diff_total += diff
-    print(diff_total)
\ No newline at end of file
+    unittest.main(argv=[sys.argv[0]])
+  else:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
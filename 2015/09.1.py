@@ -1,29 +1,82 @@
 import argparse
+import unittest
 import textwrap
 import typing
 import sys
 import io
 import re
 
+import search
+import reader
+
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
+
+# a route per line, lines the format does not cover fall through to the invalid group
+DISTANCE_PATTERN = re.compile(r'^(\w+) to (\w+) = (\d+)$|^(?P<invalid>[^\n]+)$', re.MULTILINE)
+
+Distances: typing.TypeAlias = dict[tuple[str, str], int] # keyed both ways round
+
 def shortest_route_dist(stream: typing.TextIO) -> int:
-  distances: dict[tuple[str, str], int] = {}
-  for line in stream:
-    match = re.match(r'(\w+) to (\w+) = (\d+)', line)
-    if not match: raise RuntimeError(f'Expected to find match in "{line}"')
-    
-    place1, place2, dist = match.groups()
-    distances[(place1, place2)] = int(dist)
-    distances[(place2, place1)] = int(dist)
-    
+  return shortest_route(parse_distances(stream))
+
+class Routes:
+  """Routes as a state space. A state is (the index of the city the route ends at, a bitmask of the cities it has
+  visited), and the route starts from START before any city, at whichever city it likes for free."""
+  START = (-1, 0)
+  
+  def __init__(self, distances: Distances) -> None:
+    self.cities = sorted(set(c for c, _ in distances))
+    index = {city: i for i, city in enumerate(self.cities)}
+    self.everywhere = (1 << len(self.cities)) - 1
+    self.legs: list[list[tuple[int, int]]] = [[] for _ in self.cities] # city -> (next city, distance)
+    for (frm, to), dist in distances.items():
+      self.legs[index[frm]].append((index[to], dist))
+      
+  def successors(self, state: tuple[int, int]) -> list[tuple[int, tuple[int, int]]]:
+    last, visited = state
+    if last < 0:
+      return [(0, (i, 1 << i)) for i in range(len(self.cities))]
+    return [(dist, (i, visited | 1 << i)) for i, dist in self.legs[last] if not visited >> i & 1]
+  
+  def is_complete(self, state: tuple[int, int]) -> bool:
+    return state[1] == self.everywhere
+  
+  def legs_left(self, state: tuple[int, int]) -> int:
+    return max(len(self.cities) - max(state[1].bit_count(), 1), 0)
+
+def shortest_route(distances: Distances) -> int:
+  routes = Routes(distances)
+  shortest_leg = min(distances.values(), default=0)
+  shortest = search.least_cost(
+    Routes.START,
+    routes.successors,
+    routes.is_complete,
+    heuristic=lambda state: routes.legs_left(state) * shortest_leg, # no leg left can be shorter
+    stats=STATS,
+  )
+  if shortest is None:
+    raise RuntimeError('No route visits every city')
+  return shortest
+
+# every ordering of the cities tried in turn, kept as the reference the search is checked against
+def shortest_route_reference(distances: Distances) -> int:
   cities = list(set(c for c, _ in distances.keys()))
   
   currRoute: set[str] = set()
   shortest = float('inf')
+  stats = STATS
   
   def dfs(dist: int, last: typing.Optional[str] = None) -> None:
     nonlocal shortest
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], len(currRoute))
     if len(currRoute) == len(cities):
-      shortest = min(shortest, dist)
+      if dist < shortest:
+        shortest = dist
+        if stats is not None:
+          stats['bound_updates'] += 1
       return
     
     for c in cities:
@@ -39,27 +92,69 @@ def shortest_route_dist(stream: typing.TextIO) -> int:
   dfs(0)
   return int(shortest)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def parse_distances(stream: typing.TextIO) -> Distances:
+  distances: Distances = {}
+  for match in DISTANCE_PATTERN.finditer(reader.read_text(stream)):
+    place1, place2, dist, invalid = match.groups()
+    if invalid: raise RuntimeError(f'Expected to find match in "{invalid}"')
+    
+    distances[(place1, place2)] = int(dist)
+    distances[(place2, place1)] = int(dist)
+  return distances
 
-if __name__ == '__main__':
-  if args.test:
-    def assert_equal(expected: typing.Any, actual: typing.Any) -> None:
-      if actual != expected:
-        raise RuntimeError(f'Expected {expected} but got {actual}')
-      
-    assert_equal(2, shortest_route_dist(io.StringIO(textwrap.dedent("""\
+class Tests(unittest.TestCase):
+  def test_parse_distances(self):
+    self.assertEqual(parse_distances(io.StringIO('a to b = 1\r\n')), {('a', 'b'): 1, ('b', 'a'): 1})
+    self.assertRaises(RuntimeError, lambda: parse_distances(io.StringIO('a to b = 1 km')))
+    
+  def test_shortest_route_dist(self):
+    self.assertEqual(shortest_route_dist(io.StringIO(textwrap.dedent("""\
       a to b = 1
       a to c = 5
-      b to c = 1"""))))
-    assert_equal(2, shortest_route_dist(io.StringIO(textwrap.dedent("""\
+      b to c = 1"""))), 2)
+    self.assertEqual(shortest_route_dist(io.StringIO(textwrap.dedent("""\
       a to b = 5
       a to c = 1
-      b to c = 1"""))))
+      b to c = 1"""))), 2)
     
-    print('All tests passed!')
-    sys.exit()
+  def test_shortest_route(self):
+    distances = {(a, b): abs(ord(a) - ord(b)) ** 2 % 7 + 1 for a in 'abcdef' for b in 'abcdef' if a != b}
+    self.assertEqual(shortest_route(distances), shortest_route_reference(distances))
+    self.assertEqual(shortest_route({}), 0)
     
-  with open('input.txt') as f:
-    print(shortest_route_dist(f))
\ No newline at end of file
+    disconnected = {('a', 'b'): 1, ('b', 'a'): 1, ('c', 'd'): 1, ('d', 'c'): 1}
+    self.assertRaises(RuntimeError, lambda: shortest_route(disconnected))
+    
+  def test_routes(self):
+    routes = Routes({('a', 'b'): 3, ('b', 'a'): 3, ('b', 'c'): 4, ('c', 'b'): 4})
+    self.assertEqual(routes.successors(Routes.START), [(0, (0, 0b001)), (0, (1, 0b010)), (0, (2, 0b100))])
+    self.assertEqual(routes.successors((1, 0b010)), [(3, (0, 0b011)), (4, (2, 0b110))])
+    self.assertEqual(routes.successors((0, 0b011)), []) # a only leads back to b
+    self.assertEqual([routes.legs_left(state) for state in [Routes.START, (1, 0b010), (2, 0b111)]], [2, 2, 0])
+    self.assertTrue(routes.is_complete((2, 0b111)))
+
+def parse(stream: typing.TextIO) -> Distances:
+  return parse_distances(stream)
+
+def solve_parsed(distances: Distances) -> int:
+  return shortest_route(distances)
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
+
+def solve_reference(stream: typing.TextIO) -> int:
+  return shortest_route_reference(parse_distances(stream))
+
+ENGINES = {'reference': solve_reference}
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
+  if args.test:
+    unittest.main(argv=[sys.argv[0]])
+  else:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
@@ -1,29 +1,133 @@
 import argparse
+import unittest
 import textwrap
 import typing
 import sys
 import io
 import re
 
+import search
+import reader
+
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
+
+# a route per line, lines the format does not cover fall through to the invalid group
+DISTANCE_PATTERN = re.compile(r'^(\w+) to (\w+) = (\d+)$|^(?P<invalid>[^\n]+)$', re.MULTILINE)
+
+Distances: typing.TypeAlias = dict[tuple[str, str], int] # keyed both ways round
+
 def shortest_route_dist(stream: typing.TextIO) -> int:
-  distances: dict[tuple[str, str], int] = {}
-  for line in stream:
-    match = re.match(r'(\w+) to (\w+) = (\d+)', line)
-    if not match: raise RuntimeError(f'Expected to find match in "{line}"')
-    
-    place1, place2, dist = match.groups()
-    distances[(place1, place2)] = int(dist)
-    distances[(place2, place1)] = int(dist)
-    
+  return longest_route(parse_distances(stream))
+
+class Routes:
+  """Routes as a state space. A state is (the index of the city the route ends at, a bitmask of the cities it has
+  visited), and the route starts from START before any city, at whichever city it likes for free."""
+  START = (-1, 0)
+  
+  def __init__(self, distances: Distances) -> None:
+    self.cities = sorted(set(c for c, _ in distances))
+    index = {city: i for i, city in enumerate(self.cities)}
+    self.everywhere = (1 << len(self.cities)) - 1
+    self.legs: list[list[tuple[int, int]]] = [[] for _ in self.cities] # city -> (next city, distance)
+    for (frm, to), dist in distances.items():
+      self.legs[index[frm]].append((index[to], dist))
+      
+  def successors(self, state: tuple[int, int]) -> list[tuple[int, tuple[int, int]]]:
+    last, visited = state
+    if last < 0:
+      return [(0, (i, 1 << i)) for i in range(len(self.cities))]
+    return [(dist, (i, visited | 1 << i)) for i, dist in self.legs[last] if not visited >> i & 1]
+  
+  def is_complete(self, state: tuple[int, int]) -> bool:
+    return state[1] == self.everywhere
+  
+  def legs_left(self, state: tuple[int, int]) -> int:
+    return max(len(self.cities) - max(state[1].bit_count(), 1), 0)
+
+def shortest_route(distances: Distances) -> int:
+  routes = Routes(distances)
+  shortest_leg = min(distances.values(), default=0)
+  shortest = search.least_cost(
+    Routes.START,
+    routes.successors,
+    routes.is_complete,
+    heuristic=lambda state: routes.legs_left(state) * shortest_leg, # no leg left can be shorter
+    stats=STATS,
+  )
+  if shortest is None:
+    raise RuntimeError('No route visits every city')
+  return shortest
+
+def longest_route(distances: Distances) -> int:
+  routes = Routes(distances)
+  longest_leg = max(distances.values(), default=0)
+  longest = search.most_gain(
+    Routes.START,
+    routes.successors,
+    routes.is_complete,
+    bound=lambda state: routes.legs_left(state) * longest_leg, # no leg left can be longer
+    stats=STATS,
+  )
+  if longest is None:
+    raise RuntimeError('No route visits every city')
+  return longest
+
+def route_dists(stream: typing.TextIO) -> tuple[int, int]:
+  return route_extremes(parse_distances(stream))
+
+def route_extremes(distances: Distances) -> tuple[int, int]:
+  """Shortest (part 1) and longest (part 2) route distances from one traversal of the route states. The shortest and
+  longest ways to finish from a state do not depend on how it was reached, so each state's pair is worked out once
+  from its successors' and shared by every route through it."""
+  routes = Routes(distances)
+  stats = STATS
+  finishes: dict[tuple[int, int], typing.Optional[tuple[int, int]]] = {} # state -> (shortest, longest) left, if any
+  
+  def visit(state: tuple[int, int], depth: int) -> typing.Optional[tuple[int, int]]:
+    if state in finishes:
+      if stats is not None:
+        stats['pruned'] += 1
+      return finishes[state]
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], depth)
+      
+    if routes.is_complete(state):
+      finish: typing.Optional[tuple[int, int]] = (0, 0)
+    else:
+      ways = [
+        (dist + rest[0], dist + rest[1])
+        for dist, successor in routes.successors(state)
+        if (rest := visit(successor, depth + 1)) is not None
+      ]
+      finish = (min(way[0] for way in ways), max(way[1] for way in ways)) if ways else None
+    finishes[state] = finish
+    return finish
+  
+  extremes = visit(Routes.START, 0)
+  if extremes is None:
+    raise RuntimeError('No route visits every city')
+  return extremes
+
+# every ordering of the cities tried in turn, kept as the reference the search is checked against
+def longest_route_reference(distances: Distances) -> int:
   cities = list(set(c for c, _ in distances.keys()))
   
   currRoute: set[str] = set()
   longest = -float('inf')
+  stats = STATS
   
   def dfs(dist: int, last: typing.Optional[str] = None) -> None:
     nonlocal longest
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], len(currRoute))
     if len(currRoute) == len(cities):
-      longest = max(longest, dist)
+      if dist > longest:
+        longest = dist
+        if stats is not None:
+          stats['bound_updates'] += 1
       return
     
     for c in cities:
@@ -39,27 +143,71 @@ def shortest_route_dist(stream: typing.TextIO) -> int:
   dfs(0)
   return int(longest)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def parse_distances(stream: typing.TextIO) -> Distances:
+  distances: Distances = {}
+  for match in DISTANCE_PATTERN.finditer(reader.read_text(stream)):
+    place1, place2, dist, invalid = match.groups()
+    if invalid: raise RuntimeError(f'Expected to find match in "{invalid}"')
+    
+    distances[(place1, place2)] = int(dist)
+    distances[(place2, place1)] = int(dist)
+  return distances
 
-if __name__ == '__main__':
-  if args.test:
-    def assert_equal(expected: typing.Any, actual: typing.Any) -> None:
-      if actual != expected:
-        raise RuntimeError(f'Expected {expected} but got {actual}')
-      
-    assert_equal(7, shortest_route_dist(io.StringIO(textwrap.dedent("""\
+class Tests(unittest.TestCase):
+  def test_shortest_route_dist(self):
+    self.assertEqual(shortest_route_dist(io.StringIO(textwrap.dedent("""\
       a to b = 2
       a to c = 5
-      b to c = 1"""))))
-    assert_equal(7, shortest_route_dist(io.StringIO(textwrap.dedent("""\
+      b to c = 1"""))), 7)
+    self.assertEqual(shortest_route_dist(io.StringIO(textwrap.dedent("""\
+      a to b = 5
+      a to c = 2
+      b to c = 1"""))), 7)
+    
+  def test_route_dists(self):
+    self.assertEqual(route_dists(io.StringIO(textwrap.dedent("""\
       a to b = 5
       a to c = 2
-      b to c = 1"""))))
+      b to c = 1"""))), (3, 7))
+    distances = {(a, b): abs(ord(a) - ord(b)) ** 3 % 11 + 1 for a in 'abcdefg' for b in 'abcdefg' if a != b}
+    self.assertEqual(route_extremes(distances), (shortest_route(distances), longest_route(distances)))
+    self.assertEqual(route_extremes({}), (0, 0))
+    disconnected = {('a', 'b'): 1, ('b', 'a'): 1, ('c', 'd'): 1, ('d', 'c'): 1}
+    self.assertRaises(RuntimeError, lambda: route_extremes(disconnected))
     
-    print('All tests passed!')
-    sys.exit()
+  def test_longest_route(self):
+    distances = {(a, b): abs(ord(a) - ord(b)) ** 2 % 7 + 1 for a in 'abcdef' for b in 'abcdef' if a != b}
+    self.assertEqual(longest_route(distances), longest_route_reference(distances))
+    self.assertEqual(longest_route({}), 0)
     
-  with open('input.txt') as f:
-    print(shortest_route_dist(f))
\ No newline at end of file
+    disconnected = {('a', 'b'): 1, ('b', 'a'): 1, ('c', 'd'): 1, ('d', 'c'): 1}
+    self.assertRaises(RuntimeError, lambda: longest_route(disconnected))
+
+def parse(stream: typing.TextIO) -> Distances:
+  return parse_distances(stream)
+
+def solve_parsed(distances: Distances) -> int:
+  return longest_route(distances)
+
+def solve_both(distances: Distances) -> tuple[int, int]:
+  return route_extremes(distances)
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
+
+def solve_reference(stream: typing.TextIO) -> int:
+  return longest_route_reference(parse_distances(stream))
+
+ENGINES = {'reference': solve_reference}
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
+  if args.test:
+    unittest.main(argv=[sys.argv[0]])
+  else:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
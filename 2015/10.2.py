@@ -1,7 +1,10 @@
 import argparse
+import unittest
 import typing
 import sys
 
+INPUTS: list[str] = [] # puzzle input is hard-coded in solve(), which also takes it as an optional stream
+
 def look_and_say(digits: str) -> str:
   newStr = ''
   
@@ -22,26 +25,30 @@ def look_and_say(digits: str) -> str:
     
   return newStr
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
-
-if __name__ == '__main__':
-  if args.test:
-    def assert_equal(expected: typing.Any, actual: typing.Any) -> None:
-      if actual != expected:
-        raise RuntimeError(f'Expected {expected} but got {actual}')
-    
-    assert_equal('11', look_and_say('1'))
-    assert_equal('21', look_and_say('11'))
-    assert_equal('1211', look_and_say('21'))
-    assert_equal('111221', look_and_say('1211'))
-    assert_equal('312211', look_and_say('111221'))
-    
-    print('All tests passed!')
-    sys.exit()
+class Tests(unittest.TestCase):
+  def test_look_and_say(self):
+    self.assertEqual(look_and_say('1'), '11')
+    self.assertEqual(look_and_say('11'), '21')
+    self.assertEqual(look_and_say('21'), '1211')
+    self.assertEqual(look_and_say('1211'), '111221')
+    self.assertEqual(look_and_say('111221'), '312211')
 
-  curr = '3113322113'
+def solve(stream: typing.Optional[typing.TextIO] = None) -> int:
+  curr = stream.read().strip() if stream else '3113322113'
   for _ in range(50):
     curr = look_and_say(curr)
-  print(len(curr))
\ No newline at end of file
+  return len(curr)
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', help='puzzle input file, - for stdin, instead of the one in solve()')
+  args = arg_parser.parse_args()
+  
+  if args.test:
+    unittest.main(argv=[sys.argv[0]])
+  elif args.input:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
+  else:
+    print(solve())
@@ -1,7 +1,10 @@
 import argparse
+import unittest
 import typing
 import sys
 
+INPUTS: list[str] = [] # puzzle input is hard-coded in solve(), which also takes it as an optional stream
+
 ALPHABET_LOWER = [chr(unicode) for unicode in range(97, 123)]
 
 def valid_password(password: str) -> bool:
@@ -56,40 +59,40 @@ def next_password(password: str) -> str:
     if valid_password(password):
       return password
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+class Tests(unittest.TestCase):
+  def test_valid_password(self):
+    # unit cases
+    self.assertFalse(valid_password('bcdffaa')) # too short
+    self.assertFalse(valid_password('abcdffaaa')) # too long
+    self.assertFalse(valid_password('accdffaa')) # missing increasing straight of 3 letters
+    self.assertFalse(valid_password('abciffaa')) # contains i
+    self.assertFalse(valid_password('abcoffaa')) # contains o
+    self.assertFalse(valid_password('abclffaa')) # contains l
+    self.assertFalse(valid_password('abcdffxz')) # missing non-overlapping pairs of letters
+    self.assertFalse(valid_password('abcdehah')) # two of the same letters are not pairs if they are not touching
+    
+    # real world
+    self.assertTrue(valid_password('abcdffaa'))
+    self.assertTrue(valid_password('ghjaabcc'))
+    
+  def test_next_password(self):
+    # real world
+    self.assertEqual(next_password('abcdefgh'), 'abcdffaa')
+    self.assertEqual(next_password('ghijklmn'), 'ghjaabcc')
+
+def solve(stream: typing.Optional[typing.TextIO] = None) -> str:
+  return next_password(next_password(stream.read().strip() if stream else 'hxbxwxba'))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', help='puzzle input file, - for stdin, instead of the one in solve()')
+  args = arg_parser.parse_args()
+  
   if args.test:
-    def assert_equal(expected: typing.Any, actual: typing.Any) -> None:
-      if actual != expected:
-        raise RuntimeError(f'Expected {expected} but got {actual}')
-   
-    def test_valid_password() -> None:
-      # unit cases
-      assert_equal(False, valid_password('bcdffaa')) # too short
-      assert_equal(False, valid_password('abcdffaaa')) # too long
-      assert_equal(False, valid_password('accdffaa')) # missing increasing straight of 3 letters
-      assert_equal(False, valid_password('abciffaa')) # contains i
-      assert_equal(False, valid_password('abcoffaa')) # contains o
-      assert_equal(False, valid_password('abclffaa')) # contains l
-      assert_equal(False, valid_password('abcdffxz')) # missing non-overlapping pairs of letters
-      assert_equal(False, valid_password('abcdehah')) # two of the same letters are not pairs if they are not touching
-      
-      # real world
-      assert_equal(True, valid_password('abcdffaa'))
-      assert_equal(True, valid_password('ghjaabcc'))
-    
-    def test_next_password() -> None:
-      # real world
-      assert_equal('abcdffaa', next_password('abcdefgh'))
-      assert_equal('ghjaabcc', next_password('ghijklmn'))
-      
-    test_valid_password()
-    test_next_password()
-    
-    print('All tests passed!')
-    sys.exit()
-    
-  print(next_password(next_password('hxbxwxba')))
\ No newline at end of file
+    unittest.main(argv=[sys.argv[0]])
+  elif args.input:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
+  else:
+    print(solve())
@@ -53,13 +53,17 @@ class Tests(unittest.TestCase):
     self.assertEqual(6, count_total(io.StringIO('[3,{"k1":"red","k2":1},3]')))
     self.assertEqual(8, count_total(io.StringIO('[3,{"red":1,"k":1},3]')))
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def solve(stream: typing.TextIO) -> int:
+  return count_total(stream)
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      print(count_total(f))
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
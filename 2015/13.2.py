@@ -6,16 +6,83 @@ import sys
 import io
 import re
 
+import search
+import reader
+
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
+
+# a preference per line, lines the format does not cover fall through to the invalid group
+HAPPINESS_PATTERN = re.compile(
+  r'^(\w+) would (gain|lose) (\d+) happiness units by sitting next to (\w+)\.$|^(?P<invalid>[^\n]+)$',
+  re.MULTILINE,
+)
+
+Happiness: typing.TypeAlias = dict[tuple[str, str], int] # (person, neighbour) -> change in happiness
+
 def find_max_happiness(stream: typing.TextIO) -> int:
-  happiness: dict[tuple[str, str], int] = {}
-  for line in stream:
-    match = re.match(r'(\w+) would (\w+) (\d+) happiness units by sitting next to (\w+).', line)
-    if not match:
-      raise RuntimeError(f'Invalid format for line: "{line}"')
+  return best_seating(parse_happiness(stream))
+
+class Seating:
+  """Seatings round the table as a state space. Turning the table changes nothing, so the first person always takes
+  the first seat, and a state is (the index of the person seated last, a bitmask of the people seated so far)."""
+  
+  def __init__(self, happiness: Happiness) -> None:
+    self.people = sorted(set(p for p, _ in happiness))
+    index = {person: i for i, person in enumerate(self.people)}
+    self.start = (0, 1)
+    self.everyone = (1 << len(self.people)) - 1
+    self.closes = len(self.people) > 2 # the last person also sits next to the first, unless they are the same pair
     
-    person, gain_lose, units, nei = match.groups()
-    happiness[(person, nei)] = int(units) if gain_lose == 'gain' else -int(units)
+    self.pairs = [[0] * len(self.people) for _ in self.people] # happiness of both people sitting together
+    for (person, nei), units in happiness.items():
+      self.pairs[index[person]][index[nei]] += units
+      self.pairs[index[nei]][index[person]] += units
+    self.best_pair = max(
+      (units for i, row in enumerate(self.pairs) for j, units in enumerate(row) if i != j),
+      default=0,
+    )
     
+  def successors(self, state: tuple[int, int]) -> list[tuple[int, tuple[int, int]]]:
+    last, seated = state
+    steps: list[tuple[int, tuple[int, int]]] = []
+    for i in range(len(self.people)):
+      if seated >> i & 1:
+        continue
+      gain, now_seated = self.pairs[last][i], seated | 1 << i
+      if now_seated == self.everyone and self.closes:
+        gain += self.pairs[i][0]
+      steps.append((gain, (i, now_seated)))
+    return steps
+  
+  def is_complete(self, state: tuple[int, int]) -> bool:
+    return state[1] == self.everyone
+  
+  def pairs_left(self, state: tuple[int, int]) -> int:
+    left = len(self.people) - state[1].bit_count()
+    return left + 1 if left and self.closes else left
+
+def best_seating(happiness: Happiness) -> int:
+  happiness = dict(happiness) # seating yourself adds to it
+  for p in set(p for p, _ in happiness):
+    happiness[(p, 'you')] = 0
+    happiness[('you', p)] = 0
+    
+  if not happiness:
+    return 0
+  seating = Seating(happiness)
+  best = search.most_gain(
+    seating.start,
+    seating.successors,
+    seating.is_complete,
+    bound=lambda state: seating.pairs_left(state) * seating.best_pair, # no pair left can be any happier
+    stats=STATS,
+  )
+  return typing.cast(int, best) # everyone can always be seated
+
+# every order round the table tried in turn, kept as the reference the search is checked against
+def best_seating_reference(happiness: Happiness) -> int:
+  happiness = dict(happiness) # seating yourself adds to it
   people = list(set(p for p, _ in happiness))
   
   # add self
@@ -27,9 +94,13 @@ def find_max_happiness(stream: typing.TextIO) -> int:
   seated: set[str] = set()
   seating: list[typing.Optional[str]] = [None] * len(people)
   max_happiness = -float('inf')
+  stats = STATS
   
   def dfs(i: int) -> None:
     nonlocal max_happiness
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], i)
     if i >= len(seating):
       happ = 0
       
@@ -49,7 +120,10 @@ def find_max_happiness(stream: typing.TextIO) -> int:
         if len(seating) == 2:
           break
         
-      max_happiness = max(max_happiness, happ)
+      if happ > max_happiness:
+        max_happiness = happ
+        if stats is not None:
+          stats['bound_updates'] += 1
       return
       
     for p in people:
@@ -64,6 +138,16 @@ def find_max_happiness(stream: typing.TextIO) -> int:
   dfs(0)
   return int(max_happiness)
 
+def parse_happiness(stream: typing.TextIO) -> Happiness:
+  happiness: Happiness = {}
+  for match in HAPPINESS_PATTERN.finditer(reader.read_text(stream)):
+    person, gain_lose, units, nei, invalid = match.groups()
+    if invalid:
+      raise RuntimeError(f'Invalid format for line: "{invalid}"')
+    
+    happiness[(person, nei)] = int(units) if gain_lose == 'gain' else -int(units)
+  return happiness
+
 class Tests(unittest.TestCase):
   def test_find_max_happiness(self):
     # gain / loss
@@ -91,14 +175,39 @@ class Tests(unittest.TestCase):
       d would gain 1 happiness units by sitting next to a.
       d would lose 1 happiness units by sitting next to b.
       d would gain 1 happiness units by sitting next to c."""))))
+    
+  def test_best_seating(self):
+    happiness = {(a, b): (ord(a) * 7 + ord(b) * 3) % 11 - 5 for a in 'abcdef' for b in 'abcdef' if a != b}
+    self.assertEqual(best_seating(happiness), best_seating_reference(happiness))
+    
+  def test_seating(self):
+    seating = Seating({('a', 'b'): 1, ('b', 'a'): 2, ('a', 'c'): 3, ('c', 'a'): 4, ('b', 'c'): 5, ('c', 'b'): 6})
+    self.assertEqual(seating.successors(seating.start), [(3, (1, 0b011)), (7, (2, 0b101))])
+    self.assertEqual(seating.successors((1, 0b011)), [(11 + 7, (2, 0b111))]) # b to c, then c back round to a
+    self.assertEqual([seating.pairs_left(state) for state in [seating.start, (1, 0b011), (2, 0b111)]], [3, 2, 0])
+
+def parse(stream: typing.TextIO) -> Happiness:
+  return parse_happiness(stream)
+
+def solve_parsed(happiness: Happiness) -> int:
+  return best_seating(happiness)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
+
+def solve_reference(stream: typing.TextIO) -> int:
+  return best_seating_reference(parse_happiness(stream))
+
+ENGINES = {'reference': solve_reference}
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      print(find_max_happiness(f))
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
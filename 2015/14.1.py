@@ -5,34 +5,54 @@ import sys
 import io
 import re
 
-class Reindeer(typing.TypedDict):
+import reader
+
+# a reindeer per line, lines the format does not cover fall through to the invalid group
+REINDEER_PATTERN = re.compile(
+  r'^(\w+) can fly (\d+) km/s for (\d+) seconds, but then must rest for (\d+) seconds\.$|^(?P<invalid>[^\n]+)$',
+  re.MULTILINE,
+)
+
+class ReindeerView(typing.TypedDict):
+  name: str
+  speed_km_s: int
+  stamina_s: int
+  rest_time_s: int
+
+class Reindeer(typing.NamedTuple):
+  """A parsed reindeer. Tuple-backed, so it is smaller than its dict view and fields are read by position."""
   name: str
   speed_km_s: int
   stamina_s: int
   rest_time_s: int
+  
+  @classmethod
+  def from_view(cls, view: ReindeerView) -> 'Reindeer':
+    return cls(**view)
+  
+  def view(self) -> ReindeerView:
+    return ReindeerView(**self._asdict())
 
 def calc_distance(reindeer: Reindeer, seconds: int) -> int:
   distance = 0
-  staminaLeft = reindeer['stamina_s']
+  staminaLeft = reindeer.stamina_s
   while seconds > 0:
     if staminaLeft:
-      distance += reindeer['speed_km_s']
+      distance += reindeer.speed_km_s
       seconds -= 1
       staminaLeft -= 1
     else:
-      seconds -= reindeer['rest_time_s']
-      staminaLeft = reindeer['stamina_s']
+      seconds -= reindeer.rest_time_s
+      staminaLeft = reindeer.stamina_s
   return distance
 
 def parse_reindeer(stream: typing.TextIO) -> list[Reindeer]:
   reindeer: list[Reindeer] = []
   
-  line = stream.readline()
-  while line:
-    capture = re.match(r'(\w+) can fly (\d+) km/s for (\d+) seconds, but then must rest for (\d+) seconds.', line)
-    if not capture: raise RuntimeError(f'Invalid line, did not match expected format: "{line}"')
+  for capture in REINDEER_PATTERN.finditer(reader.read_text(stream)):
+    name, speed_km_s, stamina_s, rest_time_s, invalid = capture.groups()
+    if invalid: raise RuntimeError(f'Invalid line, did not match expected format: "{invalid}"')
     
-    name, speed_km_s, stamina_s, rest_time_s = capture.groups()
     reindeer.append(Reindeer(
       name=name,
       speed_km_s=int(speed_km_s),
@@ -40,8 +60,6 @@ def parse_reindeer(stream: typing.TextIO) -> list[Reindeer]:
       rest_time_s=int(rest_time_s),
     ))
     
-    line = stream.readline()
-    
   return reindeer
 
 class Tests(unittest.TestCase):
@@ -51,7 +69,7 @@ class Tests(unittest.TestCase):
     self.assertEqual(2, calc_distance(Reindeer(name='', speed_km_s=2, stamina_s=1, rest_time_s=2), 3))
     self.assertEqual(4, calc_distance(Reindeer(name='', speed_km_s=2, stamina_s=1, rest_time_s=2), 4))
     self.assertEqual(4, calc_distance(Reindeer(name='', speed_km_s=2, stamina_s=1, rest_time_s=2), 5))
-
+    
   def test_parse_reindeer(self):
     self.assertEqual(
       parse_reindeer(io.StringIO('Dancer can fly 27 km/s for 5 seconds, but then must rest for 132 seconds.')),
@@ -62,15 +80,32 @@ class Tests(unittest.TestCase):
         rest_time_s=132,
       )]
     )
+    self.assertRaises(RuntimeError, lambda: parse_reindeer(io.StringIO(
+      'Dancer can fly 27 km/s for 5 seconds, but then must rest for 132 seconds and 7 more.'
+    )))
+    
+  def test_view(self):
+    reindeer = Reindeer(name='Dancer', speed_km_s=27, stamina_s=5, rest_time_s=132)
+    self.assertEqual(reindeer.view(), {'name': 'Dancer', 'speed_km_s': 27, 'stamina_s': 5, 'rest_time_s': 132})
+    self.assertEqual(Reindeer.from_view(reindeer.view()), reindeer)
+
+def parse(stream: typing.TextIO) -> list[Reindeer]:
+  return parse_reindeer(stream)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def solve_parsed(reindeer: list[Reindeer]) -> int:
+  return max(calc_distance(r, 2503) for r in reindeer)
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      reindeer = parse_reindeer(f)
-    print(max(calc_distance(r, 2503) for r in reindeer))
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
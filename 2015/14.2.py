@@ -5,24 +5,52 @@ import sys
 import io
 import re
 
-class Reindeer(typing.TypedDict):
+import reader
+
+# a reindeer per line, lines the format does not cover fall through to the invalid group
+REINDEER_PATTERN = re.compile(
+  r'^(\w+) can fly (\d+) km/s for (\d+) seconds, but then must rest for (\d+) seconds\.$|^(?P<invalid>[^\n]+)$',
+  re.MULTILINE,
+)
+
+class ReindeerView(typing.TypedDict):
   name: str
   speed_km_s: int
   stamina_s: int
   rest_time_s: int
 
-class RaceState(typing.TypedDict):
-  points: int
-  distance: int
-  staminaLeft: int
-  restLeft: int
+class Reindeer(typing.NamedTuple):
+  """A parsed reindeer. Tuple-backed, so it is smaller than its dict view and fields are read by position."""
+  name: str
+  speed_km_s: int
+  stamina_s: int
+  rest_time_s: int
+  
+  @classmethod
+  def from_view(cls, view: ReindeerView) -> 'Reindeer':
+    return cls(**view)
+  
+  def view(self) -> ReindeerView:
+    return ReindeerView(**self._asdict())
+
+class RaceState:
+  __slots__ = ('points', 'distance', 'staminaLeft', 'restLeft')
+  
+  def __init__(self, points: int, distance: int, staminaLeft: int, restLeft: int):
+    self.points = points
+    self.distance = distance
+    self.staminaLeft = staminaLeft
+    self.restLeft = restLeft
+    
+  def __repr__(self) -> str:
+    return f'RaceState({", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__)})'
 
 def race(reindeer: list[Reindeer], seconds: int) -> list[tuple[str, int]]:
   raceState: list[RaceState] = [
     RaceState(
       points=0,
       distance=0,
-      staminaLeft=r['stamina_s'],
+      staminaLeft=r.stamina_s,
       restLeft=0
     ) for r in reindeer
   ]
@@ -33,45 +61,43 @@ def race(reindeer: list[Reindeer], seconds: int) -> list[tuple[str, int]]:
     
     for i in range(len(reindeer)):
       r, state = reindeer[i], raceState[i]
-      if state['staminaLeft']:
-        state['distance'] += r['speed_km_s']
-        state['staminaLeft'] -= 1
-        if state['staminaLeft'] == 0:
-          state['restLeft'] = r['rest_time_s']
-      elif state['restLeft']:
-        state['restLeft'] -= 1
-        if state['restLeft'] == 0:
-          state['staminaLeft'] = r['stamina_s']
+      if state.staminaLeft:
+        state.distance += r.speed_km_s
+        state.staminaLeft -= 1
+        if state.staminaLeft == 0:
+          state.restLeft = r.rest_time_s
+      elif state.restLeft:
+        state.restLeft -= 1
+        if state.restLeft == 0:
+          state.staminaLeft = r.stamina_s
       else:
         raise RuntimeError(f'Invalid state, expected to either have stamina or rest left: {r} - {state}')
   
-      if state['distance'] > leader_distance:
+      if state.distance > leader_distance:
         leaders.clear()
         leaders.append(i)
-        leader_distance = state['distance']
-      elif state['distance'] == leader_distance:
+        leader_distance = state.distance
+      elif state.distance == leader_distance:
         leaders.append(i)
         
     # leaders get a point for each second in the lead
     for i in leaders:
-      raceState[i]['points'] += 1
+      raceState[i].points += 1
       
     seconds -= 1
   
   result: list[tuple[str, int]] = []
   for i in range(len(reindeer)):
-    result.append((reindeer[i]['name'], raceState[i]['points']))
+    result.append((reindeer[i].name, raceState[i].points))
   return result
 
 def parse_reindeer(stream: typing.TextIO) -> list[Reindeer]:
   reindeer: list[Reindeer] = []
   
-  line = stream.readline()
-  while line:
-    capture = re.match(r'(\w+) can fly (\d+) km/s for (\d+) seconds, but then must rest for (\d+) seconds.', line)
-    if not capture: raise RuntimeError(f'Invalid line, did not match expected format: "{line}"')
+  for capture in REINDEER_PATTERN.finditer(reader.read_text(stream)):
+    name, speed_km_s, stamina_s, rest_time_s, invalid = capture.groups()
+    if invalid: raise RuntimeError(f'Invalid line, did not match expected format: "{invalid}"')
     
-    name, speed_km_s, stamina_s, rest_time_s = capture.groups()
     reindeer.append(Reindeer(
       name=name,
       speed_km_s=int(speed_km_s),
@@ -79,8 +105,6 @@ def parse_reindeer(stream: typing.TextIO) -> list[Reindeer]:
       rest_time_s=int(rest_time_s),
     ))
     
-    line = stream.readline()
-    
   return reindeer
 
 class Tests(unittest.TestCase):
@@ -108,7 +132,7 @@ class Tests(unittest.TestCase):
       ], 1000),
       [('Comet', 312), ('Dancer', 689)]
     )
-
+    
   def test_parse_reindeer(self):
     self.assertEqual(
       parse_reindeer(io.StringIO('Dancer can fly 27 km/s for 5 seconds, but then must rest for 132 seconds.')),
@@ -120,14 +144,23 @@ class Tests(unittest.TestCase):
       )]
     )
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def parse(stream: typing.TextIO) -> list[Reindeer]:
+  return parse_reindeer(stream)
+
+def solve_parsed(reindeer: list[Reindeer]) -> int:
+  return max(map(lambda x: x[1], race(reindeer, 2503)))
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      reindeer = parse_reindeer(f)
-    print(max(map(lambda x: x[1], race(reindeer, 2503))))
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
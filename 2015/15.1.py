@@ -7,48 +7,82 @@ import sys
 import io
 import re
 
+import reader
+
 SCORE_PROPERTIES = ['capacity', 'durability', 'flavor', 'texture']
 
-class Ingredient(typing.TypedDict):
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
+
+# an ingredient per line, lines the format does not cover fall through to the invalid group
+INGREDIENT_PATTERN = re.compile(
+  r'^(\w+): capacity (-?\d+), durability (-?\d+), flavor (-?\d+), texture (-?\d+), calories (-?\d+)$'
+  r'|^(?P<invalid>[^\n]+)$',
+  re.MULTILINE,
+)
+
+class IngredientView(typing.TypedDict):
+  name: str
+  capacity: int
+  durability: int
+  flavor: int
+  texture: int
+  calories: int
+
+class Ingredient(typing.NamedTuple):
+  """A parsed ingredient. Tuple-backed, so it is smaller than its dict view and fields are read by position."""
   name: str
   capacity: int
   durability: int
   flavor: int
   texture: int
   calories: int
+  
+  @classmethod
+  def from_view(cls, view: IngredientView) -> 'Ingredient':
+    return cls(**view)
+  
+  def view(self) -> IngredientView:
+    return IngredientView(**self._asdict())
 
 def find_max_score_recipe(ingredients: list[Ingredient], total_tsps: int) -> tuple[int, dict[str, int]]:
-  ingredient_map = {i['name']: i for i in ingredients}
+  # the score properties of each ingredient in SCORE_PROPERTIES order, looked up once rather than per recipe
+  score_table = {i.name: tuple(getattr(i, prop) for prop in SCORE_PROPERTIES) for i in ingredients}
   
   max_recipe: dict[str, int] = {}
   max_score = -float('inf')
   
-  curr_recipe: dict[str, int] = {i['name']: 0 for i in ingredients}
+  curr_recipe: dict[str, int] = {i.name: 0 for i in ingredients}
+  stats = STATS
   
   def dfs(i: int, curr_tsps: int) -> None:
     nonlocal max_recipe, max_score
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], i)
     if i == len(ingredients) - 1:
       # assign remaining since we only have one ingredient left
       remaining = total_tsps - curr_tsps
-      curr_recipe[ingredients[i]['name']] = remaining
+      curr_recipe[ingredients[i].name] = remaining
       
       # calculate score
-      scores: dict[str, int] = {}
+      scores = [0] * len(SCORE_PROPERTIES)
       for iname, tsps in curr_recipe.items():
-        ingredient = ingredient_map[iname]
-        for prop in SCORE_PROPERTIES:
-          scores[prop] = scores.get(prop, 0) + ingredient[prop] * tsps    
-      score: int = functools.reduce(operator.mul, [max(0, s) for s in scores.values()])
+        for prop_i, value in enumerate(score_table[iname]):
+          scores[prop_i] += value * tsps
+      score: int = functools.reduce(operator.mul, [max(0, s) for s in scores])
       
       # update max if needed
       if score > max_score:
         max_recipe = curr_recipe.copy()
         max_score = score
+        if stats is not None:
+          stats['bound_updates'] += 1
       
       return
     
     for tsps in range(total_tsps - curr_tsps + 1):
-      curr_recipe[ingredients[i]['name']] = tsps
+      curr_recipe[ingredients[i].name] = tsps
       dfs(i + 1, curr_tsps + tsps)
   
   dfs(0, 0)
@@ -57,12 +91,10 @@ def find_max_score_recipe(ingredients: list[Ingredient], total_tsps: int) -> tup
 def parse_ingredients(stream: typing.TextIO) -> list[Ingredient]:
   ingredients: list[Ingredient] = []
   
-  line = stream.readline()
-  while line:
-    capture = re.match(r'(\w+): capacity (\-?\d+), durability (\-?\d+), flavor (\-?\d+), texture (\-?\d+), calories (\-?\d+)', line)
-    if not capture: raise RuntimeError(f'Invalid line format, unable to parse: "{line}"')
+  for capture in INGREDIENT_PATTERN.finditer(reader.read_text(stream)):
+    name, capacity, durability, flavor, texture, calories, invalid = capture.groups()
+    if invalid: raise RuntimeError(f'Invalid line format, unable to parse: "{invalid}"')
     
-    name, capacity, durability, flavor, texture, calories = capture.groups()
     ingredients.append(Ingredient(
       name=name,
       capacity=int(capacity),
@@ -71,8 +103,6 @@ def parse_ingredients(stream: typing.TextIO) -> list[Ingredient]:
       texture=int(texture),
       calories=int(calories),
     ))
-    
-    line = stream.readline()
   
   return ingredients
 
@@ -114,16 +144,37 @@ class Tests(unittest.TestCase):
       parse_ingredients(io.StringIO('Name: capacity -1, durability -1, flavor -1, texture -1, calories -10')),
       [Ingredient(name='Name', capacity=-1, durability=-1, flavor=-1, texture=-1, calories=-10)]
     )
+    
+    # trailing junk
+    self.assertRaises(RuntimeError, lambda: parse_ingredients(io.StringIO(
+      'Name: capacity 1, durability 1, flavor 1, texture 1, calories 10, sugar 2'
+    )))
+    
+  def test_view(self):
+    ingredient = Ingredient(name='Name', capacity=1, durability=2, flavor=3, texture=4, calories=5)
+    self.assertEqual(ingredient.view()['texture'], 4)
+    self.assertEqual(Ingredient.from_view(ingredient.view()), ingredient)
+
+def parse(stream: typing.TextIO) -> list[Ingredient]:
+  return parse_ingredients(stream)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def solve_parsed(ingredients: list[Ingredient]) -> int:
+  score, _ = find_max_score_recipe(ingredients, total_tsps=100)
+  return score
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]], verbosity=2)
   else:
-    with open('input.txt') as f:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
       ingredients = parse_ingredients(f)
     score, recipe = find_max_score_recipe(ingredients, total_tsps=100)
     print(f'score: {score}')
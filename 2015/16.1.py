@@ -5,6 +5,8 @@ import sys
 import io
 import re
 
+import reader
+
 MFCSAM = {
   'children': 3,
   'cats': 7,
@@ -18,7 +20,11 @@ MFCSAM = {
   'perfumes': 1,
 }
 
-class Sue(typing.TypedDict):
+# a Sue per line, lines the format does not cover fall through to the invalid group
+SUE_PATTERN = re.compile(r'^Sue (\d+):((?: \w+: -?\d+(?:, \w+: -?\d+)*)?)$|^(?P<invalid>[^\n]+)$', re.MULTILINE)
+ATTRIBUTE_PATTERN = re.compile(r'(\w+): (-?\d+)')
+
+class SueView(typing.TypedDict):
   number: int
   children: typing.NotRequired[int]
   cats: typing.NotRequired[int]
@@ -30,6 +36,35 @@ class Sue(typing.TypedDict):
   trees: typing.NotRequired[int]
   cars: typing.NotRequired[int]
   perfumes: typing.NotRequired[int]
+
+class Sue(typing.NamedTuple):
+  """A parsed Sue, with None for what is not remembered about her. Tuple-backed, so it is smaller than its dict
+  view and fields are read by position."""
+  number: int
+  children: typing.Optional[int] = None
+  cats: typing.Optional[int] = None
+  samoyeds: typing.Optional[int] = None
+  pomeranians: typing.Optional[int] = None
+  akitas: typing.Optional[int] = None
+  vizslas: typing.Optional[int] = None
+  goldfish: typing.Optional[int] = None
+  trees: typing.Optional[int] = None
+  cars: typing.Optional[int] = None
+  perfumes: typing.Optional[int] = None
+  
+  @classmethod
+  def from_view(cls, view: SueView) -> 'Sue':
+    return cls(**view)
+  
+  def view(self) -> SueView:
+    return typing.cast(SueView, {attr: val for attr, val in self._asdict().items() if val is not None})
+  
+  def remembered(self) -> typing.Iterator[tuple[str, int]]:
+    for attr, val in zip(ATTRIBUTES, self[1:]):
+      if val is not None:
+        yield attr, val
+
+ATTRIBUTES = Sue._fields[1:]
   
 def guess_sue(sues: list[Sue], gift: dict[str, int]) -> float:
   guess_num: typing.Optional[int] = None
@@ -38,7 +73,7 @@ def guess_sue(sues: list[Sue], gift: dict[str, int]) -> float:
   for sue in sues:
     score = score_sue(sue, gift)
     if score > guess_score:
-      guess_num = sue['number']
+      guess_num = sue.number
       guess_score = score
       
   if not guess_num:
@@ -49,11 +84,7 @@ def guess_sue(sues: list[Sue], gift: dict[str, int]) -> float:
 def score_sue(sue: Sue, gift: dict[str, int]) -> float:
   score = 0
   
-  for attr, val in sue.items():
-    if attr == 'number':
-      continue
-    
-    val = typing.cast(int, val)
+  for attr, val in sue.remembered():
     gift_val = gift[attr]
     if val == gift_val:
       score += 1
@@ -67,65 +98,76 @@ def score_sue(sue: Sue, gift: dict[str, int]) -> float:
 def parse_sues(stream: typing.TextIO) -> list[Sue]:
   sues: list[Sue] = []
   
-  line = stream.readline()
-  while line:
-    num_capture = re.match(r'Sue (\d+):', line)
-    if not num_capture: raise RuntimeError(f'Could not determine sue number: {line}')
+  for capture in SUE_PATTERN.finditer(reader.read_text(stream)):
+    number, attr_part, invalid = capture.groups()
+    if invalid: raise RuntimeError(f'Could not determine sue number: {invalid}')
     
-    sue: Sue = {'number': int(num_capture.groups()[0])}
-
-    attr_part = line[line.index(':') + 1:]
-    if attr_part:
-      for attr_str in attr_part.split(','):
-        attr, val = attr_str.split(':')
-        sue[attr.strip()] = int(val.strip())
-        
-    sues.append(sue)
+    attrs = {attr: int(val) for attr, val in ATTRIBUTE_PATTERN.findall(attr_part)}
+    if unexpected := attrs.keys() - ATTRIBUTES:
+      raise RuntimeError(f'Unexpected attr: {", ".join(sorted(unexpected))}')
     
-    line = stream.readline()
+    sues.append(Sue(int(number), **attrs))
     
   return sues
 
 class Tests(unittest.TestCase):
   def test_score_sue(self):
     # same value = 1 point
-    self.assertEqual(score_sue({'number': 1, 'children': 5}, {'children': 5}), 1)
+    self.assertEqual(score_sue(Sue(number=1, children=5), {'children': 5}), 1)
     
     # within 1 = 0.8 points
-    self.assertEqual(score_sue({'number': 1, 'children': 4}, {'children': 5}), 0.8)
-    self.assertEqual(score_sue({'number': 1, 'children': 6}, {'children': 5}), 0.8)
+    self.assertEqual(score_sue(Sue(number=1, children=4), {'children': 5}), 0.8)
+    self.assertEqual(score_sue(Sue(number=1, children=6), {'children': 5}), 0.8)
     
     # within 2 = 0.6 points
-    self.assertEqual(score_sue({'number': 1, 'children': 3}, {'children': 5}), 0.6)
-    self.assertEqual(score_sue({'number': 1, 'children': 7}, {'children': 5}), 0.6)
+    self.assertEqual(score_sue(Sue(number=1, children=3), {'children': 5}), 0.6)
+    self.assertEqual(score_sue(Sue(number=1, children=7), {'children': 5}), 0.6)
     
     # multiple attributes
-    self.assertEqual(score_sue({'number': 1, 'children': 5, 'cats': 4}, {'children': 5, 'cats': 5}), 1.8)
+    self.assertEqual(score_sue(Sue(number=1, children=5, cats=4), {'children': 5, 'cats': 5}), 1.8)
     
     # default = 0 points
-    self.assertEqual(score_sue({'number': 1, 'children': 9}, {'children': 5}), 0)
+    self.assertEqual(score_sue(Sue(number=1, children=9), {'children': 5}), 0)
   
   def test_parse_sues(self):
     # no attributes
     self.assertEqual(
       parse_sues(io.StringIO('Sue 1:')),
-      [{'number': 1}]
+      [Sue(number=1)]
     )
     
     # all attributes
     self.assertEqual(
       parse_sues(io.StringIO('Sue 1: children: 1, cats: 2, samoyeds: 3, pomeranians: 4, akitas: 5, vizslas: 6, goldfish: 7, trees: 8, cars: 9, perfumes: 10')),
-      [{'number': 1, 'children': 1, 'cats': 2, 'samoyeds': 3, 'pomeranians': 4, 'akitas': 5, 'vizslas': 6, 'goldfish': 7, 'trees': 8, 'cars': 9, 'perfumes': 10}]
+      [Sue(number=1, children=1, cats=2, samoyeds=3, pomeranians=4, akitas=5, vizslas=6, goldfish=7, trees=8, cars=9, perfumes=10)]
     )
+    
+    self.assertRaises(RuntimeError, lambda: parse_sues(io.StringIO('Sue 1: dogs: 2')))
+    self.assertRaises(RuntimeError, lambda: parse_sues(io.StringIO('Sue 1: cats: 2, trees')))
+    
+  def test_view(self):
+    sue = Sue(number=3, cats=0, trees=2)
+    self.assertEqual(sue.view(), {'number': 3, 'cats': 0, 'trees': 2})
+    self.assertEqual(Sue.from_view(sue.view()), sue)
+    self.assertEqual(list(sue.remembered()), [('cats', 0), ('trees', 2)])
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def parse(stream: typing.TextIO) -> list[Sue]:
+  return parse_sues(stream)
+
+def solve_parsed(sues: list[Sue]) -> float:
+  return guess_sue(sues, gift=MFCSAM)
+
+def solve(stream: typing.TextIO) -> float:
+  return solve_parsed(parse(stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      sues = parse_sues(f)
-    print(guess_sue(sues, gift=MFCSAM))
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
@@ -4,20 +4,31 @@ import typing
 import sys
 import io
 
+import reader
+
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
+
 def count_combinations(containers: list[int], *, total_liters: int) -> int:
   combinations = 0
+  stats = STATS
   
-  def dfs(i: int, curr_liters: int = 0) -> None:
+  def dfs(i: int, curr_liters: int = 0, depth: int = 0) -> None:
     nonlocal combinations
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], depth)
     
     if curr_liters > total_liters:
+      if stats is not None:
+        stats['pruned'] += 1
       return
     if curr_liters == total_liters:
       combinations += 1
       return
     
     for j in range(i, len(containers)):
-      dfs(j + 1, curr_liters + containers[j])
+      dfs(j + 1, curr_liters + containers[j], depth + 1)
   
   dfs(0)
   return combinations
@@ -25,10 +36,8 @@ def count_combinations(containers: list[int], *, total_liters: int) -> int:
 def parse_containers(stream: typing.TextIO) -> list[int]:
   containers: list[int] = []
   
-  line = stream.readline()
-  while line:
+  for line in reader.lines(stream):
     containers.append(int(line))
-    line = stream.readline()
   
   return containers
 
@@ -42,14 +51,23 @@ class Tests(unittest.TestCase):
   def test_parse_containers(self):
     self.assertEqual(parse_containers(io.StringIO('1\n2\n3')), [1, 2, 3])
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def parse(stream: typing.TextIO) -> list[int]:
+  return parse_containers(stream)
+
+def solve_parsed(containers: list[int]) -> int:
+  return count_combinations(containers, total_liters=150)
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      containers = parse_containers(f)
-    print(count_combinations(containers, total_liters=150))
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
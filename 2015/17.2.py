@@ -4,6 +4,11 @@ import typing
 import sys
 import io
 
+import reader
+
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
+
 class CountMinContainerCombinationsResult(typing.TypedDict):
   count: int
   combinations: int
@@ -11,16 +16,24 @@ class CountMinContainerCombinationsResult(typing.TypedDict):
 def count_min_container_combinations(containers: list[int], *, total_liters: int) -> CountMinContainerCombinationsResult:
   min_container_count = float('inf')
   min_container_combinations = 0
+  stats = STATS
   
   def dfs(i: int, curr_container_count: int = 0, curr_liters: int = 0) -> None:
     nonlocal min_container_count, min_container_combinations
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], curr_container_count)
     
     if curr_liters > total_liters:
+      if stats is not None:
+        stats['pruned'] += 1
       return
     if curr_liters == total_liters:
       if curr_container_count < min_container_count:
         min_container_count = curr_container_count
         min_container_combinations = 1
+        if stats is not None:
+          stats['bound_updates'] += 1
       elif curr_container_count == min_container_count:
         min_container_combinations += 1
       return
@@ -38,13 +51,56 @@ def count_min_container_combinations(containers: list[int], *, total_liters: int
     'combinations': min_container_combinations
   }
 
+def count_all_and_min_container_combinations(
+  containers: list[int],
+  *,
+  total_liters: int
+) -> tuple[int, CountMinContainerCombinationsResult]:
+  """Counts all combinations (part 1) and the minimal container ones (part 2) in a single search."""
+  all_combinations = 0
+  min_container_count = float('inf')
+  min_container_combinations = 0
+  stats = STATS
+  
+  def dfs(i: int, curr_container_count: int = 0, curr_liters: int = 0) -> None:
+    nonlocal all_combinations, min_container_count, min_container_combinations
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], curr_container_count)
+    
+    if curr_liters > total_liters:
+      if stats is not None:
+        stats['pruned'] += 1
+      return
+    if curr_liters == total_liters:
+      all_combinations += 1
+      if curr_container_count < min_container_count:
+        min_container_count = curr_container_count
+        min_container_combinations = 1
+        if stats is not None:
+          stats['bound_updates'] += 1
+      elif curr_container_count == min_container_count:
+        min_container_combinations += 1
+      return
+    
+    for j in range(i, len(containers)):
+      dfs(
+        j + 1,
+        curr_container_count=curr_container_count + 1,
+        curr_liters=curr_liters + containers[j]
+      )
+  
+  dfs(0)
+  return all_combinations, {
+    'count': int(min_container_count),
+    'combinations': min_container_combinations
+  }
+
 def parse_containers(stream: typing.TextIO) -> list[int]:
   containers: list[int] = []
   
-  line = stream.readline()
-  while line:
+  for line in reader.lines(stream):
     containers.append(int(line))
-    line = stream.readline()
   
   return containers
 
@@ -54,20 +110,38 @@ class Tests(unittest.TestCase):
     self.assertEqual(count_min_container_combinations([1, 2, 3], total_liters=2), {'count': 1, 'combinations': 1})
     self.assertEqual(count_min_container_combinations([1, 2, 3], total_liters=3), {'count': 1, 'combinations': 1})
     self.assertEqual(count_min_container_combinations([1, 2, 3], total_liters=6), {'count': 3, 'combinations': 1})
+    
+  def test_count_all_and_min_container_combinations(self):
+    self.assertEqual(count_all_and_min_container_combinations([1, 2, 3], total_liters=3), (2, {'count': 1, 'combinations': 1}))
+    self.assertEqual(count_all_and_min_container_combinations([20, 15, 10, 5, 5], total_liters=25), (4, {'count': 2, 'combinations': 3}))
   
   def test_parse_containers(self):
     self.assertEqual(parse_containers(io.StringIO('1\n2\n3')), [1, 2, 3])
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def parse(stream: typing.TextIO) -> list[int]:
+  return parse_containers(stream)
+
+def solve_parsed(containers: list[int]) -> int:
+  return count_min_container_combinations(containers, total_liters=150)['combinations']
+
+def solve_both(containers: list[int]) -> tuple[int, int]:
+  total, min_result = count_all_and_min_container_combinations(containers, total_liters=150)
+  return total, min_result['combinations']
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
       containers = parse_containers(f)
     result = count_min_container_combinations(containers, total_liters=150)
-    print(f'count: {result['count']}')
-    print(f'combinations: {result['combinations']}')
\ No newline at end of file
+    print(f'count: {result["count"]}')
+    print(f'combinations: {result["combinations"]}')
\ No newline at end of file
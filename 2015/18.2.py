@@ -1,3 +1,4 @@
+import numpy as np
 import argparse
 import unittest
 import textwrap
@@ -6,7 +7,7 @@ import enum
 import sys
 import io
 
-class InvalidGridSize(Exception): pass
+import grids
 
 class CellState(enum.IntEnum): ON = 1; OFF = 0
 class TempCellState(enum.IntEnum): ON_TO_OFF = 3; OFF_TO_ON = 4
@@ -15,6 +16,9 @@ ON, OFF = CellState.ON, CellState.OFF
 NEIGHBOR_DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)] # lower left moving clockwise
 
 Grid: typing.TypeAlias = list[list[int]]
+DenseGrid: typing.TypeAlias = np.ndarray # rows x cols of bool, True where the light is on
+
+CORNERS = ([0, 0, -1, -1], [0, -1, 0, -1]) # index arrays for the four corners of a DenseGrid
 
 def grid_step(grid: Grid) -> Grid:
   rows, cols = len(grid), len(grid[0])
@@ -88,7 +92,7 @@ def parse_grid(stream: typing.TextIO, *, rows: int, cols: int) -> Grid:
   for r in range(rows):
     line = stream.readline().strip()
     if len(line) != cols:
-      raise InvalidGridSize(f'Unexpected number of cols found for row {r}: {len(line)} != {cols}')
+      raise grids.InvalidGridSize(f'Unexpected number of cols found for row {r}: {len(line)} != {cols}')
     
     for c in range(cols):
       match line[c]:
@@ -101,6 +105,15 @@ def parse_grid(stream: typing.TextIO, *, rows: int, cols: int) -> Grid:
   
   return grid
 
+# The dense engine holds the grid as one bool array and steps it with whole-array operations, so no cell needs a
+# temporary state: the next grid is built from the neighbour counts of the current one.
+
+def dense_grid_step(grid: DenseGrid) -> DenseGrid:
+  counts = grids.neighbour_counts(grid)
+  stepped = (counts == 3) | (grid & (counts == 2))
+  stepped[CORNERS] = grid[CORNERS] # corners cannot be altered / turned off
+  return stepped
+
 class Tests(unittest.TestCase):
   def test_grid_step(self):
     grid_0 = parse_grid(io.StringIO(textwrap.dedent("""\
@@ -164,33 +177,72 @@ class Tests(unittest.TestCase):
     self.assertEqual(parse_grid(io.StringIO('.#\n.#\n.#'), rows=3, cols=2), [[OFF, ON], [OFF, ON], [OFF, ON]])
     
     # failure
-    self.assertRaises(InvalidGridSize, lambda: parse_grid(io.StringIO('.#.#.#'), rows=100, cols=100))
+    self.assertRaises(grids.InvalidGridSize, lambda: parse_grid(io.StringIO('.#.#.#'), rows=100, cols=100))
+    
+  def test_dense_grid(self):
+    text = '##.#.#\n...##.\n#....#\n..#...\n#.#..#\n####.#'
+    grid = grids.read(io.StringIO(text), rows=6, cols=6)
+    self.assertEqual(grids.to_text(grid), text)
+    self.assertEqual(grids.neighbour_counts(grid)[1].tolist(), [3, 3, 3, 2, 4, 3])
+    
+    # steps in lockstep with the reference
+    reference = parse_grid(io.StringIO(text), rows=6, cols=6)
+    for _ in range(5):
+      grid, reference = dense_grid_step(grid), grid_step(reference)
+      self.assertEqual(grid.tolist(), [[cell == ON for cell in row] for row in reference])
+      
+    self.assertRaises(grids.InvalidGridSize, lambda: grids.read(io.StringIO('.#.#.#'), rows=100, cols=100))
+    self.assertRaises(RuntimeError, lambda: grids.read(io.StringIO('.#\n.é'), rows=2, cols=2))
+
+def parse(stream: typing.TextIO) -> DenseGrid:
+  return grids.read(stream, rows=100, cols=100)
+
+def solve_parsed(grid: DenseGrid) -> int:
+  grid = grid.copy()
+  grid[CORNERS] = True # turn all corners on
+  
+  for _ in range(100):
+    grid = dense_grid_step(grid) # a new array each step, the parsed grid is left untouched
+  return int(np.count_nonzero(grid))
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
+
+# the cell by cell list grid, kept as the reference the dense engine is checked against
+def solve_parsed_reference(grid: Grid) -> int:
+  grid = [row.copy() for row in grid] # grid_step updates in place, leave the parsed grid untouched
+  
+  # turn all corners on
+  rows, cols = len(grid), len(grid[0])
+  grid[0][0] = CellState.ON
+  grid[0][cols - 1] = CellState.ON
+  grid[rows - 1][0] = CellState.ON
+  grid[rows - 1][cols - 1] = CellState.ON
+  
+  for _ in range(100):
+    grid = grid_step(grid)
+    
+  on = 0
+  for r in range(len(grid)):
+    for c in range(len(grid[0])):
+      if grid[r][c] == ON:
+        on += 1
+  
+  return on
+
+def solve_reference(stream: typing.TextIO) -> int:
+  return solve_parsed_reference(parse_grid(stream, rows=100, cols=100))
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+ENGINES = {'reference': solve_reference}
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      grid = parse_grid(f, rows=100, cols=100)
-    
-    # turn all corners on
-    rows, cols = len(grid), len(grid[0])
-    grid[0][0] = CellState.ON
-    grid[0][cols - 1] = CellState.ON
-    grid[rows - 1][0] = CellState.ON
-    grid[rows - 1][cols - 1] = CellState.ON
-    
-    for _ in range(100):
-      grid = grid_step(grid)
-      
-    on = 0
-    for r in range(len(grid)):
-      for c in range(len(grid[0])):
-        if grid[r][c] == ON:
-          on += 1
-    
-    print(on)
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
@@ -6,8 +6,13 @@ import sys
 import io
 import re
 
+import reader
+
 Replacement: typing.TypeAlias = tuple[str, str]
 
+# a replacement per line up to the blank line before the molecule
+REPLACEMENT_PATTERN = re.compile(r'^(\w+) => (\w+)$|^(?P<invalid>[^\n]+)$', re.MULTILINE)
+
 class TrieNode:
   def __init__(self):
     self.children: dict[str, TrieNode] = {}
@@ -71,16 +76,14 @@ def count_generated(replacements: list[Replacement], molecule: str) -> int:
 
 def parse_input(stream: typing.TextIO) -> tuple[list[Replacement], str]:
   replacements: list[Replacement] = []
+  rules, _, molecule = reader.read_text(stream).partition('\n\n')
   
-  while True:
-    line = stream.readline()
-    
-    capture = re.match(r'(\w+) => (\w+)', line)
-    if not capture:
-      return replacements, stream.read().strip()
-    
-    m1, m2 = capture.groups()
+  for capture in REPLACEMENT_PATTERN.finditer(rules):
+    m1, m2, invalid = capture.groups()
+    if invalid: raise RuntimeError(f'Invalid replacement: "{invalid}"')
     replacements.append((m1, m2))
+    
+  return replacements, molecule.strip()
 
 class Tests(unittest.TestCase):
   def test_trie(self):
@@ -110,15 +113,26 @@ class Tests(unittest.TestCase):
       parse_input(io.StringIO('a => b\na => c\n\nmolecule')),
       ([('a', 'b'), ('a', 'c')], 'molecule')
     )
+    self.assertRaises(RuntimeError, lambda: parse_input(io.StringIO('a => b c\n\nmolecule')))
+
+def parse(stream: typing.TextIO) -> tuple[list[Replacement], str]:
+  return parse_input(stream)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def solve_parsed(parsed: tuple[list[Replacement], str]) -> int:
+  replacements, molecule = parsed
+  return count_generated(replacements, molecule)
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      replacements, molecule = parse_input(f)
-    print(count_generated(replacements, molecule))
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
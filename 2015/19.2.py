@@ -1,16 +1,27 @@
+import collections
+import fractions
 import argparse
 import unittest
 import typing
+import math
 import sys
 import io
 import re
 
+import search
+import reader
+
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
+
 Replacement: typing.TypeAlias = tuple[str, str]
 
-def find_quickest_fabrication(replacements: list[Replacement], target_molecule: str) -> int:
-  rev_replacements = [(to, frm) for frm, to in replacements]
-  rev_replacements.sort(key=lambda x: -len(x[0])) # longest first
-  
+# a replacement per line up to the blank line before the molecule
+REPLACEMENT_PATTERN = re.compile(r'^(\w+) => (\w+)$|^(?P<invalid>[^\n]+)$', re.MULTILINE)
+ELEMENT_PATTERN = re.compile(r'[A-Z][a-z]*|.') # a capital and the lower case letters after it, or e
+
+def undo_longest_first(rev_replacements: list[Replacement], target_molecule: str) -> typing.Optional[int]:
+  """Steps back to e undoing the longest replacement that fits each time, None when it gets stuck"""
   steps = 0
   molecule = target_molecule
   
@@ -21,42 +32,208 @@ def find_quickest_fabrication(replacements: list[Replacement], target_molecule:
         steps += 1
         break
     else:
-      raise RuntimeError('No replacement found!')
+      return None
     
   return steps
 
+def elements(molecule: str) -> tuple[str, ...]:
+  return tuple(ELEMENT_PATTERN.findall(molecule))
+
+def step_weights(replacements: list[tuple[str, tuple[str, ...]]]) -> typing.Optional[dict[str, fractions.Fraction]]:
+  """Weights of the elements that every replacement adds exactly one to, None when there are none. Gaussian
+  elimination, with the weights it leaves free set to 0. Given them, every way of making a molecule from e takes its
+  weight less e's in steps."""
+  pivots: dict[str, tuple[dict[str, fractions.Fraction], fractions.Fraction]] = {}
+  for frm, parts in replacements:
+    row = {element: fractions.Fraction(count) for element, count in collections.Counter(parts).items()}
+    row[frm] = row.get(frm, 0) - 1
+    total = fractions.Fraction(1)
+    for element, (pivot_row, pivot_total) in pivots.items():
+      if factor := row.get(element):
+        for other, weight in pivot_row.items():
+          row[other] = row.get(other, 0) - factor * weight
+        total -= factor * pivot_total
+    row = {element: weight for element, weight in row.items() if weight}
+    if not row:
+      if total:
+        return None
+      continue
+    
+    element, weight = next(iter(row.items()))
+    row = {other: other_weight / weight for other, other_weight in row.items()}
+    total /= weight
+    for pivot, (pivot_row, pivot_total) in pivots.items():
+      if factor := pivot_row.get(element):
+        for other, other_weight in row.items():
+          pivot_row[other] = pivot_row.get(other, 0) - factor * other_weight
+        pivots[pivot] = ({other: w for other, w in pivot_row.items() if w}, pivot_total - factor * total)
+    pivots[element] = (row, total)
+    
+  return {element: total for element, (_, total) in pivots.items()}
+
+class Parser:
+  """The LR(0) automaton of the replacements read backwards: which replacements could be undone with a stack of
+  elements, built as the states are reached. A stack no state accepts cannot be undone back to e whatever follows."""
+  
+  def __init__(self, grammar: list[tuple[str, tuple[str, ...]]]):
+    self.grammar = [('^', ('e',))] + grammar # ^ is undone to from a whole e, which ends the search
+    self.by_frm: dict[str, list[int]] = collections.defaultdict(list)
+    for rule, (frm, _) in enumerate(self.grammar):
+      self.by_frm[frm].append(rule)
+    self.ids: dict[frozenset[tuple[int, int]], int] = {}
+    self.items: list[frozenset[tuple[int, int]]] = []
+    self.symbols: list[str] = [] # the element each state is entered on
+    self.complete: list[list[int]] = [] # the replacements each state can undo, longest first
+    self.gotos: dict[tuple[int, str], typing.Optional[int]] = {}
+    self.start = self.state(frozenset([(0, 0)]), '^')
+    
+  def state(self, kernel: frozenset[tuple[int, int]], symbol: str) -> int:
+    items = set(kernel)
+    pending = list(kernel)
+    while pending:
+      rule, dot = pending.pop()
+      parts = self.grammar[rule][1]
+      if dot < len(parts):
+        for expanded in self.by_frm[parts[dot]]:
+          if (expanded, 0) not in items:
+            items.add((expanded, 0))
+            pending.append((expanded, 0))
+            
+    closed = frozenset(items)
+    if closed not in self.ids:
+      self.ids[closed] = len(self.items)
+      self.items.append(closed)
+      self.symbols.append(symbol)
+      complete = [rule for rule, dot in closed if dot == len(self.grammar[rule][1])]
+      self.complete.append(sorted(complete, key=lambda rule: -len(self.grammar[rule][1])))
+    return self.ids[closed]
+  
+  def goto(self, state: int, symbol: str) -> typing.Optional[int]:
+    """The state after symbol is pushed on top of state, None when no replacement can be undone that way"""
+    if (state, symbol) not in self.gotos:
+      kernel = frozenset(
+        (rule, dot + 1) for rule, dot in self.items[state]
+        if dot < len(self.grammar[rule][1]) and self.grammar[rule][1][dot] == symbol
+      )
+      self.gotos[state, symbol] = self.state(kernel, symbol) if kernel else None
+    return self.gotos[state, symbol]
+  
+def fewest_undos(replacements: list[Replacement], target_molecule: str) -> typing.Optional[int]:
+  """A* back to e, undoing replacements the way a shift-reduce parser would: the target's elements are shifted onto a
+  stack one at a time and only the top of the stack is undone. Each way of making the target is then undone in one
+  order, rather than in every order its independent steps allow, and stacks that cannot be undone are never pushed.
+  Every replacement replaces a single element."""
+  grammar: list[tuple[str, tuple[str, ...]]] = []
+  for frm, to in replacements:
+    if len(elements(frm)) != 1: raise RuntimeError(f'Expected a single element to replace: "{frm}"')
+    grammar.append((frm, elements(to)))
+  parser = Parser(grammar)
+  
+  # every undo takes at most one off the weight of the molecule, so what is left of it over e's is a lower bound on
+  # the undos still needed, and exact when the replacements have step weights
+  weights = step_weights(grammar)
+  if weights is None:
+    most_shrink = max(len(parts) - 1 for _, parts in grammar) # elements any one undo takes off
+    uniform = fractions.Fraction(1, max(most_shrink, 1))
+    weights = {element: uniform for frm, parts in grammar for element in (frm, *parts)}
+  target = elements(target_molecule)
+  # what undoing each replacement takes off the weight of the molecule
+  drops = [sum((weights.get(element, 0) for element in parts), -weights.get(frm, 0)) for frm, parts in parser.grammar]
+  
+  # the parser states on the stack, each entered on the element it holds, how many elements have been shifted onto it,
+  # and the weight of the molecule so far undone
+  State: typing.TypeAlias = tuple[tuple[int, ...], int, fractions.Fraction]
+  
+  def successors(state: State) -> typing.Iterator[tuple[int, State]]:
+    # shifting first finishes what the stack holds before undoing what could belong to a longer replacement
+    stack, shifted, weight = state
+    if shifted < len(target) and (pushed := parser.goto(stack[-1], target[shifted])) is not None:
+      yield 0, (stack + (pushed,), shifted + 1, weight)
+    for rule in parser.complete[stack[-1]]:
+      below = stack[:-len(parser.grammar[rule][1])]
+      if rule and (undone := parser.goto(below[-1], parser.grammar[rule][0])) is not None:
+        yield 1, (below + (undone,), shifted, weight - drops[rule])
+        
+  def steps_needed(state: State) -> int:
+    return max(0, math.ceil(state[2] - weights.get('e', 0)))
+  
+  whole = parser.goto(parser.start, 'e')
+  if whole is None:
+    return None
+  start = ((parser.start,), 0, sum((weights.get(element, 0) for element in target), fractions.Fraction(0)))
+  goal = ((parser.start, whole), len(target))
+  return search.least_cost(start, successors, lambda state: state[:2] == goal, steps_needed, stats=STATS)
+
+def find_quickest_fabrication(replacements: list[Replacement], target_molecule: str) -> int:
+  steps = fewest_undos(replacements, target_molecule)
+  if steps is None:
+    raise RuntimeError('No replacement found!')
+  return steps
+
+def find_fabrication_longest_first(replacements: list[Replacement], target_molecule: str) -> int:
+  """The greedy undoing, which is fast on the puzzle's inputs but not always the fewest steps"""
+  rev_replacements = sorted(((to, frm) for frm, to in replacements), key=lambda replacement: -len(replacement[0]))
+  steps = undo_longest_first(rev_replacements, target_molecule)
+  if steps is None:
+    raise RuntimeError('No replacement found!')
+  return steps
+
 def parse_input(stream: typing.TextIO) -> tuple[list[Replacement], str]:
   replacements: list[Replacement] = []
+  rules, _, molecule = reader.read_text(stream).partition('\n\n')
   
-  while True:
-    line = stream.readline()
-    
-    capture = re.match(r'(\w+) => (\w+)', line)
-    if not capture:
-      return replacements, stream.read().strip()
-    
-    m1, m2 = capture.groups()
+  for capture in REPLACEMENT_PATTERN.finditer(rules):
+    m1, m2, invalid = capture.groups()
+    if invalid: raise RuntimeError(f'Invalid replacement: "{invalid}"')
     replacements.append((m1, m2))
+    
+  return replacements, molecule.strip()
 
 class Tests(unittest.TestCase):  
   def test_find_quickest_fabrication(self):
     self.assertEqual(find_quickest_fabrication([('e', 'H'), ('e', 'O'), ('H', 'HO'), ('H', 'OH'), ('O', 'HH')], 'HOH'), 3)
     self.assertEqual(find_quickest_fabrication([('e', 'H'), ('e', 'O'), ('H', 'HO'), ('H', 'OH'), ('O', 'HH')], 'HOHOHO'), 6)
     
+    # undoing AB first leaves XC, which nothing undoes, where undoing BC leads back to e
+    self.assertIsNone(undo_longest_first([('AY', 'e'), ('AB', 'X'), ('BC', 'Y')], 'ABC'))
+    self.assertEqual(find_quickest_fabrication([('e', 'AY'), ('X', 'AB'), ('Y', 'BC')], 'ABC'), 2)
+    self.assertRaises(RuntimeError, lambda: find_quickest_fabrication([('e', 'AY'), ('X', 'AB')], 'ABC'))
+    
+    # undoing the longest replacement first takes BCD back to R, Q and e, where A BC is one step shorter
+    replacements = [('e', 'Q'), ('Q', 'R'), ('R', 'BCD'), ('e', 'AD'), ('A', 'BC')]
+    self.assertEqual(find_fabrication_longest_first(replacements, 'BCD'), 3)
+    self.assertEqual(find_quickest_fabrication(replacements, 'BCD'), 2)
+    
   def test_parse_input(self):
     self.assertEqual(
       parse_input(io.StringIO('a => b\naa => cc\n\nmolecule')),
       ([('a', 'b'), ('aa', 'cc')], 'molecule')
     )
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def parse(stream: typing.TextIO) -> tuple[list[Replacement], str]:
+  return parse_input(stream)
+
+def solve_parsed(parsed: tuple[list[Replacement], str]) -> int:
+  replacements, molecule = parsed
+  return find_quickest_fabrication(replacements, molecule)
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
+
+def solve_reference(stream: typing.TextIO) -> int:
+  return find_fabrication_longest_first(*parse_input(stream))
+
+# the greedy undoing the A* search replaced, kept as the reference the search is checked against
+ENGINES = {'reference': solve_reference}
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      replacements, molecule = parse_input(f)
-    print(find_quickest_fabrication(replacements, molecule))
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
@@ -1,22 +1,31 @@
 import argparse
 import unittest
+import typing
 import sys
 
+INPUTS: list[str] = [] # puzzle input is hard-coded in solve(), which also takes it as an optional stream
+
 DEFAULT_UPPER_BOUND = 1_000_000
 
-def lowest_house_number(target: int, upper_bound: int = DEFAULT_UPPER_BOUND) -> int:
+def presents_sieve(upper_bound: int = DEFAULT_UPPER_BOUND) -> list[int]:
   presents = [0] * (upper_bound + 1)
   
   for elf in range(1, upper_bound + 1):
     for house in range(elf, upper_bound + 1, elf):
       presents[house] += elf
       
+  return presents
+
+def first_house(presents: list[int], target: int) -> int:
   for house, total in enumerate(presents):
     if total * 10 >= target:
       return house
     
   raise RuntimeError('No house meets target with upper bound given')
 
+def lowest_house_number(target: int, upper_bound: int = DEFAULT_UPPER_BOUND) -> int:
+  return first_house(presents_sieve(upper_bound), target)
+
 class Tests(unittest.TestCase):
   def test_lowest_house_number(self):
     # exact (from prompt)
@@ -32,13 +41,31 @@ class Tests(unittest.TestCase):
     
     # make sure we're using "at least" logic
     self.assertEqual(lowest_house_number(11, upper_bound=100), 2)
+    
+  def test_first_house(self):
+    presents = presents_sieve(upper_bound=100)
+    self.assertEqual([first_house(presents, target) for target in (10, 70, 130)], [1, 4, 8])
+
+def prepare() -> list[int]:
+  # the sieve only depends on the upper bound, so every target shares one
+  return presents_sieve()
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def solve_prepared(presents: list[int], stream: typing.TextIO) -> int:
+  return first_house(presents, int(stream.read()))
+
+def solve(stream: typing.Optional[typing.TextIO] = None) -> int:
+  return lowest_house_number(int(stream.read()) if stream else 33100000)
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', help='puzzle input file, - for stdin, instead of the one in solve()')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
+  elif args.input:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
   else:
-    print(lowest_house_number(33100000))
\ No newline at end of file
+    print(solve())
\ No newline at end of file
@@ -3,7 +3,13 @@ import unittest
 import typing
 import sys
 
-def lowest_house_number(target: int, multiplier: int, delivery_limit: typing.Optional[int], house_limit: int) -> int:  
+INPUTS: list[str] = [] # puzzle input is hard-coded in solve(), which also takes it as an optional stream
+
+MULTIPLIER = 11
+DELIVERY_LIMIT = 50
+HOUSE_LIMIT = 1_000_000
+
+def presents_sieve(delivery_limit: typing.Optional[int], house_limit: int) -> list[int]:
   presents = [0] * (house_limit + 1)
   
   for elf in range(1, house_limit + 1):
@@ -14,12 +20,18 @@ def lowest_house_number(target: int, multiplier: int, delivery_limit: typing.Opt
       if delivery_limit and deliveries >= delivery_limit:
         break
       
+  return presents
+
+def first_house(presents: list[int], target: int, multiplier: int) -> int:
   for house, total in enumerate(presents):
     if total * multiplier >= target:
       return house
     
   raise RuntimeError('No house meets target with upper bound given')
 
+def lowest_house_number(target: int, multiplier: int, delivery_limit: typing.Optional[int], house_limit: int) -> int:
+  return first_house(presents_sieve(delivery_limit, house_limit), target, multiplier)
+
 class Tests(unittest.TestCase):
   def test_lowest_house_number(self):
     # exact (from prompt)
@@ -36,12 +48,27 @@ class Tests(unittest.TestCase):
     # make sure we're using "at least" logic
     self.assertEqual(lowest_house_number(11, multiplier=10, delivery_limit=None, house_limit=100), 2)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def prepare() -> list[int]:
+  # the sieve only depends on the delivery and house limits, so every target shares one
+  return presents_sieve(DELIVERY_LIMIT, HOUSE_LIMIT)
+
+def solve_prepared(presents: list[int], stream: typing.TextIO) -> int:
+  return first_house(presents, int(stream.read()), MULTIPLIER)
+
+def solve(stream: typing.Optional[typing.TextIO] = None) -> int:
+  target = int(stream.read()) if stream else 33100000
+  return lowest_house_number(target, multiplier=MULTIPLIER, delivery_limit=DELIVERY_LIMIT, house_limit=HOUSE_LIMIT)
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', help='puzzle input file, - for stdin, instead of the one in solve()')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
+  elif args.input:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
   else:
-    print(lowest_house_number(33100000, multiplier=11, delivery_limit=50, house_limit=1_000_000))
\ No newline at end of file
+    print(solve())
\ No newline at end of file
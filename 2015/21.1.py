@@ -3,32 +3,69 @@ import argparse
 import unittest
 import textwrap
 import typing
-import copy
 import sys
 import io
 import re
 
+import reader
+
+INPUTS = ['boss.txt', 'shop.txt']
+
 ATTACK_MIN_DAMAGE = 1
 N_RINGS_ALLOWED = {0, 1, 2}
 
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
+
+HIT_POINTS_PATTERN = re.compile(r'Hit Points: (\d+)')
+DAMAGE_PATTERN = re.compile(r'Damage: (\d+)')
+ARMOR_PATTERN = re.compile(r'Armor: (\d+)')
+
+# the shop is tables of a header line then an item per line, lines the format does not cover fall through to the
+# invalid group
+SHOP_PATTERN = re.compile(
+  r'^(?P<header>\w+):[ \t]+Cost[ \t]+Damage[ \t]+Armor[ \t]*$'
+  r'|^(?P<name>[^\n]+)[ \t]+(?P<cost>\d+)[ \t]+(?P<damage>\d+)[ \t]+(?P<armor>\d+)[ \t]*$'
+  r'|^(?P<invalid>[^\n]*\S[^\n]*)$',
+  re.MULTILINE,
+)
+
 class Shop(typing.TypedDict):
   weapons: list[Item]
   armor: list[Item]
   rings: list[Item]
 
-class Item(typing.TypedDict):
+class ItemView(typing.TypedDict):
   name: str
   cost: int
   damage: int
   armor: int
+
+class Item(typing.NamedTuple):
+  """A shop item. Tuple-backed, so it is smaller than its dict view and fields are read by position."""
+  name: str
+  cost: int
+  damage: int
+  armor: int
+  
+  @classmethod
+  def from_view(cls, view: ItemView) -> Item:
+    return cls(**view)
+  
+  def view(self) -> ItemView:
+    return ItemView(**self._asdict())
   
 class Boss:
+  __slots__ = ('hp', 'damage', 'armor')
+  
   def __init__(self, hp: int, damage: int, armor: int):
     self.hp = hp
     self.damage = damage
     self.armor = armor
 
 class Player:
+  __slots__ = ('hp', 'inventory')
+  
   def __init__(self, hp: int, inventory: typing.Optional[Inventory] = None):
     self.hp = hp
     self.inventory = inventory if inventory else Inventory()
@@ -43,6 +80,8 @@ class Inventory():
   
   class InvalidInventory(Exception): pass
   
+  __slots__ = ('weapon', 'armor', 'rings')
+  
   def __init__(self):
     self.weapon: typing.Optional[Item] = None
     self.armor: typing.Optional[Item] = None
@@ -66,31 +105,31 @@ class Inventory():
   def total_cost(self) -> int:
     cost = 0
     if self.weapon:
-        cost += self.weapon['cost']
+        cost += self.weapon.cost
     if self.armor:
-        cost += self.armor['cost']
+        cost += self.armor.cost
     if self.rings:
-        cost += sum(r['cost'] for r in self.rings)
+        cost += sum(r.cost for r in self.rings)
     return cost
   
   def total_damage(self) -> int:
     damage = 0
     if self.weapon:
-        damage += self.weapon['damage']
+        damage += self.weapon.damage
     if self.armor:
-        damage += self.armor['damage']
+        damage += self.armor.damage
     if self.rings:
-        damage += sum(r['damage'] for r in self.rings)
+        damage += sum(r.damage for r in self.rings)
     return damage
   
   def total_armor(self) -> int:
     armor = 0
     if self.weapon:
-        armor += self.weapon['armor']
+        armor += self.weapon.armor
     if self.armor:
-        armor += self.armor['armor']
+        armor += self.armor.armor
     if self.rings:
-        armor += sum(r['armor'] for r in self.rings)
+        armor += sum(r.armor for r in self.rings)
     return armor
 
 def find_optimal_gold_spend(*, player: Player, boss: Boss, shop: Shop) -> int:
@@ -108,13 +147,14 @@ def find_optimal_gold_spend(*, player: Player, boss: Boss, shop: Shop) -> int:
   for weapon in weapon_c:
     for armor in armor_c:
       for rings in rings_c:
-        player_c = copy.deepcopy(player)
+        player_c = Player(hp=player.hp)
         player_c.inventory.set_weapon(weapon)
         player_c.inventory.set_armor(armor)
         player_c.inventory.set_rings(rings)
         player_c.inventory.validate()
+        boss_c = Boss(hp=boss.hp, damage=boss.damage, armor=boss.armor)
         
-        if play(player=player_c, boss=copy.deepcopy(boss)):
+        if play(player=player_c, boss=boss_c):
           min_gold = min(min_gold, player_c.inventory.total_cost())
   
   return int(min_gold)
@@ -127,10 +167,16 @@ def ring_combinations(
   
   max_n_rings_allowed = max(n_rings_allowed)
   curr_rings: list[Item] = []
+  stats = STATS
   def rings_c_dfs(start: int) -> None:
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], len(curr_rings))
     if len(curr_rings) in n_rings_allowed:
       rings_c.append(curr_rings.copy()) # shallow copy is okay here
     if len(curr_rings) == max_n_rings_allowed:
+      if stats is not None:
+        stats['pruned'] += 1
       return
     
     for i in range(start, len(rings)):
@@ -141,6 +187,25 @@ def ring_combinations(
   rings_c_dfs(0)
   return rings_c
 
+class Loadout(typing.NamedTuple):
+  cost: int
+  inventory: Inventory
+
+def loadouts(shop: Shop) -> list[Loadout]:
+  """Every valid weapon, armor and rings combination the shop offers."""
+  table: list[Loadout] = []
+  rings_c = ring_combinations(shop['rings'])
+  for weapon in shop['weapons']:
+    for armor in shop['armor'] + [None]:
+      for rings in rings_c:
+        inventory = Inventory()
+        inventory.set_weapon(weapon)
+        inventory.set_armor(armor)
+        inventory.set_rings(rings)
+        inventory.validate()
+        table.append(Loadout(cost=inventory.total_cost(), inventory=inventory))
+  return table
+
 def play(*, player: Player, boss: Boss) -> bool:
   """Returns if the player wins or not."""
   while True:
@@ -157,9 +222,9 @@ def play(*, player: Player, boss: Boss) -> bool:
 def parse_boss(stream: typing.TextIO) -> Boss:
   text = stream.read()
   
-  hp_match = re.search(r'Hit Points: (\d+)', text)
-  damage_match = re.search(r'Damage: (\d+)', text)
-  armor_match = re.search(r'Armor: (\d+)', text)
+  hp_match = HIT_POINTS_PATTERN.search(text)
+  damage_match = DAMAGE_PATTERN.search(text)
+  armor_match = ARMOR_PATTERN.search(text)
   
   if not (hp_match and damage_match and armor_match):
     raise RuntimeError(f'Unable to parse boss: {text}')
@@ -171,49 +236,53 @@ def parse_boss(stream: typing.TextIO) -> Boss:
   )
 
 def parse_shop(stream: typing.TextIO) -> Shop:
-  weapons = parse_shop_table(stream)
-  armor = parse_shop_table(stream)
-  rings = parse_shop_table(stream)
-  return Shop(weapons=weapons, armor=armor, rings=rings)
+  tables = parse_shop_tables(stream)
+  if len(tables) != 3:
+    raise RuntimeError(f'Expected weapons, armor and rings tables, found {len(tables)}')
   
+  weapons, armor, rings = tables
+  return Shop(weapons=weapons, armor=armor, rings=rings)
+
 def parse_shop_table(stream: typing.TextIO) -> list[Item]:
-  items: list[Item] = []
-  
-  stream.readline() # skip header
+  [table] = parse_shop_tables(stream)
+  return table
+
+def parse_shop_tables(stream: typing.TextIO) -> list[list[Item]]:
+  tables: list[list[Item]] = []
   
-  line = stream.readline().strip()
-  while line:
-    capture = re.match(r'(.+)\s+(\d+)\s+(\d+)\s+(\d+)', line)
-    if not capture: raise RuntimeError(f'Unable to find item data from line item: "{line}"')
+  for capture in SHOP_PATTERN.finditer(reader.read_text(stream)):
+    header, name, cost, damage, armor, invalid = capture.groups()
+    if invalid or (not header and not tables):
+      raise RuntimeError(f'Unable to find item data from line item: "{capture.group().strip()}"')
     
-    name, cost, damage, armor = capture.groups()
-    items.append(Item(
+    if header:
+      tables.append([])
+      continue
+    tables[-1].append(Item(
       name=name.strip(),
       cost=int(cost),
       damage=int(damage),
       armor=int(armor),
     ))
     
-    line = stream.readline().strip()
-    
-  return items
+  return tables
 
 class Tests(unittest.TestCase):
   def test_ring_combinations(self):
     r1 = Item(name='1', cost=1, damage=1, armor=1)
     r2 = Item(name='2', cost=2, damage=2, armor=2)
     r3 = Item(name='3', cost=3, damage=3, armor=3)
-
+    
     # allow 1
     self.assertEqual(
-      {frozenset(item['name'] for item in subset) for subset in ring_combinations([r1, r2, r3], n_rings_allowed={1})},
-      {frozenset(item['name'] for item in subset) for subset in [[r1], [r2], [r3]]},
+      {frozenset(item.name for item in subset) for subset in ring_combinations([r1, r2, r3], n_rings_allowed={1})},
+      {frozenset(item.name for item in subset) for subset in [[r1], [r2], [r3]]},
     )
     
     # allow 0, 1, or 2
     self.assertEqual(
-      {frozenset(item['name'] for item in subset) for subset in ring_combinations([r1, r2, r3], n_rings_allowed={0, 1, 2})},
-      {frozenset(item['name'] for item in subset) for subset in typing.cast(list[list[Item]], [[], [r1], [r2], [r3], [r1, r2], [r1, r3], [r2, r3]])},
+      {frozenset(item.name for item in subset) for subset in ring_combinations([r1, r2, r3], n_rings_allowed={0, 1, 2})},
+      {frozenset(item.name for item in subset) for subset in typing.cast(list[list[Item]], [[], [r1], [r2], [r3], [r1, r2], [r1, r3], [r2, r3]])},
     )
   
   def test_play(self):
@@ -229,6 +298,28 @@ class Tests(unittest.TestCase):
     player.hp = 6
     self.assertFalse(play(player=player, boss=Boss(hp=12, damage=7, armor=2)))
   
+  def test_solve_prepared(self):
+    boss_text = 'Hit Points: 100\nDamage: 8\nArmor: 1\n'
+    shop_text = textwrap.dedent("""\
+      Weapons:    Cost  Damage  Armor
+      Dagger        8     4       0
+      Longsword    40     7       0
+      
+      Armor:      Cost  Damage  Armor
+      Leather      13     0       1
+      
+      Rings:      Cost  Damage  Armor
+      Damage +1    25     1       0
+      Defense +1   20     0       1
+      """)
+    tables = prepare()
+    for _ in range(2):
+      self.assertEqual(
+        solve_prepared(tables, io.StringIO(boss_text), io.StringIO(shop_text)),
+        solve(io.StringIO(boss_text), io.StringIO(shop_text)),
+      )
+    self.assertEqual(len(tables), 1)
+  
   def test_parse_boss(self):
     boss = parse_boss(io.StringIO('Hit Points: 10\nDamage: 11\nArmor: 12'))
     self.assertEqual(boss.hp, 10)
@@ -262,25 +353,46 @@ class Tests(unittest.TestCase):
       """))),
       [Item(name='Weapon +1', cost=1, damage=2, armor=3)]
     )
+    
+    # junk after the column names
+    self.assertRaises(RuntimeError, lambda: parse_shop_table(io.StringIO('Weapons:    Cost  Damage  Armor  Speed\n')))
+
+def parse(boss_stream: typing.TextIO, shop_stream: typing.TextIO) -> tuple[Boss, Shop]:
+  return parse_boss(boss_stream), parse_shop(shop_stream)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def solve_parsed(parsed: tuple[Boss, Shop]) -> int:
+  boss, shop = parsed
+  return find_optimal_gold_spend(player=Player(hp=100), boss=boss, shop=shop)
+
+def prepare() -> dict[str, list[Loadout]]:
+  # loadout tables by shop text, the shop comes with the puzzle rather than anyone's input so a batch builds one
+  return {}
+
+def solve_prepared(tables: dict[str, list[Loadout]], boss_stream: typing.TextIO, shop_stream: typing.TextIO) -> int:
+  boss = parse_boss(boss_stream)
+  shop_text = shop_stream.read()
+  if shop_text not in tables:
+    tables[shop_text] = loadouts(parse_shop(io.StringIO(shop_text)))
+    
+  min_gold = float('inf')
+  for loadout in tables[shop_text]:
+    boss_c = Boss(hp=boss.hp, damage=boss.damage, armor=boss.armor)
+    if play(player=Player(hp=100, inventory=loadout.inventory), boss=boss_c):
+      min_gold = min(min_gold, loadout.cost)
+  return int(min_gold)
+
+def solve(boss_stream: typing.TextIO, shop_stream: typing.TextIO) -> int:
+  return solve_parsed(parse(boss_stream, shop_stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('boss', nargs='?', default='boss.txt', help='boss stats file, - for stdin')
+  arg_parser.add_argument('shop', nargs='?', default='shop.txt')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('boss.txt') as f:
-      boss = parse_boss(f)
-      
-    with open('shop.txt') as f:
-      shop = parse_shop(f)
-      
-    gold = find_optimal_gold_spend(
-      player=Player(hp=100),
-      boss=boss,
-      shop=shop
-    )
-    
-    print(gold)
\ No newline at end of file
+    with (sys.stdin if args.boss == '-' else open(args.boss)) as boss_f, open(args.shop) as shop_f:
+      print(solve(boss_f, shop_f))
\ No newline at end of file
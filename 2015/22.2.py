@@ -7,6 +7,15 @@ import heapq
 import enum
 import copy
 import sys
+import io
+import re
+
+import search
+
+INPUTS: list[str] = [] # puzzle input is hard-coded in solve(), which also takes it as an optional stream
+
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
 
 class GameTurn(enum.Enum):
   PLAYER = enum.auto()
@@ -214,13 +223,26 @@ SPELLS_TYPES: list[type[Spell]] = [MagicMissileSpell, DrainSpell, ShieldSpell, P
 
 def play(initial_game: Game) -> int:
   min_mana = float('inf')
+  stats = STATS
+  
+  def record_win(mana_spent: int) -> None:
+    nonlocal min_mana
+    if mana_spent < min_mana:
+      min_mana = mana_spent
+      if stats is not None:
+        stats['bound_updates'] += 1
   
   counter = itertools.count()
   heap: list[tuple[int, int, Game, list[type[Spell]]]] = [(0, next(counter), initial_game, [])]
   while heap:
     curr_mana_spent, _, game, curr_spells = heapq.heappop(heap)
     if curr_mana_spent >= min_mana:
+      if stats is not None:
+        stats['pruned'] += 1
       continue
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], len(curr_spells))
     
     for spell in SPELLS_TYPES:
       new_game = copy.deepcopy(game)
@@ -230,7 +252,7 @@ def play(initial_game: Game) -> int:
       new_game.state.player.hp -= 1
       if new_game.is_over():
         if new_game.state.player.hp > 0:
-          min_mana = min(min_mana, curr_mana_spent)
+          record_win(curr_mana_spent)
         continue
       try:
         new_game.cast_spell(spell)
@@ -240,7 +262,7 @@ def play(initial_game: Game) -> int:
         continue # not a solution
       if new_game.is_over():
         if new_game.state.player.hp > 0:
-          min_mana = min(min_mana, curr_mana_spent + spell.cost())
+          record_win(curr_mana_spent + spell.cost())
         continue
       new_game.end_turn()
       
@@ -248,32 +270,178 @@ def play(initial_game: Game) -> int:
       new_game.start_turn()
       if new_game.is_over():
         if new_game.state.player.hp > 0:
-          min_mana = min(min_mana, curr_mana_spent + spell.cost())
+          record_win(curr_mana_spent + spell.cost())
         continue
       new_game.state.player.hp -= max(1, new_game.state.boss.damage - new_game.state.player.armor)
       if new_game.is_over():
         if new_game.state.player.hp > 0:
-          min_mana = min(min_mana, curr_mana_spent + spell.cost())
+          record_win(curr_mana_spent + spell.cost())
         continue
       new_game.end_turn()
       
       heapq.heappush(heap, (curr_mana_spent + spell.cost(), next(counter), new_game, curr_spells + [spell]))
+      if stats is not None:
+        stats['max_heap'] = max(stats['max_heap'], len(heap))
         
   return int(min_mana)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+PLAYER_HP = 50
+PLAYER_MANA = 500
+HARD_MODE_DAMAGE = 1 # hit points the player loses at the start of each of their turns
+
+class Effect(typing.NamedTuple):
+  boss_damage: int
+  mana: int
+  armor: int # shield armor after the tick, which is what the boss attacks into
+
+class SpellEntry(typing.NamedTuple):
+  cost: int
+  damage: int
+  heal: int
+  timer: typing.Optional[int] # which of the (shield, poison, recharge) timers the spell starts
+  turns: int
+
+# (shield, poison, recharge) turns left -> (turns left after one tick of the active effects, what that tick did)
+Transitions: typing.TypeAlias = dict[tuple[int, int, int], tuple[tuple[int, int, int], Effect]]
+
+SPELL_TABLE = [
+  SpellEntry(cost=MagicMissileSpell.cost(), damage=4, heal=0, timer=None, turns=0),
+  SpellEntry(cost=DrainSpell.cost(), damage=2, heal=2, timer=None, turns=0),
+  SpellEntry(cost=ShieldSpell.cost(), damage=0, heal=0, timer=0, turns=6),
+  SpellEntry(cost=PoisonSpell.cost(), damage=0, heal=0, timer=1, turns=6),
+  SpellEntry(cost=RechargeSpell.cost(), damage=0, heal=0, timer=2, turns=5),
+]
+POISON = SPELL_TABLE[3]
+POISON_DAMAGE = 3 # per turn
+
+def transition_table() -> Transitions:
+  table: Transitions = {}
+  for timers in itertools.product(range(7), range(7), range(6)):
+    shield, poison, recharge = timers
+    after = (max(shield - 1, 0), max(poison - 1, 0), max(recharge - 1, 0))
+    effect = Effect(boss_damage=POISON_DAMAGE if poison else 0, mana=101 if recharge else 0, armor=7 if after[0] else 0)
+    table[timers] = (after, effect)
+  return table
+
+TurnState: typing.TypeAlias = tuple[int, int, int, tuple[int, int, int]] # (hp, mana, boss hp, timers) as a turn starts
+WON: TurnState = (0, 0, 0, (0, 0, 0)) # every way of beating the boss leads here, no other state has 0 hp
+
+def least_mana(
+  transitions: Transitions,
+  *,
+  boss_hp: int,
+  boss_damage: int,
+  player_hp: int = PLAYER_HP,
+  player_mana: int = PLAYER_MANA,
+) -> int:
+  """The same rules as play(), down to casting with any mana left at all, searched over plain tuples instead of
+  copied Game objects so each state is only expanded once."""
+  def successors(state: TurnState) -> list[tuple[int, TurnState]]:
+    hp, mana, boss, timers = state
+    
+    # == player turn ==
+    timers, effect = transitions[timers]
+    boss -= effect.boss_damage
+    mana += effect.mana
+    hp -= HARD_MODE_DAMAGE
+    if hp <= 0:
+      return []
+    if boss <= 0:
+      return [(0, WON)]
+    if mana <= 0:
+      return []
+    
+    steps: list[tuple[int, TurnState]] = []
+    for spell in SPELL_TABLE:
+      if spell.timer is not None and timers[spell.timer]:
+        continue
+      new_hp, new_mana, new_boss = hp + spell.heal, mana - spell.cost, boss - spell.damage
+      new_timers = timers
+      if spell.timer is not None:
+        new_timers = typing.cast(tuple[int, int, int], timers[:spell.timer] + (spell.turns,) + timers[spell.timer + 1:])
+        
+      # == boss turn ==
+      if new_boss > 0:
+        new_timers, effect = transitions[new_timers]
+        new_boss -= effect.boss_damage
+        new_mana += effect.mana
+      if new_boss <= 0:
+        steps.append((spell.cost, WON))
+        continue
+      new_hp -= max(1, boss_damage - effect.armor)
+      if new_hp > 0:
+        steps.append((spell.cost, (new_hp, new_mana, new_boss, new_timers)))
+    return steps
+  
+  def mana_needed(state: TurnState) -> int:
+    # no spell deals more damage for its mana than poison, and whatever poison is active still deals its part
+    _, _, boss, (_, poison, _) = state
+    return max(boss - POISON_DAMAGE * poison, 0) * POISON.cost // (POISON_DAMAGE * POISON.turns)
+  
+  start = (player_hp, player_mana, boss_hp, (0, 0, 0))
+  mana = search.least_cost(start, successors, lambda state: state == WON, mana_needed, stats=STATS)
+  if mana is None:
+    raise RuntimeError(f'No way to beat a boss with {boss_hp} hit points and {boss_damage} damage')
+  return mana
+
+def parse_boss(stream: typing.TextIO) -> Boss:
+  text = stream.read()
+  hp_match = re.search(r'Hit Points: (\d+)', text)
+  damage_match = re.search(r'Damage: (\d+)', text)
+  if not (hp_match and damage_match):
+    raise RuntimeError(f'Unable to parse boss: {text}')
+  return Boss(hp=int(hp_match.group(1)), damage=int(damage_match.group(1)))
+
+class Tests(unittest.TestCase):
+  def test_transition_table(self):
+    transitions = transition_table()
+    self.assertEqual(transitions[(6, 0, 0)], ((5, 0, 0), Effect(boss_damage=0, mana=0, armor=7)))
+    self.assertEqual(transitions[(1, 1, 1)], ((0, 0, 0), Effect(boss_damage=3, mana=101, armor=0)))
+    
+  def test_least_mana(self):
+    transitions = transition_table()
+    for boss_hp, boss_damage in [(13, 8), (14, 8), (30, 9)]:
+      with self.subTest(boss_hp=boss_hp, boss_damage=boss_damage):
+        game = Game(state=GameState(player=Player(hp=PLAYER_HP, mana=PLAYER_MANA), boss=Boss(hp=boss_hp, damage=boss_damage)))
+        self.assertEqual(least_mana(transitions, boss_hp=boss_hp, boss_damage=boss_damage), play(game))
+        
+  def test_solve_prepared(self):
+    self.assertEqual(solve_prepared(prepare(), io.StringIO('Hit Points: 13\nDamage: 8\n')), 212)
+
+def prepare() -> Transitions:
+  return transition_table()
+
+def solve_prepared(transitions: Transitions, stream: typing.TextIO) -> int:
+  boss = parse_boss(stream)
+  return least_mana(transitions, boss_hp=boss.hp, boss_damage=boss.damage)
+
+def solve(stream: typing.Optional[typing.TextIO] = None) -> int:
+  boss = parse_boss(stream) if stream else Boss(hp=71, damage=10)
+  return least_mana(prepare(), boss_hp=boss.hp, boss_damage=boss.damage)
+
+# every spell tried on a deep copy of the whole game, kept as the reference the search is checked against
+def solve_reference(stream: typing.Optional[typing.TextIO] = None) -> int:
+  game = Game(
+    state=GameState(
+      player=Player(hp=PLAYER_HP, mana=PLAYER_MANA),
+      boss=parse_boss(stream) if stream else Boss(hp=71, damage=10),
+    )
+  )
+  
+  return play(game)
+
+ENGINES = {'reference': solve_reference}
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', help='puzzle input file, - for stdin, instead of the one in solve()')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]], buffer=False)
+  elif args.input:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
   else:
-    game = Game(
-      state=GameState(
-        player=Player(hp=50, mana=500),
-        boss=Boss(hp=71, damage=10),
-      )
-    )
-    
-    print(play(game))
\ No newline at end of file
+    print(solve())
\ No newline at end of file
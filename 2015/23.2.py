@@ -85,14 +85,23 @@ class Tests(unittest.TestCase):
       ]
     )
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def parse(stream: typing.TextIO) -> list[str]:
+  return parse_instructions(stream)
+
+def solve_parsed(instructions: list[str]) -> float:
+  return perform(instructions, register_start_map={'a': 1, 'b': 0})['b']
+
+def solve(stream: typing.TextIO) -> float:
+  return solve_parsed(parse(stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      instructions = parse_instructions(f)
-    print(perform(instructions, register_start_map={'a': 1, 'b': 0})['b'])
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
@@ -6,10 +6,16 @@ import math
 import sys
 import io
 
+import reader
+
 N_GROUPS = 3
 
+# search counters, the harness sets this to a collections.Counter to record how much work each search does
+STATS: typing.Optional[dict[str, int]] = None
+
 def balance(packages: list[int]) -> int:
   group_total_target = sum(packages) / N_GROUPS
+  stats = STATS
   
   for size in range(1, len(packages)):
     valid_first_group: typing.Optional[list[int]] = None
@@ -21,12 +27,19 @@ def balance(packages: list[int]) -> int:
       group: list[int] = []
     ) -> None:
       nonlocal group_total_target, size, valid_first_group
+      if stats is not None:
+        stats['expanded'] += 1
+        stats['max_depth'] = max(stats['max_depth'], len(group))
       
       if len(group) == size:
         if group_total != group_total_target:
+          if stats is not None:
+            stats['pruned'] += 1
           return
         if not valid_first_group or math.prod(group) < math.prod(valid_first_group):
           valid_first_group = group.copy()
+          if stats is not None:
+            stats['bound_updates'] += 1
           
       for i in range(start, len(packages)):
         group.append(packages[i])
@@ -46,10 +59,10 @@ def balance(packages: list[int]) -> int:
 
 def parse_packages(stream: typing.TextIO) -> list[int]:
   packages: list[int] = []
-  line = stream.readline().strip()
-  while line:
+  for line in reader.lines(stream):
+    if not (line := line.strip()):
+      break
     packages.append(int(line))
-    line = stream.readline().strip()
   return packages
 
 class Tests(unittest.TestCase):
@@ -65,14 +78,23 @@ class Tests(unittest.TestCase):
       [1, 10, 100]
     )
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def parse(stream: typing.TextIO) -> list[int]:
+  return parse_packages(stream)
+
+def solve_parsed(packages: list[int]) -> int:
+  return balance(packages)
+
+def solve(stream: typing.TextIO) -> int:
+  return solve_parsed(parse(stream))
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', default='input.txt', help='puzzle input file, - for stdin')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]])
   else:
-    with open('input.txt') as f:
-      packages = parse_packages(f)
-    print(balance(packages))
\ No newline at end of file
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
\ No newline at end of file
@@ -1,21 +1,49 @@
 import argparse
 import unittest
+import typing
 import sys
+import re
+import io
+
+INPUTS: list[str] = [] # puzzle input is hard-coded in solve(), which also takes it as an optional stream
+
+FIRST_CODE = 20151125
+CHECKPOINT_EVERY = 1000
 
 def calc_next_code(code: int) -> int:
   return (code * 252533) % 33554393
 
 def calc_step(row: int, col: int) -> int:
-  step = r = c = 1
-  while r != row or c != col:
-    if r == 1:
-      r = c + 1
-      c = 1
-    else:
-      r -= 1
-      c += 1
-    step += 1
-  return step
+  # the grid is filled one diagonal at a time, and the diagonal through (row, col) is numbered row + col - 1
+  diagonal = row + col - 1
+  return diagonal * (diagonal - 1) // 2 + col
+
+class CodeSequence:
+  """The codes in order, which do not depend on the puzzle input. Every CHECKPOINT_EVERY-th code is kept as the
+  sequence is walked, so a lookup costs at most that many steps past the furthest one already made."""
+  
+  def __init__(self) -> None:
+    self.checkpoints = [FIRST_CODE] # code at step 1 + i * CHECKPOINT_EVERY
+    
+  def code(self, step: int) -> int:
+    index, offset = divmod(step - 1, CHECKPOINT_EVERY)
+    while len(self.checkpoints) <= index:
+      code = self.checkpoints[-1]
+      for _ in range(CHECKPOINT_EVERY):
+        code = calc_next_code(code)
+      self.checkpoints.append(code)
+      
+    code = self.checkpoints[index]
+    for _ in range(offset):
+      code = calc_next_code(code)
+    return code
+
+def parse_position(stream: typing.TextIO) -> tuple[int, int]:
+  text = stream.read()
+  match = re.search(r'row (\d+), column (\d+)', text)
+  if not match:
+    raise RuntimeError(f'Unable to find row and column in: {text}')
+  return int(match.group(1)), int(match.group(2))
 
 class Tests(unittest.TestCase):
   def test_calc_next_code(self):
@@ -31,16 +59,46 @@ class Tests(unittest.TestCase):
     self.assertEqual(calc_step(1, 2), 3)
     self.assertEqual(calc_step(3, 1), 4)
     self.assertEqual(calc_step(2, 2), 5)
+    self.assertEqual(calc_step(1, 6), 21)
+    
+  def test_code_sequence(self):
+    sequence = CodeSequence()
+    self.assertEqual(sequence.code(calc_step(6, 6)), 27995004)
+    self.assertEqual(sequence.code(calc_step(1, 1)), FIRST_CODE)
+    
+    code = FIRST_CODE
+    for _ in range(CHECKPOINT_EVERY * 2):
+      code = calc_next_code(code)
+    self.assertEqual(sequence.code(CHECKPOINT_EVERY * 2 + 1), code)
+    
+  def test_solve_prepared(self):
+    text = 'To continue, please consult the code grid in the manual.  Enter the code at row 4, column 2.'
+    self.assertEqual(solve_prepared(prepare(), io.StringIO(text)), 32451966)
 
-arg_parser = argparse.ArgumentParser()
-arg_parser.add_argument('-t', '--test', action='store_true')
-args = arg_parser.parse_args()
+def prepare() -> CodeSequence:
+  return CodeSequence()
+
+def solve_prepared(sequence: CodeSequence, stream: typing.TextIO) -> int:
+  row, col = parse_position(stream)
+  return sequence.code(calc_step(row=row, col=col))
+
+def solve(stream: typing.Optional[typing.TextIO] = None) -> int:
+  row, col = parse_position(stream) if stream else (2981, 3075)
+  code = 20151125 # 1,1
+  for i in range(calc_step(row=row, col=col)-1):
+    code = calc_next_code(code)
+  return code
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument('-t', '--test', action='store_true')
+  arg_parser.add_argument('input', nargs='?', help='puzzle input file, - for stdin, instead of the one in solve()')
+  args = arg_parser.parse_args()
+  
   if args.test:
     unittest.main(argv=[sys.argv[0]], buffer=False)
+  elif args.input:
+    with (sys.stdin if args.input == '-' else open(args.input)) as f:
+      print(solve(f))
   else:
-    code = 20151125 # 1,1
-    for i in range(calc_step(row=2981, col=3075)-1):
-      code = calc_next_code(code)
-    print(code)
\ No newline at end of file
+    print(solve())
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""Dense NumPy grids of cells for the 2015 light and house days: rectangles updated a slice at a time, neighbour counts,
+and the #/. text format"""
+import numpy as np
+import itertools
+import unittest
+import typing
+import io
+
+import reader
+
+# lower left moving clockwise
+NEIGHBOR_DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)]
+LIT, DARK = ord('#'), ord('.')
+MAX_CELLS = 1 << 27 # in the box Marks keeps as a grid, 128 MiB of bools
+
+class InvalidGridSize(Exception): pass
+
+def empty(rows: int, cols: int, dtype: typing.Any = np.bool_) -> np.ndarray:
+  """A grid of unlit cells, bool for lights that are on or off, uint8 or int32 for counts and brightness"""
+  return np.zeros((rows, cols), dtype=dtype)
+
+def rect(cells: np.ndarray, x1: int, y1: int, x2: int, y2: int) -> np.ndarray:
+  """The cells from (x1, y1) to (x2, y2) inclusive, a view, so updating it updates the grid"""
+  return cells[x1:x2 + 1, y1:y2 + 1]
+
+def toggle(cells: np.ndarray) -> None:
+  np.logical_not(cells, out=cells)
+
+def add(cells: np.ndarray, amount: int, *, minimum: typing.Optional[int] = None) -> None:
+  """Adds amount to every cell in place, stopping at minimum on the way down, for signed grids"""
+  cells += amount
+  if minimum is not None:
+    np.maximum(cells, minimum, out=cells)
+
+def neighbour_counts(cells: np.ndarray) -> np.ndarray:
+  """The number of lit neighbours of every cell, summed from eight shifted views of the zero padded grid"""
+  rows, cols = cells.shape
+  padded = np.pad(cells, 1).astype(np.uint8)
+  counts = np.zeros((rows, cols), dtype=np.uint8)
+  for dr, dc in NEIGHBOR_DIRECTIONS:
+    counts += padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+  return counts
+
+def parse(lines: typing.Iterable[str], *, rows: int, cols: int) -> np.ndarray:
+  """A bool grid, True where the light is on, from its first rows lines of # and ."""
+  lines = [line.strip() for line in itertools.islice(lines, rows)]
+  lines += [''] * (rows - len(lines))
+  for r, line in enumerate(lines):
+    if len(line) != cols:
+      raise InvalidGridSize(f'Unexpected number of cols found for row {r}: {len(line)} != {cols}')
+      
+  # non-ascii characters become a single '?' so every cell stays one byte
+  cells = np.frombuffer(''.join(lines).encode('ascii', 'replace'), dtype=np.uint8).reshape(rows, cols)
+  lit = cells == LIT
+  if (unexpected := ~lit & (cells != DARK)).any():
+    r, c = np.argwhere(unexpected)[0]
+    raise RuntimeError(f'Unexpected byte at row {r} and col {c}: {lines[r][c]}')
+  return lit
+
+def read(stream: typing.TextIO, *, rows: int, cols: int) -> np.ndarray:
+  return parse(reader.lines(stream), rows=rows, cols=cols)
+
+def to_text(cells: np.ndarray) -> str:
+  return '\n'.join(row.tobytes().decode() for row in np.where(cells, LIT, DARK).astype(np.uint8))
+
+class SortedMarks:
+  """Cells marked anywhere on the plane as sorted unique int64 keys. New keys wait in a list until they outnumber the
+  merged ones, so each merge at least doubles what it covers and the sorting stays O(n log n) overall."""
+  __slots__ = ('merged', 'pending', 'pending_size')
+  
+  def __init__(self) -> None:
+    self.merged = np.empty(0, dtype=np.int64)
+    self.pending: list[np.ndarray] = []
+    self.pending_size = 0
+    
+  def mark(self, xs: np.ndarray, ys: np.ndarray) -> None:
+    self.pending.append((xs << 32) + ys)
+    self.pending_size += len(xs)
+    if self.pending_size > len(self.merged):
+      self.merge()
+      
+  def merge(self) -> None:
+    keys = np.sort(np.concatenate([self.merged, *self.pending]))
+    self.merged = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] # faster than np.unique on int64 keys
+    self.pending.clear()
+    self.pending_size = 0
+    
+  def __len__(self) -> int:
+    self.merge()
+    return len(self.merged)
+
+class Marks:
+  """Cells marked anywhere on the plane, held as a bool grid over the bounding box of the marks so far. The box grows
+  by at least its own size on any side it has to, so growing it costs O(1) amortized per cell. Marks strewn far
+  apart in both directions would need a box of more than max_cells, and move to SortedMarks instead."""
+  __slots__ = ('cells', 'x0', 'y0', 'max_cells', 'sparse')
+  
+  def __init__(self, *, max_cells: int = MAX_CELLS) -> None:
+    self.cells = empty(0, 0)
+    self.x0 = self.y0 = 0 # the plane coordinates of cells[0, 0]
+    self.max_cells = max_cells
+    self.sparse: typing.Optional[SortedMarks] = None
+    
+  def mark(self, xs: np.ndarray, ys: np.ndarray) -> None:
+    """Marks every (xs[i], ys[i])"""
+    if self.sparse is None and not self.mark_dense(xs, ys):
+      self.sparse = SortedMarks()
+      self.sparse.mark(*self.points())
+      self.cells = empty(0, 0)
+    if self.sparse is not None:
+      self.sparse.mark(xs, ys)
+      
+  def mark_dense(self, xs: np.ndarray, ys: np.ndarray) -> bool:
+    """Marks the cells on the grid, growing it as needed, False and nothing marked if it would pass max_cells"""
+    if not len(xs):
+      return True
+    rows, cols = self.cells.shape
+    low_x, high_x, low_y, high_y = int(xs.min()), int(xs.max()), int(ys.min()), int(ys.max())
+    if not rows:
+      self.x0, self.y0 = low_x, low_y
+    elif self.x0 <= low_x and high_x < self.x0 + rows and self.y0 <= low_y and high_y < self.y0 + cols:
+      self.cells[xs - self.x0, ys - self.y0] = True
+      return True
+    
+    x0 = min(self.x0, low_x - rows if low_x < self.x0 else self.x0)
+    y0 = min(self.y0, low_y - cols if low_y < self.y0 else self.y0)
+    x1 = max(self.x0 + rows, high_x + 1 + rows if high_x >= self.x0 + rows else 0)
+    y1 = max(self.y0 + cols, high_y + 1 + cols if high_y >= self.y0 + cols else 0)
+    if (x1 - x0) * (y1 - y0) > self.max_cells:
+      return False
+    cells = empty(x1 - x0, y1 - y0)
+    cells[self.x0 - x0:self.x0 - x0 + rows, self.y0 - y0:self.y0 - y0 + cols] = self.cells
+    self.cells, self.x0, self.y0 = cells, x0, y0
+    self.cells[xs - self.x0, ys - self.y0] = True
+    return True
+  
+  def points(self) -> tuple[np.ndarray, np.ndarray]:
+    """The xs and ys of every cell marked on the grid"""
+    xs, ys = np.nonzero(self.cells)
+    return xs.astype(np.int64) + self.x0, ys.astype(np.int64) + self.y0
+  
+  def __len__(self) -> int:
+    return len(self.sparse) if self.sparse is not None else int(np.count_nonzero(self.cells))
+
+class Tests(unittest.TestCase):
+  def test_rect(self):
+    cells = empty(4, 4)
+    rect(cells, 0, 0, 2, 1)[:] = True
+    toggle(rect(cells, 1, 1, 3, 3))
+    self.assertEqual(to_text(cells), '##..\n#.##\n#.##\n.###')
+    self.assertEqual(neighbour_counts(cells)[1].tolist(), [3, 6, 4, 3])
+    
+    brightness = empty(2, 2, np.int32)
+    add(brightness, 2)
+    add(rect(brightness, 0, 0, 0, 1), -1, minimum=0)
+    add(rect(brightness, 0, 0, 0, 0), -3, minimum=0)
+    self.assertEqual(brightness.tolist(), [[0, 1], [2, 2]])
+    
+  def test_text(self):
+    text = '##.#.#\n...##.\n#....#'
+    self.assertEqual(to_text(read(io.StringIO(text + '\n'), rows=3, cols=6)), text)
+    self.assertRaises(InvalidGridSize, lambda: read(io.StringIO(text), rows=4, cols=6))
+    self.assertRaises(InvalidGridSize, lambda: read(io.StringIO(text), rows=3, cols=5))
+    self.assertRaisesRegex(RuntimeError, 'row 1 and col 1: é', lambda: read(io.StringIO('.#\n.é'), rows=2, cols=2))
+    
+  def test_marks(self):
+    marks = Marks(max_cells=10 ** 6)
+    for xs, ys in [([0, 1], [0, 0]), ([-3, 0], [5, 0]), ([100], [-100]), ([], [])]:
+      marks.mark(np.array(xs, dtype=np.int64), np.array(ys, dtype=np.int64))
+    self.assertEqual(len(marks), 4)
+    self.assertEqual(sorted(zip(*(axis.tolist() for axis in marks.points()))), [(-3, 5), (0, 0), (1, 0), (100, -100)])
+    
+    # too far to hold on the grid, they carry on as sorted keys
+    marks.mark(np.array([10 ** 6, 0]), np.array([10 ** 6, 0]))
+    self.assertIsNotNone(marks.sparse)
+    marks.mark(np.array([-3, 7]), np.array([5, 7]))
+    self.assertEqual(len(marks), 6)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,27 @@
+"""Day 01's parenthesis moves, shared by both parts"""
+import numpy as np
+import unittest
+
+UP, DOWN = ord('('), ord(')')
+MIDPOINT = UP + DOWN # so MIDPOINT - 2 * byte is +1 for an up and -1 for a down
+
+def count_moves(chunk: str) -> tuple[int, int]:
+  """(ups, downs) in a chunk that must hold nothing but parentheses"""
+  up, down = chunk.count('('), chunk.count(')')
+  if up + down != len(chunk):
+    raise RuntimeError(f'Unexpected byte: {next(byte for byte in chunk if byte not in "()")}')
+  return up, down
+
+def unexpected(window: np.ndarray, bad: int) -> RuntimeError:
+  """The error for the byte at bad in a window of bytes, decoded along with what follows it in case it starts a
+  multi-byte character"""
+  return RuntimeError(f'Unexpected byte: {bytes(window[bad:bad + 4]).decode(errors="replace")[0]}')
+
+class Tests(unittest.TestCase):
+  def test_count_moves(self):
+    self.assertEqual(count_moves('(()(('), (4, 1))
+    self.assertRaisesRegex(RuntimeError, 'Unexpected byte: x', lambda: count_moves('(x)'))
+    self.assertEqual(str(unexpected(np.frombuffer('(é'.encode(), dtype=np.uint8), 1)), 'Unexpected byte: é')
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,174 @@
+"""Day 02's presents, parsed from LxWxH lines into one row of sides per present and totalled a column at a time"""
+import numpy as np
+import tracemalloc
+import unittest
+import tempfile
+import typing
+import io
+import os
+import re
+
+import reader
+
+CHUNK_SIZE = 1 << 20 # bytes the streaming engine reads at a time
+BLOCK_SIZE = 1 << 16 # bytes parsed at a time, few enough for every array of a block to stay in cache
+MAX_DIGITS = 18 # per side, so every side parses exactly into an int64
+SPACES = b' \t\r\v\f' # dropped before parsing, like line.strip() and int() would around a side
+INNER_SPACE = re.compile(rb'[0-9][ \t\r\v\f]+[0-9]') # within a side, which int() rejects
+DIGITS = b'0123456789'
+NEWLINE = b'\n'
+LINE_SEPARATORS = b'xx\n'
+
+def line_blocks(chunks: typing.Iterable[bytes]) -> typing.Iterator[bytes]:
+  """The chunks regrouped into blocks of whole lines, each just over BLOCK_SIZE long"""
+  rest = b''
+  for chunk in chunks:
+    data = rest + chunk
+    start = 0
+    while (stop := data.find(b'\n', start + BLOCK_SIZE) + 1):
+      yield data[start:stop]
+      start = stop
+    rest = data[start:]
+  if rest:
+    yield rest
+
+def misshapen_line(data: bytes) -> int:
+  separators = data.translate(None, DIGITS)
+  return next(i for i in range(0, len(separators), 3) if separators[i:i + 3] != LINE_SEPARATORS) // 3
+
+def parse_block(data: bytes, line: int) -> np.ndarray:
+  """The (presents, 3) int64 sides of every LxWxH line in the block, parsed for all of them at once. line is the
+  block's first line number, for errors."""
+  if any(space in data for space in SPACES):
+    if (inner := INNER_SPACE.search(data)):
+      raise RuntimeError(f'Expected LxWxH on line {line + data[:inner.start()].count(NEWLINE)}')
+    data = data.translate(None, SPACES)
+  if (invalid := data.translate(None, DIGITS + LINE_SEPARATORS)):
+    raise RuntimeError(f'Unexpected byte: {data[data.index(invalid[0]):][:4].decode(errors="replace")[0]}')
+  if data and not data.endswith(b'\n'):
+    data += b'\n'
+    
+  # a newline in front makes the bytes before any side's first digit a separator too
+  raw = np.frombuffer(b'\n' + data, dtype=np.uint8)
+  digits = raw - np.uint8(ord('0')) # separators wrap past 9
+  ends = np.flatnonzero(digits[1:] > 9) # where every side's last digit is
+  # with only x and newlines between sides, every third being a newline and the count agreeing leaves just LxWxH
+  if len(ends) != 3 * data.count(b'\n') or (raw[ends[2::3] + 1] != ord('\n')).any():
+    raise RuntimeError(f'Expected LxWxH on line {line + misshapen_line(data)}')
+  lengths = np.diff(ends, prepend=-1) - 1
+  if (bad := (lengths == 0) | (lengths > MAX_DIGITS)).any():
+    raise RuntimeError(f'Expected sides of 1 to {MAX_DIGITS} digits on line {line + int(np.argmax(bad)) // 3}')
+    
+  # one digit further back at a time, for as long as any side has that many
+  sides = digits[ends].astype(np.int64)
+  for k in range(1, int(lengths.max(initial=0))):
+    digit = digits[ends - k]
+    digit *= lengths > k
+    sides += digit * np.int64(10 ** k)
+  return sides.reshape(-1, 3)
+
+def parsed_blocks(blocks: typing.Iterable[bytes]) -> typing.Iterator[np.ndarray]:
+  line = 1
+  for block in blocks:
+    sides = parse_block(block, line)
+    line += len(sides)
+    yield sides
+
+def parse_sides(data: bytes) -> np.ndarray:
+  """The (presents, 3) int64 sides of every LxWxH line, parsed a block of whole lines at a time"""
+  return np.concatenate([np.zeros((0, 3), dtype=np.int64), *parsed_blocks(line_blocks([data]))])
+
+def columns(sides: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+  """The sides as contiguous l, w and h columns of the narrowest type any one present's figures fit, int32 for the
+  puzzle's, or Python ints when even the totals could overflow int64"""
+  longest = int(sides.max(initial=0))
+  most = longest ** 3 + 7 * longest ** 2 + 4 * longest # bounds a present's paper and its ribbon
+  dtype = np.int32 if most < 2 ** 31 else np.int64 if len(sides) * most < 2 ** 63 else object
+  l, w, h = np.ascontiguousarray(sides.T, dtype=dtype)
+  return l, w, h
+
+def total(values: np.ndarray) -> int:
+  return int(values.sum(dtype=None if values.dtype == object else np.int64))
+
+def paper_sqft(sides: np.ndarray) -> int:
+  l, w, h = columns(sides)
+  longest = np.maximum(np.maximum(l, w), h)
+  # the smallest face, the two shortest sides' product, is all three faces less longest * the other two
+  return 3 * total(l * w + (l + w) * h) - total(longest * (l + w + h - longest))
+
+def ribbon_ft(sides: np.ndarray) -> int:
+  l, w, h = columns(sides)
+  return 2 * total(l + w + h - np.maximum(np.maximum(l, w), h)) + total(l * w * h)
+
+def paper_sqft_and_ribbon_ft(sides: np.ndarray) -> tuple[int, int]:
+  l, w, h = columns(sides)
+  longest = np.maximum(np.maximum(l, w), h)
+  shorter = l + w + h - longest # the two shortest sides together
+  # the smallest face, the two shortest sides' product, is all three faces less longest * shorter
+  faces = l * w + (l + w) * h
+  return 3 * total(faces) - total(longest * shorter), 2 * total(shorter) + total(l * w * h)
+
+def read_sides(stream: typing.TextIO) -> np.ndarray:
+  return parse_sides(reader.read_bytes(stream))
+
+def streamed_sides(stream: typing.TextIO) -> typing.Iterator[np.ndarray]:
+  """The sides a block at a time, holding no more than a chunk of the stream and the block being parsed"""
+  return parsed_blocks(line_blocks(reader.chunks(stream, CHUNK_SIZE)))
+
+def streamed_total(stream: typing.TextIO, measure: typing.Callable[[np.ndarray], int]) -> int:
+  """The sum of what measure() makes of each block's sides, totalled as the blocks are read"""
+  return sum(measure(sides) for sides in streamed_sides(stream))
+
+class Tests(unittest.TestCase):
+  def test_totals(self):
+    for text, sqft, ft in [('2x3x4\n', 58, 34), ('1x1x10', 43, 14), ('2x3x4\n1x1x10\n', 101, 48), ('', 0, 0)]:
+      sides = read_sides(io.StringIO(text))
+      self.assertEqual((paper_sqft(sides), ribbon_ft(sides)), (sqft, ft))
+      self.assertEqual(paper_sqft_and_ribbon_ft(sides), (sqft, ft))
+    
+  def test_parse_sides(self):
+    self.assertEqual(parse_sides(b' 12x3 x4\r\n5x6x789\n').tolist(), [[12, 3, 4], [5, 6, 789]])
+    malformed = [b'2x3\n', b'2x3x4x5\n', b'2x3x4\n\n', b'2xx4\n', b'x3x4\n', b'2x3x-4\n', '2x3x٤\n'.encode()]
+    for data in [*malformed, b'1 2x3x4\n', b'2x3\t4x5\n']:
+      self.assertRaises(RuntimeError, lambda: parse_sides(data))
+      
+    # past what int64 totals can hold, the sums carry on in Python ints
+    side = 10 ** 6
+    self.assertEqual(
+      paper_sqft_and_ribbon_ft(parse_sides(f'{side}x{side}x{side}\n'.encode() * 10)),
+      (70 * side ** 2, 10 * (4 * side + side ** 3)),
+    )
+    self.assertEqual(parse_sides(b'1' * MAX_DIGITS + b'x1x1').tolist(), [[int('1' * MAX_DIGITS), 1, 1]])
+    self.assertRaises(RuntimeError, lambda: parse_sides(b'1' * (MAX_DIGITS + 1) + b'x1x1'))
+    
+    # lines are numbered across blocks
+    lines = b'1x2x3\n' * (BLOCK_SIZE // 3)
+    self.assertEqual(parse_sides(lines).shape, (BLOCK_SIZE // 3, 3))
+    with self.assertRaisesRegex(RuntimeError, f'line {BLOCK_SIZE // 3 + 2}$'):
+      parse_sides(lines + b'1x2x3\n1x2\n')
+    with self.assertRaisesRegex(RuntimeError, 'line 3$'):
+      parse_sides(b'1x2x3\n 4 x5x6 \n7x8x9 9\n')
+      
+  def test_streamed_sides(self):
+    text = ''.join(f'{n % 97 + 1}x{n % 13 + 1}x{n % 1009 + 1}\n' for n in range(CHUNK_SIZE // 8))
+    expected = ribbon_ft(parse_sides(text.encode()))
+    self.assertEqual(streamed_total(io.StringIO(text), ribbon_ft), expected)
+    with self.assertRaisesRegex(RuntimeError, f'line {CHUNK_SIZE // 8 + 1}$'):
+      streamed_total(io.StringIO(text + '1x2\n'), ribbon_ft)
+      
+    # a file several chunks long is totalled in about a chunk's worth of memory
+    with tempfile.TemporaryDirectory() as tmp:
+      path = os.path.join(tmp, 'input.txt')
+      with open(path, 'w') as f:
+        f.write(text * 4)
+      with open(path) as f:
+        tracemalloc.start()
+        try:
+          self.assertEqual(streamed_total(f, ribbon_ft), 4 * expected)
+          _, peak = tracemalloc.get_traced_memory()
+        finally:
+          tracemalloc.stop()
+    self.assertLess(peak, 4 * CHUNK_SIZE)
+
+if __name__ == '__main__':
+  unittest.main()
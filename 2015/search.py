@@ -0,0 +1,119 @@
+"""Searches over hashable states shared by the 2015 solutions, which pass their STATS hook in as stats"""
+import itertools
+import unittest
+import typing
+import heapq
+
+State = typing.TypeVar('State', bound=typing.Hashable)
+Stats: typing.TypeAlias = typing.Optional[dict[str, int]] # expanded, pruned, max_depth, max_heap and bound_updates
+
+def least_cost(
+  start: State,
+  successors: typing.Callable[[State], typing.Iterable[tuple[int, State]]],
+  is_goal: typing.Callable[[State], bool],
+  heuristic: typing.Optional[typing.Callable[[State], int]] = None,
+  *,
+  stats: Stats = None,
+) -> typing.Optional[int]:
+  """Dijkstra, or A* given an admissible heuristic: the least total cost of the (step cost, state) edges from start
+  to a goal state, None when no goal can be reached. The transposition table keeps the cheapest cost each state has
+  been reached at, so a state is only queued again when it is reached more cheaply. Of the states with the same
+  estimate the deepest is expanded first, so a search whose estimates are exact heads straight for a goal. stats,
+  when given, counts the work done."""
+  best: dict[State, int] = {start: 0}
+  counter = itertools.count() # breaks the remaining ties so states are never compared
+  heap: list[tuple[int, int, int, int, State]] = [(heuristic(start) if heuristic else 0, 0, next(counter), 0, start)]
+  while heap:
+    _, negative_depth, _, cost, state = heapq.heappop(heap)
+    depth = -negative_depth
+    if cost > best[state]:
+      if stats is not None:
+        stats['pruned'] += 1
+      continue
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], depth)
+    if is_goal(state):
+      if stats is not None:
+        stats['bound_updates'] += 1
+      return cost
+    
+    for step, successor in successors(state):
+      new_cost = cost + step
+      if successor in best and best[successor] <= new_cost:
+        if stats is not None:
+          stats['pruned'] += 1
+        continue
+      best[successor] = new_cost
+      estimate = new_cost + heuristic(successor) if heuristic else new_cost
+      heapq.heappush(heap, (estimate, -depth - 1, next(counter), new_cost, successor))
+      if stats is not None:
+        stats['max_heap'] = max(stats['max_heap'], len(heap))
+        
+  return None
+
+def most_gain(
+  start: State,
+  successors: typing.Callable[[State], typing.Iterable[tuple[int, State]]],
+  is_goal: typing.Callable[[State], bool],
+  bound: typing.Optional[typing.Callable[[State], int]] = None,
+  *,
+  stats: Stats = None,
+) -> typing.Optional[int]:
+  """Depth first branch and bound: the greatest total gain of the (step gain, state) edges from start to a goal state,
+  None when no goal can be reached. bound(state) is an upper bound on the gain still to come from the state, and
+  branches that cannot beat the best total so far are cut. The transposition table cuts any state already reached
+  with at least the same gain, since what is left to gain from a state does not depend on how it was reached."""
+  best: typing.Optional[int] = None
+  reached: dict[State, int] = {start: 0}
+  
+  def visit(state: State, gain: int, depth: int) -> None:
+    nonlocal best
+    if stats is not None:
+      stats['expanded'] += 1
+      stats['max_depth'] = max(stats['max_depth'], depth)
+    if is_goal(state):
+      if best is None or gain > best:
+        best = gain
+        if stats is not None:
+          stats['bound_updates'] += 1
+      return
+    
+    for step, successor in successors(state):
+      new_gain = gain + step
+      if (
+        (successor in reached and reached[successor] >= new_gain) or
+        (best is not None and bound is not None and new_gain + bound(successor) <= best)
+      ):
+        if stats is not None:
+          stats['pruned'] += 1
+        continue
+      reached[successor] = new_gain
+      visit(successor, new_gain, depth + 1)
+      
+  visit(start, 0, 0)
+  return best
+
+class Tests(unittest.TestCase):
+  # a -> b -> d costs 1 + 5, a -> c -> d costs 4 + 1
+  EDGES = {'a': [(1, 'b'), (4, 'c')], 'b': [(5, 'd')], 'c': [(1, 'd')], 'd': []}
+  
+  def test_least_cost(self):
+    self.assertEqual(least_cost('a', self.EDGES.__getitem__, lambda state: state == 'd'), 5)
+    self.assertEqual(least_cost('a', self.EDGES.__getitem__, lambda state: state == 'd', lambda state: 0), 5)
+    self.assertIsNone(least_cost('d', self.EDGES.__getitem__, lambda state: state == 'a'))
+    
+  def test_most_gain(self):
+    self.assertEqual(most_gain('a', self.EDGES.__getitem__, lambda state: state == 'd'), 6)
+    self.assertEqual(most_gain('a', self.EDGES.__getitem__, lambda state: state == 'd', lambda state: 5), 6)
+    self.assertIsNone(most_gain('d', self.EDGES.__getitem__, lambda state: state == 'a'))
+    
+  def test_stats(self):
+    stats = {name: 0 for name in ['expanded', 'pruned', 'max_depth', 'max_heap', 'bound_updates']}
+    least_cost('a', self.EDGES.__getitem__, lambda state: state == 'd', stats=stats)
+    self.assertEqual(stats['bound_updates'], 1)
+    self.assertEqual(stats['max_depth'], 2)
+    self.assertGreater(stats['expanded'], 0)
+
+if __name__ == '__main__':
+  unittest.main()
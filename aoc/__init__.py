@@ -0,0 +1,8 @@
+"""Tooling for running the Advent of Code solutions in a single process.
+
+Importing this package makes the solutions importable as aoc.y2015.day18.part2 and so on.
+"""
+
+from aoc import solutions
+
+solutions.install()
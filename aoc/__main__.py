@@ -0,0 +1,371 @@
+import contextlib
+import argparse
+import pathlib
+import typing
+import time
+import sys
+import os
+
+from aoc import solutions, scheduler, generators, complexity, differential, profiling, counters, testing, inputs, batch, runner, memory, bench, cache, days
+
+def main(argv: list[str]) -> int:
+  arg_parser = argparse.ArgumentParser(prog='aoc')
+  subparsers = arg_parser.add_subparsers(dest='command', required=True)
+  
+  run_parser = subparsers.add_parser('run', help='run solutions in a single process')
+  run_parser.add_argument('year', type=int)
+  run_parser.add_argument('--days', type=runner.parse_numbers, default=runner.parse_numbers('1-25'))
+  run_parser.add_argument('--parts', type=runner.parse_numbers, default=runner.parse_numbers('1,2'))
+  run_parser.add_argument('--inputs', type=pathlib.Path, default=runner.DEFAULT_INPUTS_DIR,
+                          help='directory laid out as <year>/<day>/input.txt')
+  run_parser.add_argument('-j', '--jobs', type=int, default=1, help='worker processes (0 for one per cpu)')
+  run_parser.add_argument('--timeout', type=float, help='seconds allowed per day/part when running in parallel')
+  run_parser.add_argument('--by-day', action='store_true', help='parse each day once and answer both parts from it')
+  run_parser.add_argument('--no-cache', action='store_true', help='neither read nor write cached answers')
+  run_parser.add_argument('--refresh', action='store_true', help='recompute everything and overwrite the cache')
+  run_parser.add_argument('--cache-max-mb', type=float, default=cache.DEFAULT_MAX_BYTES / 2**20)
+  run_parser.add_argument('--profile', action='store_true',
+                          help='run each selected day/part under cProfile, bypassing the cache')
+  run_parser.add_argument('--profile-dir', type=pathlib.Path, default=profiling.DEFAULT_PROFILE_DIR)
+  run_parser.add_argument('--top', type=int, help='functions or allocation sites to list when profiling')
+  run_parser.add_argument('--memory', action='store_true',
+                          help='run each selected day/part under tracemalloc in its own process, bypassing the cache')
+  run_parser.add_argument('--counters', action='store_true',
+                          help='print the search counters of the solvers that keep them, bypassing the cache')
+  
+  bench_parser = subparsers.add_parser('bench', help='benchmark solutions against a saved baseline')
+  bench_parser.add_argument('year', type=int)
+  bench_parser.add_argument('--days', type=runner.parse_numbers, default=runner.parse_numbers('1-25'))
+  bench_parser.add_argument('--parts', type=runner.parse_numbers, default=runner.parse_numbers('1,2'))
+  bench_parser.add_argument('--inputs', type=pathlib.Path, default=runner.DEFAULT_INPUTS_DIR)
+  bench_parser.add_argument('--warmup', type=int, default=1)
+  bench_parser.add_argument('--repeat', type=int, default=5)
+  bench_parser.add_argument('--threshold', type=float, default=bench.DEFAULT_THRESHOLD,
+                            help='fractional slowdown of the median that counts as a regression')
+  bench_parser.add_argument('--baseline', type=pathlib.Path, default=bench.BASELINE_PATH)
+  bench_parser.add_argument('--update-baseline', action='store_true')
+  bench_parser.add_argument('--complexity', action='store_true',
+                            help='time generated inputs of growing size and fit a growth model instead')
+  bench_parser.add_argument('--parse', action='store_true',
+                            help="time each solution's parse() hook and report its throughput instead")
+  bench_parser.add_argument('--engines', action='store_true',
+                            help="time solve() and each of the solution's ENGINES, with their peak memory, instead")
+  bench_parser.add_argument('--records', action='store_true',
+                            help="compare the memory and field reads of parse()'s records with dicts instead")
+  bench_parser.add_argument('--sizes', type=runner.parse_numbers, help='generated input sizes, default per day')
+  bench_parser.add_argument('--max-seconds', type=float, default=complexity.DEFAULT_MAX_SECONDS,
+                            help='stop growing the input once a run takes this long')
+  
+  generate_parser = subparsers.add_parser('generate', help='write seeded synthetic inputs at a given scale')
+  generate_parser.add_argument('year', type=int)
+  generate_parser.add_argument('--days', type=runner.parse_numbers, default=runner.parse_numbers('1-25'))
+  generate_parser.add_argument('--size', type=int, required=True, help='scale, see each generator for what it counts')
+  generate_parser.add_argument('--seed', type=int, default=0)
+  generate_output = generate_parser.add_mutually_exclusive_group(required=True)
+  generate_output.add_argument('--inputs', type=pathlib.Path, help='directory to write <year>/<day>/input.txt into')
+  generate_output.add_argument('--stdout', action='store_true', help="stream a single day's input to stdout")
+  
+  solve_parser = subparsers.add_parser('solve', help='solve one day/part from files, stdin or its usual input')
+  solve_parser.add_argument('year', type=int)
+  solve_parser.add_argument('day', type=int)
+  solve_parser.add_argument('part', type=int)
+  solve_parser.add_argument('sources', nargs='*',
+                            help='input files in the order the solution reads them, - for stdin')
+  solve_parser.add_argument('--inputs', type=pathlib.Path, default=runner.DEFAULT_INPUTS_DIR,
+                            help='where to find the input when no sources are given')
+  
+  test_parser = subparsers.add_parser('test', help="run every solution's Tests class across a process pool")
+  test_parser.add_argument('year', type=int)
+  test_parser.add_argument('--days', type=runner.parse_numbers, default=runner.parse_numbers('1-25'))
+  test_parser.add_argument('--parts', type=runner.parse_numbers, default=runner.parse_numbers('1,2'))
+  test_parser.add_argument('-j', '--jobs', type=int, default=0, help='worker processes (0 for one per cpu)')
+  test_parser.add_argument('--harness', action='store_true', help="also run the aoc package's own tests")
+  test_parser.add_argument('--junit', type=pathlib.Path, help='write a junit xml report here')
+  test_parser.add_argument('-v', '--verbose', action='store_true', help='print every test as it finishes')
+  
+  diff_parser = subparsers.add_parser('diff', help='check optimized engines against the reference on generated inputs')
+  diff_parser.add_argument('year', type=int)
+  diff_parser.add_argument('--days', type=runner.parse_numbers, default=runner.parse_numbers('1-25'))
+  diff_parser.add_argument('--parts', type=runner.parse_numbers, default=runner.parse_numbers('1,2'))
+  diff_parser.add_argument('--cases', type=int, default=differential.DEFAULT_CASES, help='generated inputs per day/part')
+  diff_parser.add_argument('--seed', type=int, default=0)
+  diff_parser.add_argument('--corpus', type=pathlib.Path, default=differential.CORPUS_DIR,
+                           help='where shrunk failing inputs are kept and replayed from')
+  
+  batch_parser = subparsers.add_parser('batch', help='solve a directory of inputs per day, printing json lines')
+  batch_parser.add_argument('year', type=int)
+  batch_parser.add_argument('--days', type=runner.parse_numbers, default=runner.parse_numbers('1-25'))
+  batch_parser.add_argument('--parts', type=runner.parse_numbers, default=runner.parse_numbers('1,2'))
+  batch_parser.add_argument('--inputs', type=pathlib.Path, required=True,
+                            help='directory laid out as <year>/<day>/<entry>, one entry per input')
+  batch_parser.add_argument('-j', '--jobs', type=int, default=1, help='worker processes (0 for one per cpu)')
+  batch_parser.add_argument('--output', type=pathlib.Path, help='write the json lines here instead of stdout')
+  
+  args = arg_parser.parse_args(argv)
+  
+  match args.command:
+    case 'run': return run(args)
+    case 'bench': return run_bench(args)
+    case 'generate': return run_generate(args)
+    case 'solve': return run_solve(args)
+    case 'test': return run_tests(args)
+    case 'diff': return run_diff(args)
+    case 'batch': return run_batch(args)
+    case _: raise RuntimeError(f'Unexpected command: {args.command}')
+
+def make_cache(args: argparse.Namespace) -> typing.Optional[cache.Cache]:
+  if args.no_cache:
+    return None
+  return cache.Cache(max_bytes=int(args.cache_max_mb * 2**20), refresh=args.refresh)
+
+def run(args: argparse.Namespace) -> int:
+  if args.profile:
+    return run_profile(args)
+  if args.memory:
+    return run_memory(args)
+  if args.counters:
+    return run_counters(args)
+  if args.by_day:
+    return run_by_day(args)
+  
+  jobs = runner.make_jobs(args.year, args.days, args.parts)
+  history = scheduler.load_history()
+  if args.jobs == 1:
+    results = runner.run(jobs, inputs_dir=args.inputs, cache=make_cache(args))
+  else:
+    results = scheduler.run_parallel(
+      jobs,
+      inputs_dir=args.inputs,
+      workers=args.jobs or None,
+      timeout=args.timeout,
+      history=history,
+      cache=make_cache(args),
+    )
+  
+  failed = False
+  total_seconds = 0.0
+  for result in results:
+    print(runner.format_result(result), flush=True)
+    scheduler.record(history, result)
+    failed |= result['error'] is not None
+    total_seconds += result['seconds']
+  print(f'total: {total_seconds * 1000:.2f} ms')
+  scheduler.save_history(history)
+  
+  return 1 if failed else 0
+
+def run_profile(args: argparse.Namespace) -> int:
+  failed = False
+  top = profiling.DEFAULT_TOP if args.top is None else args.top
+  for job in runner.make_jobs(args.year, args.days, args.parts):
+    try:
+      result = profiling.profile_job(job, inputs_dir=args.inputs, out_dir=args.profile_dir, top=top)
+    except Exception as e:
+      print(f'{job}  ERROR {type(e).__name__}: {e}', flush=True)
+      failed = True
+      continue
+    print(runner.format_result(result), flush=True)
+    failed |= result['error'] is not None
+  return 1 if failed else 0
+
+def run_memory(args: argparse.Namespace) -> int:
+  failed = False
+  top = memory.DEFAULT_TOP if args.top is None else args.top
+  for job in runner.make_jobs(args.year, args.days, args.parts):
+    try:
+      report = memory.memory_job_isolated(job, inputs_dir=args.inputs, top=top)
+    except Exception as e:
+      print(f'{job}  ERROR {type(e).__name__}: {e}', flush=True)
+      failed = True
+      continue
+    print(memory.format_report(report), flush=True)
+  return 1 if failed else 0
+
+def run_counters(args: argparse.Namespace) -> int:
+  failed = False
+  for job in runner.make_jobs(args.year, args.days, args.parts):
+    try:
+      report = counters.count_job(job, inputs_dir=args.inputs)
+    except Exception as e:
+      print(f'{job}  ERROR {type(e).__name__}: {e}', flush=True)
+      failed = True
+      continue
+    print(counters.format_report(report), flush=True)
+  return 1 if failed else 0
+
+def run_by_day(args: argparse.Namespace) -> int:
+  failed = False
+  day_cache = make_cache(args)
+  for day in args.days:
+    result = days.run_day(args.year, day, inputs_dir=args.inputs, cache=day_cache)
+    print(days.format_day_result(result), flush=True)
+    failed |= result['error'] is not None
+  return 1 if failed else 0
+
+def run_bench(args: argparse.Namespace) -> int:
+  if args.complexity:
+    return run_complexity(args)
+  if args.parse:
+    return run_parse_bench(args)
+  if args.engines:
+    return run_engine_bench(args)
+  if args.records:
+    return run_record_bench(args)
+  
+  baseline = bench.load_baseline(args.baseline)
+  current: bench.Baseline = {}
+  
+  regressed = False
+  for job in runner.make_jobs(args.year, args.days, args.parts):
+    try:
+      stats = bench.bench_job(job, inputs_dir=args.inputs, warmup=args.warmup, repeat=args.repeat)
+    except FileNotFoundError as e:
+      print(f'{job}  SKIPPED {e}', flush=True)
+      continue
+    current[str(job)] = stats
+    
+    deltas = bench.compare(baseline, {str(job): stats}, args.threshold) if baseline else []
+    delta = deltas[0] if deltas else None
+    regressed |= bool(delta and (delta['regressed'] or delta['memory_regressed']))
+    print(bench.format_stats(job, stats, delta), flush=True)
+  
+  if baseline is None or args.update_baseline:
+    bench.save_baseline({**(baseline or {}), **current}, args.baseline)
+    print(f'baseline written to {args.baseline}')
+  
+  return 1 if regressed else 0
+
+def run_parse_bench(args: argparse.Namespace) -> int:
+  for job in runner.make_jobs(args.year, args.days, args.parts):
+    try:
+      stats = bench.bench_parse(job, inputs_dir=args.inputs, warmup=args.warmup, repeat=args.repeat)
+    except FileNotFoundError as e:
+      print(f'{job}  SKIPPED {e}', flush=True)
+      continue
+    if stats is not None:
+      print(bench.format_parse_stats(job, stats), flush=True)
+  return 0
+
+def run_engine_bench(args: argparse.Namespace) -> int:
+  for job in runner.make_jobs(args.year, args.days, args.parts):
+    try:
+      found = bench.bench_engines(job, inputs_dir=args.inputs, warmup=args.warmup, repeat=args.repeat)
+    except FileNotFoundError as e:
+      print(f'{job}  SKIPPED {e}', flush=True)
+      continue
+    for stats in found:
+      print(bench.format_engine_stats(job, stats), flush=True)
+  return 0
+
+def run_record_bench(args: argparse.Namespace) -> int:
+  for day in args.days:
+    found = bench.bench_records(args.year, day, args.sizes or bench.DEFAULT_RECORD_SIZES, repeat=args.repeat)
+    for stats in found or []:
+      print(bench.format_record_stats(args.year, day, stats), flush=True)
+  return 0
+
+def run_complexity(args: argparse.Namespace) -> int:
+  failed = False
+  for job in runner.make_jobs(args.year, args.days, args.parts):
+    if job.day not in generators.available(job.year):
+      continue
+    if not args.sizes and (job.year, job.day) not in complexity.DEFAULT_SIZES:
+      continue
+    try:
+      scalings = complexity.measure_scaling(job, sizes=args.sizes, repeat=args.repeat, max_seconds=args.max_seconds)
+    except Exception as e:
+      print(f'{job}  ERROR {type(e).__name__}: {e}', flush=True)
+      failed = True
+      continue
+    for scaling in scalings:
+      print(complexity.format_scaling(scaling), flush=True)
+  return 1 if failed else 0
+
+def run_generate(args: argparse.Namespace) -> int:
+  if args.stdout:
+    if len(args.days) != 1:
+      raise SystemExit('--stdout takes a single day')
+    try:
+      generators.write_stream(args.year, args.days[0], args.size, sys.stdout, seed=args.seed)
+    except BrokenPipeError:
+      # the reader stopped early, e.g. part 2 of day 1 once it reaches the basement
+      os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+  
+  for day in args.days:
+    if day not in generators.available(args.year):
+      continue
+    for path in generators.write_inputs(args.year, day, args.size, inputs_dir=args.inputs, seed=args.seed):
+      print(f'{path}  {path.stat().st_size / 2**20:.2f} MiB', flush=True)
+  return 0
+
+def run_solve(args: argparse.Namespace) -> int:
+  job = runner.Job(args.year, args.day, args.part)
+  try:
+    print(inputs.solve(job, *args.sources, inputs_dir=args.inputs))
+  except Exception as e:
+    print(f'{job}  ERROR {type(e).__name__}: {e}', flush=True)
+    return 1
+  return 0
+
+def run_tests(args: argparse.Namespace) -> int:
+  start = time.perf_counter()
+  units: list[testing.Unit] = [
+    runner.Job(args.year, day, part)
+    for day, part in solutions.available(args.year)
+    if day in args.days and part in args.parts
+  ]
+  units += solutions.shared_modules(args.year)
+  if args.harness:
+    units += testing.harness_units()
+  
+  history = scheduler.load_history(testing.TEST_HISTORY_PATH)
+  results: list[testing.CaseResult] = []
+  for result in testing.run_parallel(testing.discover(units), workers=args.jobs or None, history=history):
+    results.append(result)
+    history[str(result['case'])] = result['seconds']
+    if args.verbose or result['status'] in ('failure', 'error'):
+      print(testing.format_result(result), flush=True)
+  scheduler.save_history(history, testing.TEST_HISTORY_PATH)
+  
+  seconds = time.perf_counter() - start
+  print(testing.format_summary(results, seconds=seconds))
+  if args.junit:
+    testing.junit_xml(results, seconds=seconds).write(args.junit, encoding='utf-8', xml_declaration=True)
+  
+  return 0 if all(r['status'] in ('passed', 'skipped') for r in results) else 1
+
+def run_diff(args: argparse.Namespace) -> int:
+  failed = False
+  for job in runner.make_jobs(args.year, args.days, args.parts):
+    candidates = differential.engines(job)
+    mismatches = differential.check(
+      job,
+      cases=args.cases,
+      seed=args.seed,
+      corpus_dir=args.corpus,
+      candidates=candidates,
+    )
+    for mismatch in mismatches:
+      print(differential.format_mismatch(mismatch, args.corpus), flush=True)
+    engines = ', '.join(name for name in candidates if name != differential.reference_name(candidates))
+    print(f'{job}  {"FAILED" if mismatches else "ok"}  ({engines} vs {differential.reference_name(candidates)})', flush=True)
+    failed |= bool(mismatches)
+  return 1 if failed else 0
+
+def run_batch(args: argparse.Namespace) -> int:
+  jobs = runner.make_jobs(args.year, args.days, args.parts)
+  if args.jobs == 1:
+    results = batch.run(jobs, args.inputs)
+  else:
+    results = batch.run_parallel(jobs, args.inputs, workers=args.jobs or None)
+    
+  failed = False
+  with open(args.output, 'w') if args.output else contextlib.nullcontext(sys.stdout) as out:
+    for result in results:
+      print(batch.json_line(result), file=out, flush=True)
+      failed |= result['error'] is not None
+  return 1 if failed else 0
+
+if __name__ == '__main__':
+  sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,157 @@
+"""Solves every input in a corpus directory, sharing input-independent precomputation between them.
+
+The corpus is laid out as <dir>/<year>/<day>/<entry>, where an entry is either a single input file or a directory
+holding the files the solution reads (boss.txt and shop.txt for 2015 day 21). Days whose puzzle input is a literal
+in solve() take a file with that text instead.
+
+Solutions opt into sharing with two hooks: prepare() builds whatever does not depend on the input, and
+solve_prepared(prepared, *streams) answers one input with it. Each worker process prepares a solution at most
+once and reuses the result for every entry it is handed.
+"""
+import concurrent.futures
+import contextlib
+import unittest
+import tempfile
+import pathlib
+import typing
+import types
+import json
+import time
+
+from aoc.runner import Job
+from aoc import solutions
+
+DEFAULT_BATCH_INPUT = 'input.txt' # what a directory entry holds for days without an INPUTS list
+
+class BatchResult(typing.TypedDict):
+  year: int
+  day: int
+  part: int
+  input: str # entry name within the day directory
+  answer: typing.Any
+  prepare_seconds: float # zero when the worker had already prepared this solution
+  seconds: float
+  error: typing.Optional[str]
+
+# per worker process, so it is shared by every entry the worker solves
+_prepared: dict[Job, typing.Any] = {}
+
+def entries(year: int, day: int, batch_dir: pathlib.Path) -> list[pathlib.Path]:
+  directory = batch_dir / str(year) / f'{day:02}'
+  if not directory.is_dir():
+    return []
+  return sorted(path for path in directory.iterdir() if not path.name.startswith('.'))
+
+def entry_paths(module: types.ModuleType, entry: pathlib.Path) -> list[pathlib.Path]:
+  if entry.is_file():
+    return [entry]
+  return [entry / name for name in solutions.input_names(module) or [DEFAULT_BATCH_INPUT]]
+
+def prepared_for(job: Job, module: types.ModuleType) -> tuple[typing.Any, float]:
+  """Returns the module's prepare() result, building it on first use in this process, and the seconds it took."""
+  if job in _prepared:
+    return _prepared[job], 0.0
+  start = time.perf_counter()
+  _prepared[job] = module.prepare()
+  return _prepared[job], time.perf_counter() - start
+
+def solve_entry(job: Job, entry: pathlib.Path) -> BatchResult:
+  prepare_seconds = 0.0
+  try:
+    module = solutions.load(*job)
+    with contextlib.ExitStack() as stack:
+      streams = [stack.enter_context(open(path)) for path in entry_paths(module, entry)]
+      if hasattr(module, 'prepare'):
+        prepared, prepare_seconds = prepared_for(job, module)
+        start = time.perf_counter()
+        answer = module.solve_prepared(prepared, *streams)
+      else:
+        start = time.perf_counter()
+        answer = module.solve(*streams)
+      seconds = time.perf_counter() - start
+  except Exception as e:
+    return BatchResult(
+      year=job.year, day=job.day, part=job.part, input=entry.name, answer=None, prepare_seconds=prepare_seconds,
+      seconds=0.0, error=f'{type(e).__name__}: {e}',
+    )
+    
+  return BatchResult(
+    year=job.year,
+    day=job.day,
+    part=job.part,
+    input=entry.name,
+    answer=answer,
+    prepare_seconds=prepare_seconds,
+    seconds=seconds,
+    error=None,
+  )
+
+def tasks(jobs: typing.Iterable[Job], batch_dir: pathlib.Path) -> list[tuple[Job, pathlib.Path]]:
+  return [(job, entry) for job in jobs for entry in entries(job.year, job.day, batch_dir)]
+
+def run(jobs: typing.Iterable[Job], batch_dir: pathlib.Path) -> typing.Iterator[BatchResult]:
+  for job, entry in tasks(jobs, batch_dir):
+    yield solve_entry(job, entry)
+
+def run_parallel(
+  jobs: typing.Iterable[Job],
+  batch_dir: pathlib.Path,
+  *,
+  workers: typing.Optional[int] = None,
+) -> typing.Iterator[BatchResult]:
+  """Yields results as they finish. Entries are dispatched in job order, so a worker tends to stay on one solution
+  and reuse its preparation."""
+  with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+    futures = [executor.submit(solve_entry, job, entry) for job, entry in tasks(jobs, batch_dir)]
+    for future in concurrent.futures.as_completed(futures):
+      yield future.result()
+
+def json_line(result: BatchResult) -> str:
+  # answers are ints or strs for every solution so far, anything else is written as its str()
+  return json.dumps(result, default=str)
+
+class Tests(unittest.TestCase):
+  def test_entries(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      batch_dir = pathlib.Path(tmp)
+      (batch_dir / '2015' / '21' / 'alice').mkdir(parents=True)
+      (batch_dir / '2015' / '21' / 'bob').mkdir(parents=True)
+      (batch_dir / '2015' / '21' / '.DS_Store').write_text('')
+      
+      found = entries(2015, 21, batch_dir)
+      self.assertEqual([entry.name for entry in found], ['alice', 'bob'])
+      paths = entry_paths(solutions.load(2015, 21, 1), found[0])
+      self.assertEqual([path.name for path in paths], ['boss.txt', 'shop.txt'])
+      self.assertEqual(entries(2015, 1, batch_dir), [])
+      
+  def test_run(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      batch_dir = pathlib.Path(tmp)
+      (batch_dir / '2015' / '25').mkdir(parents=True)
+      for name, (row, col) in {'a.txt': (4, 2), 'b.txt': (6, 6)}.items():
+        (batch_dir / '2015' / '25' / name).write_text(f'Enter the code at row {row}, column {col}.')
+      (batch_dir / '2015' / '25' / 'c.txt').write_text('no position here')
+      (batch_dir / '2015' / '01').mkdir(parents=True)
+      (batch_dir / '2015' / '01' / 'a.txt').write_text('(()(')
+      
+      _prepared.clear()
+      results = list(run([Job(2015, 25, 1), Job(2015, 1, 1)], batch_dir))
+      self.assertEqual([r['answer'] for r in results], [32451966, 27995004, None, 2])
+      self.assertIn('RuntimeError', typing.cast(str, results[2]['error']))
+      
+      # prepared once, then reused
+      self.assertGreater(results[0]['prepare_seconds'], 0)
+      self.assertEqual(results[1]['prepare_seconds'], 0)
+      self.assertEqual(json.loads(json_line(results[3]))['input'], 'a.txt')
+      
+  def test_run_parallel(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      batch_dir = pathlib.Path(tmp)
+      (batch_dir / '2015' / '22').mkdir(parents=True)
+      (batch_dir / '2015' / '22' / 'a.txt').write_text('Hit Points: 13\nDamage: 8\n')
+      
+      [result] = run_parallel([Job(2015, 22, 2)], batch_dir, workers=1)
+      self.assertEqual(result['answer'], 212)
+
+if __name__ == '__main__':
+  unittest.main()
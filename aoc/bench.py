@@ -0,0 +1,325 @@
+import collections
+import statistics
+import contextlib
+import unittest
+import tempfile
+import operator
+import pathlib
+import typing
+import json
+import time
+import io
+
+from aoc.runner import DEFAULT_INPUTS_DIR, Job, input_paths, read_inputs
+from aoc.cache import CACHE_DIR
+from aoc import solutions, generators, memory
+
+BASELINE_PATH = CACHE_DIR / 'baseline.json'
+DEFAULT_THRESHOLD = 0.10
+NOISE_FLOOR_SECONDS = 0.001 # sub-millisecond jitter is not a regression
+NOISE_FLOOR_BYTES = 64 * 2**10
+
+class Stats(typing.TypedDict):
+  min: float
+  median: float
+  p95: float
+  peak_bytes: int
+  rss_peak_bytes: int
+
+Baseline: typing.TypeAlias = dict[str, Stats]
+
+class Delta(typing.TypedDict):
+  job: str
+  baseline: float
+  current: float
+  change: float # fractional change of the median
+  regressed: bool
+  memory_change: float # fractional change of the peak traced memory
+  memory_regressed: bool
+
+def percentile(values: list[float], pct: float) -> float:
+  ordered = sorted(values)
+  i = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+  return ordered[i]
+
+def bench_job(
+  job: Job,
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  warmup: int = 1,
+  repeat: int = 5,
+) -> Stats:
+  module = solutions.load(*job)
+  texts = read_inputs(job, inputs_dir)
+  
+  # inputs are read once up front, each call gets fresh in-memory streams
+  def call() -> None:
+    module.solve(*[io.StringIO(text) for text in texts])
+  
+  for _ in range(warmup):
+    call()
+    
+  times: list[float] = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    call()
+    times.append(time.perf_counter() - start)
+  
+  # tracemalloc slows everything down, so memory gets its own untimed run in a fresh process
+  report = memory.memory_job_isolated(job, inputs_dir=inputs_dir, top=0)
+  
+  return Stats(
+    min=min(times),
+    median=statistics.median(times),
+    p95=percentile(times, 95),
+    peak_bytes=report['peak_bytes'],
+    rss_peak_bytes=report['rss_peak_bytes'],
+  )
+
+class ParseStats(typing.TypedDict):
+  bytes: int # of all the job's inputs together
+  median: float
+  throughput: float # bytes per second at the median
+
+def bench_parse(
+  job: Job,
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  warmup: int = 1,
+  repeat: int = 5,
+) -> typing.Optional[ParseStats]:
+  """Times the solution's parse() hook on its inputs, or returns None for solutions without one."""
+  module = solutions.load(*job)
+  if not hasattr(module, 'parse'):
+    return None
+  texts = read_inputs(job, inputs_dir)
+  
+  def call() -> None:
+    module.parse(*[io.StringIO(text) for text in texts])
+    
+  for _ in range(warmup):
+    call()
+    
+  times: list[float] = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    call()
+    times.append(time.perf_counter() - start)
+    
+  size = sum(len(text.encode()) for text in texts)
+  median = statistics.median(times)
+  return ParseStats(bytes=size, median=median, throughput=size / median if median else float('inf'))
+
+class EngineStats(typing.TypedDict):
+  engine: str
+  answer: typing.Any
+  median: float
+  throughput: float # input bytes per second at the median
+  peak_bytes: int # tracemalloc peak of one more, untimed, run
+
+def bench_engines(
+  job: Job,
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  warmup: int = 1,
+  repeat: int = 5,
+) -> list[EngineStats]:
+  """Times solve() and every entry in the solution's ENGINES on the job's input files. Each call opens the files
+  afresh, so engines that read as they go are measured streaming from disk rather than from a string in memory."""
+  module = solutions.load(*job)
+  paths = input_paths(job, inputs_dir)
+  size = sum(path.stat().st_size for path in paths)
+  
+  def call(fn: typing.Callable[..., typing.Any]) -> typing.Any:
+    with contextlib.ExitStack() as stack:
+      return fn(*[stack.enter_context(open(path)) for path in paths])
+      
+  results: list[EngineStats] = []
+  for name, fn in {'solve': module.solve, **getattr(module, 'ENGINES', {})}.items():
+    for _ in range(warmup):
+      call(fn)
+    times: list[float] = []
+    for _ in range(repeat):
+      start = time.perf_counter()
+      call(fn)
+      times.append(time.perf_counter() - start)
+      
+    answer, peak_bytes, _ = memory.trace(call, fn, top=0)
+    median = statistics.median(times)
+    results.append(EngineStats(
+      engine=name,
+      answer=answer,
+      median=median,
+      throughput=size / median if median else float('inf'),
+      peak_bytes=peak_bytes,
+    ))
+  return results
+
+class RecordStats(typing.TypedDict):
+  record: str # the NamedTuple parse() returns a list of
+  records: int
+  tuple_bytes: float # traced bytes per record, list slot included
+  dict_bytes: float # the same records as dicts
+  tuple_ns: float # reading one field of one record
+  dict_ns: float
+
+DEFAULT_RECORD_SIZES = (10**5, 10**6)
+
+def bench_records(
+  year: int,
+  day: int,
+  sizes: typing.Iterable[int] = DEFAULT_RECORD_SIZES,
+  *,
+  repeat: int = 5,
+) -> typing.Optional[list[RecordStats]]:
+  """Compares the records parse() returns with the same records as dicts on generated inputs of each size, by traced
+  memory per record and the time to read a field. Returns None for days whose parse() does not return a list of
+  NamedTuples."""
+  module = solutions.load(year, day, 1)
+  if not hasattr(module, 'parse') or (year, day) not in generators.GENERATORS:
+    return None
+  
+  results: list[RecordStats] = []
+  for size in sizes:
+    records = module.parse(*[io.StringIO(text) for text in generators.generate(year, day, size)])
+    if not isinstance(records, list) or not records or not hasattr(records[0], '_fields'):
+      return None
+    
+    # copies are traced rather than the parse, so both sides hold the same field values
+    tuples, tuple_bytes, _ = memory.trace(lambda: [type(record)(*record) for record in records], top=0)
+    dicts, dict_bytes, _ = memory.trace(lambda: [record._asdict() for record in records], top=0)
+    
+    field = records[0]._fields[-1]
+    def lookup(get: typing.Callable[[typing.Any], typing.Any], rows: list[typing.Any]) -> float:
+      times: list[float] = []
+      for _ in range(repeat):
+        start = time.perf_counter()
+        collections.deque(map(get, rows), maxlen=0)
+        times.append(time.perf_counter() - start)
+      return min(times) / len(rows) * 1e9
+      
+    results.append(RecordStats(
+      record=type(records[0]).__name__,
+      records=len(records),
+      tuple_bytes=tuple_bytes / len(records),
+      dict_bytes=dict_bytes / len(records),
+      tuple_ns=lookup(operator.attrgetter(field), tuples),
+      dict_ns=lookup(operator.itemgetter(field), dicts),
+    ))
+  return results
+
+def compare(baseline: Baseline, current: Baseline, threshold: float = DEFAULT_THRESHOLD) -> list[Delta]:
+  """Compares medians and peak traced memory. The RSS high-water mark is recorded but not compared, it is dominated
+  by the interpreter itself for most days."""
+  deltas: list[Delta] = []
+  for job, stats in current.items():
+    if job not in baseline:
+      continue
+    before, after = baseline[job]['median'], stats['median']
+    bytes_before, bytes_after = baseline[job]['peak_bytes'], stats['peak_bytes']
+    deltas.append(Delta(
+      job=job,
+      baseline=before,
+      current=after,
+      change=(after - before) / before if before else 0.0,
+      regressed=after > before * (1 + threshold) and after - before > NOISE_FLOOR_SECONDS,
+      memory_change=(bytes_after - bytes_before) / bytes_before if bytes_before else 0.0,
+      memory_regressed=bytes_after > bytes_before * (1 + threshold) and bytes_after - bytes_before > NOISE_FLOOR_BYTES,
+    ))
+  return deltas
+
+def load_baseline(path: pathlib.Path = BASELINE_PATH) -> typing.Optional[Baseline]:
+  try:
+    with open(path) as f:
+      return json.load(f)
+  except FileNotFoundError:
+    return None
+
+def save_baseline(baseline: Baseline, path: pathlib.Path = BASELINE_PATH) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with open(path, 'w') as f:
+    json.dump(baseline, f, indent=2, sort_keys=True)
+
+def format_stats(job: Job, stats: Stats, delta: typing.Optional[Delta] = None) -> str:
+  line = (
+    f'{job}  min {stats["min"] * 1000:.3f} ms  median {stats["median"] * 1000:.3f} ms  '
+    f'p95 {stats["p95"] * 1000:.3f} ms  peak {stats["peak_bytes"] / 2**20:.2f} MiB  '
+    f'rss {stats["rss_peak_bytes"] / 2**20:.2f} MiB'
+  )
+  if delta:
+    line += f'  (time {delta["change"]:+.1%}{" REGRESSION" if delta["regressed"] else ""}'
+    line += f', memory {delta["memory_change"]:+.1%}{" REGRESSION" if delta["memory_regressed"] else ""})'
+  return line
+
+def format_parse_stats(job: Job, stats: ParseStats) -> str:
+  return (
+    f'{job}  parse {stats["bytes"] / 2**20:.2f} MiB  median {stats["median"] * 1000:.3f} ms  '
+    f'{stats["throughput"] / 2**20:.1f} MiB/s'
+  )
+
+def format_record_stats(year: int, day: int, stats: RecordStats) -> str:
+  return (
+    f'{year} day {day:02} {stats["record"]} x {stats["records"]}  tuple {stats["tuple_bytes"]:.0f} B '
+    f'{stats["tuple_ns"]:.1f} ns  dict {stats["dict_bytes"]:.0f} B {stats["dict_ns"]:.1f} ns'
+  )
+
+def format_engine_stats(job: Job, stats: EngineStats) -> str:
+  return (
+    f'{job} {stats["engine"]}  median {stats["median"] * 1000:.3f} ms  {stats["throughput"] / 2**20:.1f} MiB/s  '
+    f'peak {stats["peak_bytes"] / 2**20:.2f} MiB  answer {stats["answer"]}'
+  )
+
+class Tests(unittest.TestCase):
+  def test_percentile(self):
+    self.assertEqual(percentile([1.0], 95), 1.0)
+    self.assertEqual(percentile([3.0, 1.0, 2.0], 50), 2.0)
+    self.assertEqual(percentile([float(i) for i in range(1, 101)], 95), 95.0)
+    
+  def test_compare(self):
+    def stats(median: float, peak_bytes: int = 2**20) -> Stats:
+      return Stats(min=median, median=median, p95=median, peak_bytes=peak_bytes, rss_peak_bytes=0)
+    
+    deltas = compare(
+      {'a': stats(1.0), 'b': stats(1.0), 'c': stats(0.0001), 'd': stats(1.0), 'e': stats(1.0, 1000)},
+      {'a': stats(1.05), 'b': stats(1.5), 'c': stats(0.0002), 'd': stats(1.0, 2**21), 'e': stats(1.0, 2000),
+       'new': stats(1.0)},
+      threshold=0.1,
+    )
+    self.assertEqual(
+      [(d['job'], d['regressed'], d['memory_regressed']) for d in deltas],
+      [('a', False, False), ('b', True, False), ('c', False, False), ('d', False, True), ('e', False, False)],
+    )
+    self.assertAlmostEqual(deltas[1]['change'], 0.5)
+    self.assertAlmostEqual(deltas[3]['memory_change'], 1.0)
+    
+  def test_bench_parse(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      inputs_dir = pathlib.Path(tmp)
+      [path] = generators.write_inputs(2015, 14, 50, inputs_dir=inputs_dir)
+      
+      stats = typing.cast(ParseStats, bench_parse(Job(2015, 14, 1), inputs_dir=inputs_dir, warmup=0, repeat=2))
+      self.assertEqual(stats['bytes'], path.stat().st_size)
+      self.assertGreater(stats['throughput'], 0)
+      self.assertIn('MiB/s', format_parse_stats(Job(2015, 14, 1), stats))
+      self.assertIsNone(bench_parse(Job(2015, 1, 1), inputs_dir=inputs_dir))
+      
+  def test_bench_engines(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      inputs_dir = pathlib.Path(tmp)
+      generators.write_inputs(2015, 2, 200, inputs_dir=inputs_dir)
+      
+      found = bench_engines(Job(2015, 2, 2), inputs_dir=inputs_dir, warmup=0, repeat=1)
+      self.assertEqual([stats['engine'] for stats in found], ['solve', 'reference', 'streaming'])
+      self.assertEqual(len({stats['answer'] for stats in found}), 1)
+      self.assertTrue(all(stats['peak_bytes'] > 0 for stats in found))
+      self.assertIn('MiB/s', format_engine_stats(Job(2015, 2, 2), found[0]))
+
+  def test_bench_records(self):
+    [stats] = typing.cast(list[RecordStats], bench_records(2015, 14, [200], repeat=1))
+    self.assertEqual((stats['record'], stats['records']), ('Reindeer', 200))
+    self.assertLess(stats['tuple_bytes'], stats['dict_bytes'])
+    self.assertIn('Reindeer x 200', format_record_stats(2015, 14, stats))
+    self.assertIsNone(bench_records(2015, 21, [10]))
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,165 @@
+import tempfile
+import unittest
+import hashlib
+import pathlib
+import pickle
+import typing
+import os
+
+from aoc import solutions
+
+CACHE_DIR = pathlib.Path(os.environ.get('XDG_CACHE_HOME', '~/.cache')).expanduser() / 'aoc-py'
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+MISSING: typing.Any = object()
+
+def file_digest(paths: typing.Iterable[pathlib.Path]) -> str:
+  digest = hashlib.sha256()
+  for path in paths:
+    with open(path, 'rb') as f:
+      while chunk := f.read(1 << 20):
+        digest.update(chunk)
+    digest.update(b'\0') # keep (a, bc) and (ab, c) apart
+  return digest.hexdigest()
+
+def source_digest(year: int, solution_paths: list[pathlib.Path]) -> str:
+  # the year's shared modules are hashed with the solutions, as any of them may be imported
+  return file_digest(solution_paths + solutions.shared_module_paths(year))
+
+def entry_key(kind: str, year: int, day: int, part: int, input_digest: str) -> str:
+  # the solution's own source is part of the key, so editing it invalidates its entries
+  digest = source_digest(year, [solutions.solution_path(year, day, part)])
+  return hashlib.sha256(f'{kind}:{year}:{day}:{part}:{input_digest}:{digest}'.encode()).hexdigest()
+
+def day_key(kind: str, year: int, day: int, input_digest: str) -> str:
+  # for entries both parts are built from, so editing either part's source invalidates them
+  digest = source_digest(year, [solutions.solution_path(year, day, part) for part in (1, 2)])
+  return hashlib.sha256(f'{kind}:{year}:{day}:{input_digest}:{digest}'.encode()).hexdigest()
+
+class Cache:
+  """Pickled answers and parsed inputs on disk, evicting the least recently used entries past max_bytes."""
+  
+  def __init__(
+    self,
+    directory: pathlib.Path = CACHE_DIR / 'entries',
+    *,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    refresh: bool = False,
+  ) -> None:
+    self.directory = directory
+    self.max_bytes = max_bytes
+    self.refresh = refresh # ignore what is stored, but still write fresh entries
+    
+  def _path(self, key: str) -> pathlib.Path:
+    return self.directory / f'{key}.pickle'
+    
+  def get(self, key: str) -> typing.Any:
+    if self.refresh:
+      return MISSING
+    
+    path = self._path(key)
+    try:
+      with open(path, 'rb') as f:
+        value = pickle.load(f)
+      os.utime(path) # mark as recently used
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError):
+      return MISSING
+    return value
+  
+  def put(self, key: str, value: typing.Any) -> None:
+    self.directory.mkdir(parents=True, exist_ok=True)
+    
+    # write then rename so concurrent workers never read a partial entry
+    fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+      os.replace(tmp, self._path(key))
+    except BaseException:
+      os.unlink(tmp)
+      raise
+    
+    self.evict()
+    
+  def evict(self) -> None:
+    entries: list[tuple[float, int, pathlib.Path]] = []
+    for path in self.directory.glob('*.pickle'):
+      try:
+        stat = path.stat()
+      except FileNotFoundError:
+        continue # evicted by another process
+      entries.append((stat.st_mtime, stat.st_size, path))
+      
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+      if total <= self.max_bytes:
+        break
+      path.unlink(missing_ok=True)
+      total -= size
+      
+  def clear(self) -> None:
+    for path in self.directory.glob('*.pickle'):
+      path.unlink(missing_ok=True)
+
+class Tests(unittest.TestCase):
+  def test_get_put(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      cache = Cache(pathlib.Path(tmp))
+      self.assertIs(cache.get('a'), MISSING)
+      
+      cache.put('a', None)
+      cache.put('b', {'x': [1, 2]})
+      self.assertIsNone(cache.get('a'))
+      self.assertEqual(cache.get('b'), {'x': [1, 2]})
+      
+      self.assertIs(Cache(pathlib.Path(tmp), refresh=True).get('b'), MISSING)
+      
+  def test_evict_least_recently_used(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      cache = Cache(pathlib.Path(tmp), max_bytes=2**20)
+      for key in ('a', 'b', 'c'):
+        cache.put(key, bytes(300 * 2**10))
+        os.utime(cache._path(key), (0, {'a': 1, 'b': 2, 'c': 3}[key]))
+      
+      cache.get('a') # now the most recently used
+      cache.put('d', bytes(300 * 2**10))
+      
+      self.assertIs(cache.get('b'), MISSING)
+      for key in ('a', 'c', 'd'):
+        self.assertIsNot(cache.get(key), MISSING)
+        
+  def test_entry_key(self):
+    self.assertEqual(entry_key('answer', 2015, 1, 1, 'x'), entry_key('answer', 2015, 1, 1, 'x'))
+    self.assertNotEqual(entry_key('answer', 2015, 1, 1, 'x'), entry_key('answer', 2015, 1, 2, 'x'))
+    self.assertNotEqual(entry_key('answer', 2015, 1, 1, 'x'), entry_key('answer', 2015, 1, 1, 'y'))
+    self.assertNotEqual(entry_key('answer', 2015, 1, 1, 'x'), entry_key('parsed', 2015, 1, 1, 'x'))
+    
+  def test_day_key(self):
+    self.assertEqual(day_key('parsed', 2015, 24, 'x'), day_key('parsed', 2015, 24, 'x'))
+    self.assertNotEqual(day_key('parsed', 2015, 24, 'x'), day_key('parsed', 2015, 24, 'y'))
+    self.assertNotEqual(day_key('parsed', 2015, 24, 'x'), entry_key('parsed', 2015, 24, 2, 'x'))
+    
+  def test_shared_module_edit(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      root = pathlib.Path(tmp)
+      (root / '2015').mkdir()
+      for name in ('01.1.py', '01.2.py', 'search.py'):
+        (root / '2015' / name).write_text('pass\n')
+      cache = Cache(root / 'cache')
+      
+      previous = solutions.ROOT
+      solutions.ROOT = root
+      try:
+        cache.put(entry_key('answer', 2015, 1, 1, 'x'), 1)
+        cache.put(day_key('parsed', 2015, 1, 'x'), [1])
+        self.assertEqual(cache.get(entry_key('answer', 2015, 1, 1, 'x')), 1)
+        
+        # neither solution changed, but code they could import did
+        (root / '2015' / 'search.py').write_text('pass\npass\n')
+        self.assertIs(cache.get(entry_key('answer', 2015, 1, 1, 'x')), MISSING)
+        self.assertIs(cache.get(day_key('parsed', 2015, 1, 'x')), MISSING)
+      finally:
+        solutions.ROOT = previous
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,196 @@
+import unittest
+import math
+import time
+import typing
+
+from aoc.runner import Job
+from aoc.bench import NOISE_FLOOR_SECONDS
+from aoc import generators, solutions, days
+
+DEFAULT_REPEAT = 3
+DEFAULT_MAX_SECONDS = 2.0 # stop growing the input once a single run takes this long
+MIN_POINTS = 3
+SIMPLER_MARGIN = 0.8 # a more complex model has to cut the residual by 20% to be preferred
+POOR_FIT_RESIDUAL = 0.05 # above this even the best model is only the nearest class, e.g. for 100^n growth
+
+class Model(typing.NamedTuple):
+  name: str
+  f: typing.Callable[[int], float]
+
+# ordered simplest first
+MODELS = [
+  Model('O(1)', lambda n: 1.0),
+  Model('O(log n)', lambda n: math.log(n)),
+  Model('O(n)', lambda n: float(n)),
+  Model('O(n log n)', lambda n: n * math.log(n)),
+  Model('O(n^2)', lambda n: float(n) ** 2),
+  Model('O(n^3)', lambda n: float(n) ** 3),
+  Model('O(2^n)', lambda n: 2.0 ** n),
+  Model('O(n!)', lambda n: float(math.factorial(n))),
+]
+
+# input sizes per (year, day), in the units of that day's generator, chosen so the smallest run is well above timer
+# noise and the largest stays within a few seconds for the current solutions. Day 18 only reads a fixed 100x100 grid.
+DEFAULT_SIZES: dict[tuple[int, int], list[int]] = {
+  (2015, 1): [25_000, 50_000, 100_000, 200_000, 400_000],
+  (2015, 2): [2_000, 4_000, 8_000, 16_000, 32_000],
+  (2015, 3): [25_000, 50_000, 100_000, 200_000, 400_000],
+  (2015, 5): [16, 32, 64, 128, 256],
+  (2015, 6): [1, 2, 4, 8, 16],
+  (2015, 7): [500, 1_000, 2_000, 4_000, 8_000],
+  (2015, 8): [2_000, 4_000, 8_000, 16_000, 32_000],
+  (2015, 9): [5, 6, 7, 8, 9],
+  (2015, 12): [5_000, 10_000, 20_000, 40_000, 80_000],
+  (2015, 13): [5, 6, 7, 8, 9],
+  (2015, 14): [50, 100, 200, 400, 800],
+  (2015, 15): [1, 2, 3, 4],
+  (2015, 16): [1_000, 2_000, 4_000, 8_000, 16_000],
+  (2015, 17): [14, 17, 20, 23, 26],
+  (2015, 19): [200, 400, 800, 1_600, 3_200],
+  (2015, 21): [4, 8, 12, 16, 20],
+  (2015, 23): [1_000, 2_000, 4_000, 8_000, 16_000],
+  (2015, 24): [12, 16, 20, 24, 28],
+}
+
+class Fit(typing.TypedDict):
+  model: str
+  residuals: dict[str, float] # mean squared relative error per model, inf where it does not fit at all
+
+class Scaling(typing.TypedDict):
+  job: Job
+  stage: str # solve, or parse and solve_parsed for days that split them
+  sizes: list[int]
+  seconds: list[float]
+  fit: typing.Optional[Fit] # None with too few points or when every run is within timer noise
+
+def fit_model(model: Model, sizes: list[int], seconds: list[float]) -> float:
+  """Fits seconds ~ a + c * f(n) with a, c >= 0, weighting by relative error, and returns the mean squared
+  relative residual."""
+  try:
+    fs = [model.f(n) for n in sizes]
+  except (OverflowError, ValueError):
+    return math.inf
+  top = max(fs)
+  if not math.isfinite(top) or top <= 0:
+    return math.inf
+  fs = [f / top for f in fs] # only the shape matters and this keeps the normal equations finite
+  
+  # weighted least squares on rows (1/t, f/t) against 1
+  u = [1 / t for t in seconds]
+  v = [f / t for f, t in zip(fs, seconds)]
+  suu, suv, svv = sum(x * x for x in u), sum(x * y for x, y in zip(u, v)), sum(y * y for y in v)
+  su, sv = sum(u), sum(v)
+  
+  det = suu * svv - suv * suv
+  a, c = ((su * svv - sv * suv) / det, (sv * suu - su * suv) / det) if abs(det) > 1e-12 * suu * svv else (0.0, -1.0)
+  if a < 0 or c < 0:
+    # pin whichever term went negative at zero
+    candidates = [(0.0, sv / svv), (su / suu, 0.0)]
+    a, c = min(candidates, key=lambda ac: sum((ac[0] * x + ac[1] * y - 1) ** 2 for x, y in zip(u, v)))
+    
+  return sum((a * x + c * y - 1) ** 2 for x, y in zip(u, v)) / len(sizes)
+
+def fit(sizes: list[int], seconds: list[float]) -> Fit:
+  residuals = {model.name: fit_model(model, sizes, seconds) for model in MODELS}
+  best = MODELS[0].name
+  for model in MODELS[1:]:
+    if residuals[model.name] < residuals[best] * SIMPLER_MARGIN:
+      best = model.name
+  return Fit(model=best, residuals=residuals)
+
+def time_best(fn: typing.Callable[[], typing.Any], repeat: int) -> float:
+  best = math.inf
+  for _ in range(repeat):
+    start = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - start)
+  return best
+
+def measure_scaling(
+  job: Job,
+  *,
+  sizes: typing.Optional[list[int]] = None,
+  repeat: int = DEFAULT_REPEAT,
+  max_seconds: float = DEFAULT_MAX_SECONDS,
+  seed: int = 0,
+) -> list[Scaling]:
+  """Times the job's solution on generated inputs of growing size and fits a growth model to each stage."""
+  module = solutions.load(*job)
+  sizes = sizes or DEFAULT_SIZES[(job.year, job.day)]
+  split = hasattr(module, 'parse') and hasattr(module, 'solve_parsed')
+  stages = ['parse', 'solve_parsed'] if split else ['solve']
+  timings: dict[str, list[float]] = {stage: [] for stage in stages}
+  
+  measured: list[int] = []
+  for size in sizes:
+    texts = generators.generate(job.year, job.day, size, seed=seed)
+    if split:
+      parsed = days.parse(module, texts)
+      timings['parse'].append(time_best(lambda: days.parse(module, texts), repeat))
+      timings['solve_parsed'].append(time_best(lambda: days.solve_parsed(module, parsed), repeat))
+    else:
+      timings['solve'].append(time_best(lambda: module.solve(*days.streams(texts)), repeat))
+    measured.append(size)
+    
+    if sum(timing[-1] for timing in timings.values()) > max_seconds:
+      break
+      
+  return [
+    Scaling(
+      job=job,
+      stage=stage,
+      sizes=measured,
+      seconds=seconds,
+      fit=fit(measured, seconds) if len(measured) >= MIN_POINTS and max(seconds) > NOISE_FLOOR_SECONDS else None,
+    )
+    for stage, seconds in timings.items()
+  ]
+
+def format_scaling(scaling: Scaling) -> str:
+  points = '  '.join(f'{n}:{s * 1000:.2f}ms' for n, s in zip(scaling['sizes'], scaling['seconds']))
+  if not scaling['fit']:
+    reason = 'too few sizes to fit' if len(scaling['sizes']) < MIN_POINTS else 'too fast to fit'
+    return f'{scaling["job"]} {scaling["stage"]}  {reason}  [{points}]'
+  model = scaling['fit']['model']
+  residual = scaling['fit']['residuals'][model]
+  poor = ', poor fit' if residual > POOR_FIT_RESIDUAL else ''
+  return f'{scaling["job"]} {scaling["stage"]}  {model}  (residual {residual:.3g}{poor})  [{points}]'
+
+class Tests(unittest.TestCase):
+  def test_fit(self):
+    sizes = [10, 20, 40, 80, 160]
+    for name, f in [('O(n)', lambda n: n), ('O(n^2)', lambda n: n * n), ('O(n log n)', lambda n: n * math.log(n))]:
+      with self.subTest(name=name):
+        self.assertEqual(fit(sizes, [0.001 + 1e-6 * f(n) for n in sizes])['model'], name)
+        
+    self.assertEqual(fit(sizes, [0.5, 0.5, 0.5, 0.5, 0.5])['model'], 'O(1)')
+    self.assertEqual(fit([5, 6, 7, 8, 9], [1e-6 * 2**n for n in [5, 6, 7, 8, 9]])['model'], 'O(2^n)')
+    self.assertEqual(fit([5, 6, 7, 8, 9], [1e-6 * math.factorial(n) for n in [5, 6, 7, 8, 9]])['model'], 'O(n!)')
+    
+  def test_fit_overflow(self):
+    sizes = [1000, 2000, 4000]
+    result = fit(sizes, [1e-3 * n for n in sizes])
+    self.assertEqual(result['model'], 'O(n)')
+    self.assertEqual(result['residuals']['O(n!)'], math.inf)
+    
+  def test_measure_scaling(self):
+    [scaling] = measure_scaling(Job(2015, 3, 1), sizes=[10_000, 20_000, 40_000, 80_000], repeat=1)
+    self.assertEqual(scaling['stage'], 'solve')
+    self.assertEqual(scaling['sizes'], [10_000, 20_000, 40_000, 80_000])
+    self.assertIsNotNone(scaling['fit'])
+    
+    stages = measure_scaling(Job(2015, 14, 1), sizes=[10, 20], repeat=1)
+    self.assertEqual([s['stage'] for s in stages], ['parse', 'solve_parsed'])
+    self.assertIsNone(stages[0]['fit'])
+    self.assertIn('too few sizes', format_scaling(stages[0]))
+    
+  def test_format_scaling(self):
+    scaling = Scaling(job=Job(2015, 1, 1), stage='solve', sizes=[1, 2, 3], seconds=[1e-5, 2e-5, 3e-5], fit=None)
+    self.assertIn('too fast to fit', format_scaling(scaling))
+    
+    scaling['seconds'] = [0.01, 0.02, 0.03]
+    scaling['fit'] = fit(scaling['sizes'], scaling['seconds'])
+    self.assertIn('O(n)', format_scaling(scaling))
+
+if __name__ == '__main__':
+  unittest.main()
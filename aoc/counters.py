@@ -0,0 +1,96 @@
+import collections
+import contextlib
+import unittest
+import tempfile
+import pathlib
+import typing
+import types
+import time
+
+from aoc.runner import DEFAULT_INPUTS_DIR, Job, input_paths
+from aoc import solutions
+
+# what the search solvers record, in the order they are printed
+COUNTERS = ['expanded', 'pruned', 'max_depth', 'max_heap', 'bound_updates']
+
+class CounterReport(typing.TypedDict):
+  job: Job
+  answer: typing.Any
+  seconds: float # includes the counting overhead
+  counters: typing.Optional[dict[str, int]] # None for solutions without search counters
+
+def instrumented(module: types.ModuleType) -> bool:
+  return hasattr(module, 'STATS')
+
+@contextlib.contextmanager
+def counting(module: types.ModuleType) -> typing.Iterator[collections.Counter[str]]:
+  """Points the module's STATS hook at a fresh Counter for the duration of the block.
+  
+  Solutions read STATS once per search into a local, so with the hook left at None each node costs a single
+  `is not None` check on that local.
+  """
+  counters: collections.Counter[str] = collections.Counter()
+  previous = module.STATS
+  module.STATS = counters
+  try:
+    yield counters
+  finally:
+    module.STATS = previous
+
+def count_job(job: Job, *, inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR) -> CounterReport:
+  module = solutions.load(*job)
+  with contextlib.ExitStack() as stack:
+    streams = [stack.enter_context(open(path)) for path in input_paths(job, inputs_dir)]
+    counters = stack.enter_context(counting(module)) if instrumented(module) else None
+    
+    start = time.perf_counter()
+    answer = module.solve(*streams)
+    seconds = time.perf_counter() - start
+    
+  return CounterReport(
+    job=job,
+    answer=answer,
+    seconds=seconds,
+    counters={name: counters[name] for name in COUNTERS} if counters is not None else None,
+  )
+
+def format_report(report: CounterReport) -> str:
+  line = f'{report["job"]}  {report["answer"]}  ({report["seconds"] * 1000:.2f} ms)'
+  if report['counters'] is None:
+    return f'{line}  no search counters'
+  return f'{line}\n  ' + '  '.join(f'{name} {value:,}' for name, value in report['counters'].items())
+
+class Tests(unittest.TestCase):
+  def test_counting(self):
+    module = solutions.load(2015, 17, 1)
+    with counting(module) as counters:
+      self.assertEqual(module.solve_parsed([100, 50, 50, 20, 30, 200]), 4)
+    self.assertIsNone(module.STATS)
+    
+    self.assertGreater(counters['expanded'], counters['pruned'])
+    self.assertGreater(counters['pruned'], 0)
+    self.assertEqual(counters['max_depth'], 4) # 50 + 50 + 20 + 30 is the only way to use four
+    self.assertEqual(counters['max_heap'], 0)
+    
+  def test_count_job(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      inputs_dir = pathlib.Path(tmp)
+      (inputs_dir / '2015' / '09').mkdir(parents=True)
+      (inputs_dir / '2015' / '09' / 'input.txt').write_text('a to b = 1\na to c = 5\nb to c = 1\n')
+      (inputs_dir / '2015' / '03').mkdir(parents=True)
+      (inputs_dir / '2015' / '03' / 'input.txt').write_text('^>v<')
+      
+      report = count_job(Job(2015, 9, 1), inputs_dir=inputs_dir)
+      self.assertEqual(report['answer'], 2)
+      counters = typing.cast(dict[str, int], report['counters'])
+      self.assertEqual(counters['expanded'], 4) # of 13 states, the deepest of the tied routes goes straight to a full one
+      self.assertEqual(counters['max_depth'], 3)
+      self.assertGreaterEqual(counters['bound_updates'], 1)
+      self.assertIn('expanded 4', format_report(report))
+      
+      report = count_job(Job(2015, 3, 1), inputs_dir=inputs_dir)
+      self.assertIsNone(report['counters'])
+      self.assertIn('no search counters', format_report(report))
+
+if __name__ == '__main__':
+  unittest.main()
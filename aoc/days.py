@@ -0,0 +1,169 @@
+import tempfile
+import unittest
+import pathlib
+import typing
+import types
+import time
+import io
+
+from aoc.runner import DEFAULT_INPUTS_DIR, Job, input_paths, read_inputs
+from aoc.cache import MISSING, Cache, entry_key, day_key, file_digest
+from aoc import solutions
+
+class DayResult(typing.TypedDict):
+  year: int
+  day: int
+  answers: list[typing.Any]
+  parse_seconds: float
+  solve_seconds: float
+  single_pass: bool
+  cached: bool
+  error: typing.Optional[str]
+
+def streams(texts: typing.Sequence[str]) -> list[io.StringIO]:
+  return [io.StringIO(text) for text in texts]
+
+def parse(module: types.ModuleType, texts: list[str]) -> typing.Any:
+  # days without a parse() hook consume their streams directly, so sharing the raw text is all we can do
+  if hasattr(module, 'parse'):
+    return module.parse(*streams(texts))
+  return texts
+
+def solve_parsed(module: types.ModuleType, parsed: typing.Any) -> typing.Any:
+  if hasattr(module, 'solve_parsed'):
+    return module.solve_parsed(parsed)
+  return module.solve(*streams(parsed))
+
+def solve_day(
+  year: int,
+  day: int,
+  texts: list[str],
+  *,
+  cache: typing.Optional[Cache] = None,
+  input_digest: typing.Optional[str] = None,
+) -> tuple[list[typing.Any], float, float, bool]:
+  """Parses a day's input once and answers both parts from it.
+  
+  When the part 2 module has a solve_both() hook, both answers come out of a single pass. Given a cache and
+  the digest of the inputs, parsed inputs are pickled so later runs can skip parsing.
+  Returns the answers, the parse and solve seconds, and whether a single pass was used.
+  """
+  part1, part2 = solutions.load(year, day, 1), solutions.load(year, day, 2)
+  if hasattr(part1, 'parse') != hasattr(part2, 'parse'):
+    raise RuntimeError(f'Both parts of {year} day {day} must define parse() for it to be shared')
+  
+  start = time.perf_counter()
+  if cache and input_digest and hasattr(part2, 'parse'):
+    key = day_key('parsed', year, day, input_digest)
+    parsed = cache.get(key)
+    if parsed is MISSING:
+      parsed = parse(part2, texts)
+      cache.put(key, parsed)
+  else:
+    parsed = parse(part2, texts)
+  parse_seconds = time.perf_counter() - start
+  
+  start = time.perf_counter()
+  single_pass = hasattr(part2, 'solve_both')
+  if single_pass:
+    both = part2.solve_both(parsed) if hasattr(part2, 'parse') else part2.solve_both(*streams(parsed))
+    answers = list(both)
+  else:
+    answers = [solve_parsed(part1, parsed), solve_parsed(part2, parsed)]
+  solve_seconds = time.perf_counter() - start
+  
+  return answers, parse_seconds, solve_seconds, single_pass
+
+def run_day(
+  year: int,
+  day: int,
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  cache: typing.Optional[Cache] = None,
+) -> DayResult:
+  try:
+    input_digest: typing.Optional[str] = None
+    if cache:
+      input_digest = file_digest(input_paths(Job(year, day, 1), inputs_dir))
+      keys = [entry_key('answer', year, day, part, input_digest) for part in (1, 2)]
+      answers = [cache.get(key) for key in keys]
+      if not any(answer is MISSING for answer in answers):
+        return DayResult(
+          year=year, day=day, answers=answers, parse_seconds=0.0, solve_seconds=0.0, single_pass=False,
+          cached=True, error=None,
+        )
+      
+    texts = read_inputs(Job(year, day, 1), inputs_dir)
+    answers, parse_seconds, solve_seconds, single_pass = solve_day(
+      year, day, texts, cache=cache, input_digest=input_digest,
+    )
+    
+    if cache:
+      for key, answer in zip(keys, answers):
+        cache.put(key, answer)
+  except Exception as e:
+    return DayResult(
+      year=year, day=day, answers=[], parse_seconds=0.0, solve_seconds=0.0, single_pass=False,
+      cached=False, error=f'{type(e).__name__}: {e}',
+    )
+  
+  return DayResult(
+    year=year,
+    day=day,
+    answers=answers,
+    parse_seconds=parse_seconds,
+    solve_seconds=solve_seconds,
+    single_pass=single_pass,
+    cached=False,
+    error=None,
+  )
+
+def format_day_result(result: DayResult) -> str:
+  prefix = f'{result["year"]} {result["day"]:02}'
+  if result['error']:
+    return f'{prefix}  ERROR {result["error"]}'
+  if result['cached']:
+    return f'{prefix}  {"  ".join(str(a) for a in result["answers"])}  (cached)'
+  return (
+    f'{prefix}  {"  ".join(str(a) for a in result["answers"])}  '
+    f'(parse {result["parse_seconds"] * 1000:.3f} ms, solve {result["solve_seconds"] * 1000:.3f} ms'
+    f'{", single pass" if result["single_pass"] else ""})'
+  )
+
+class Tests(unittest.TestCase):
+  def test_solve_day_matches_parts(self):
+    cases = {
+      1: ['(()))())('],
+      2: ['2x3x4\n1x1x10\n'],
+      9: ['London to Dublin = 464\nLondon to Belfast = 518\nDublin to Belfast = 141\n'],
+      17: ['20\n15\n10\n5\n5\n' * 3],
+      23: ['inc a\njio a, +2\ntpl a\ninc a\ninc b\n'],
+    }
+    for day, texts in cases.items():
+      with self.subTest(day=day):
+        answers, _, _, _ = solve_day(2015, day, texts)
+        expected = [solutions.load(2015, day, part).solve(*streams(texts)) for part in (1, 2)]
+        self.assertEqual(answers, expected)
+        
+  def test_run_day_cached(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      inputs_dir = pathlib.Path(tmp) / 'inputs'
+      (inputs_dir / '2015' / '24').mkdir(parents=True)
+      (inputs_dir / '2015' / '24' / 'input.txt').write_text('1\n2\n3\n4\n5\n7\n8\n9\n10\n11\n')
+      cache = Cache(pathlib.Path(tmp) / 'cache')
+      
+      first = run_day(2015, 24, inputs_dir=inputs_dir, cache=cache)
+      self.assertEqual((first['answers'], first['cached']), ([99, 44], False))
+      second = run_day(2015, 24, inputs_dir=inputs_dir, cache=cache)
+      self.assertEqual((second['answers'], second['cached']), ([99, 44], True))
+      
+      # parsed input is reused even when the answers have to be recomputed
+      parsed_key = day_key('parsed', 2015, 24, file_digest([inputs_dir / '2015' / '24' / 'input.txt']))
+      self.assertEqual(cache.get(parsed_key), [1, 2, 3, 4, 5, 7, 8, 9, 10, 11])
+  
+  def test_single_pass(self):
+    self.assertTrue(solve_day(2015, 9, ['a to b = 1\n'])[3])
+    self.assertFalse(solve_day(2015, 23, ['inc b\n'])[3])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,263 @@
+"""Differential testing of a solution's engines against its reference on generated inputs.
+
+A solution's reference is its ENGINES['reference'] if it declares one, otherwise solve(). Every other entry in its
+ENGINES dict, solve() itself, and the harness's own by-day path (parse once, solve_both) are candidates, each called
+with the same streams as solve(). Mismatches are shrunk to a minimal failing input and saved to a corpus that is
+replayed before any new cases are generated.
+"""
+import unittest
+import tempfile
+import hashlib
+import pathlib
+import random
+import typing
+import json
+
+from aoc.cache import CACHE_DIR
+from aoc.runner import Job
+from aoc import generators, solutions, days
+
+CORPUS_DIR = CACHE_DIR / 'corpus'
+DEFAULT_CASES = 20
+MAX_SHRINK_CHECKS = 2000
+
+class Unsupported(Exception):
+  """Raised by a candidate engine for inputs outside what it handles, which never count as mismatches."""
+
+Engine: typing.TypeAlias = typing.Callable[[list[str]], typing.Any] # takes the input texts
+
+class Mismatch(typing.TypedDict):
+  job: str
+  engine: str
+  texts: list[str]
+  expected: str # repr of the reference's answer
+  actual: str # repr of the candidate's answer, or the exception it raised
+
+def engines(job: Job) -> dict[str, Engine]:
+  module = solutions.load(*job)
+  
+  def streams_engine(fn: typing.Callable[..., typing.Any]) -> Engine:
+    return lambda texts: fn(*days.streams(texts))
+    
+  found: dict[str, Engine] = {'solve': streams_engine(module.solve)}
+  for name, fn in getattr(module, 'ENGINES', {}).items():
+    found[name] = streams_engine(fn)
+  
+  other_part = 2 if job.part == 1 else 1
+  other = solutions.load(job.year, job.day, other_part)
+  
+  def by_day(texts: list[str]) -> typing.Any:
+    # answers both parts at once, so it can only be held to inputs the other part accepts too
+    try:
+      return days.solve_day(job.year, job.day, texts)[0][job.part - 1]
+    except Exception:
+      try:
+        other.solve(*days.streams(texts))
+      except Exception as e:
+        raise Unsupported(f'part {other_part} rejects the input') from e
+      raise
+    
+  found['by-day'] = by_day
+  return found
+
+def reference_name(candidates: dict[str, Engine]) -> str:
+  return 'reference' if 'reference' in candidates else 'solve'
+
+def outcome(engine: Engine, texts: list[str]) -> tuple[bool, str]:
+  """(ok, repr of the answer or of the exception)"""
+  try:
+    return True, repr(engine(texts))
+  except Exception as e:
+    return False, f'{type(e).__name__}: {e}'
+
+def differs(reference: Engine, candidate: Engine, texts: list[str]) -> typing.Optional[tuple[str, str]]:
+  """Returns (expected, actual) when the candidate disagrees with the reference. Inputs the reference itself rejects
+  say nothing about the candidate, so they never count as mismatches."""
+  ok, expected = outcome(reference, texts)
+  if not ok:
+    return None
+  try:
+    actual = repr(candidate(texts))
+  except Unsupported:
+    return None
+  except Exception as e:
+    actual = f'{type(e).__name__}: {e}'
+  return None if actual == expected else (expected, actual)
+
+T = typing.TypeVar('T')
+
+def ddmin(items: list[T], fails: typing.Callable[[list[T]], bool]) -> list[T]:
+  """Delta debugging: removes chunks of items, halving the chunk size when nothing can go, while fails() holds."""
+  n = 2
+  while len(items) >= 2:
+    chunk = -(-len(items) // n)
+    for start in range(0, len(items), chunk):
+      complement = items[:start] + items[start + chunk:]
+      if complement and fails(complement):
+        items = complement
+        n = max(n - 1, 2)
+        break
+    else:
+      if n >= len(items):
+        break
+      n = min(len(items), n * 2)
+  return items
+
+def shrink(texts: list[str], fails: typing.Callable[[list[str]], bool]) -> list[str]:
+  """Shrinks each input text in turn, by lines where it has several and by characters otherwise."""
+  checks = 0
+  
+  def bounded(candidate: list[str]) -> bool:
+    nonlocal checks
+    checks += 1
+    return checks <= MAX_SHRINK_CHECKS and fails(candidate)
+    
+  texts = list(texts)
+  for i, text in enumerate(texts):
+    lines = text.splitlines(keepends=True)
+    pieces = lines if len(lines) > 1 else list(text)
+    
+    def with_pieces(candidate: list[str]) -> list[str]:
+      return texts[:i] + [''.join(candidate)] + texts[i + 1:]
+      
+    texts = with_pieces(ddmin(pieces, lambda candidate: bounded(with_pieces(candidate))))
+  return texts
+
+def shrink_size(job: Job, size: int, seed: int, fails: typing.Callable[[list[str]], bool]) -> list[str]:
+  """Finds the smallest generated size, doubling from 1, that still fails with the same seed. Generated inputs are
+  always valid, so this is tried before the blind textual shrinking."""
+  candidate = 1
+  while candidate < size:
+    texts = generators.generate(job.year, job.day, candidate, seed=seed)
+    if fails(texts):
+      return texts
+    candidate *= 2
+  return generators.generate(job.year, job.day, size, seed=seed)
+
+def corpus_path(mismatch: Mismatch, corpus_dir: pathlib.Path) -> pathlib.Path:
+  digest = hashlib.sha256(json.dumps(mismatch['texts']).encode()).hexdigest()[:16]
+  year, rest = mismatch['job'].split(' ')
+  return corpus_dir / year / rest / f'{mismatch["engine"]}-{digest}.json'
+
+def save_mismatch(mismatch: Mismatch, corpus_dir: pathlib.Path = CORPUS_DIR) -> pathlib.Path:
+  path = corpus_path(mismatch, corpus_dir)
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with open(path, 'w') as f:
+    json.dump(mismatch, f, indent=2)
+  return path
+
+def load_corpus(job: Job, corpus_dir: pathlib.Path = CORPUS_DIR) -> list[Mismatch]:
+  directory = corpus_dir / str(job.year) / f'{job.day:02}.{job.part}'
+  corpus: list[Mismatch] = []
+  for path in sorted(directory.glob('*.json')):
+    with open(path) as f:
+      corpus.append(json.load(f))
+  return corpus
+
+def check(
+  job: Job,
+  *,
+  cases: int = DEFAULT_CASES,
+  seed: int = 0,
+  corpus_dir: pathlib.Path = CORPUS_DIR,
+  candidates: typing.Optional[dict[str, Engine]] = None,
+) -> list[Mismatch]:
+  """Replays the corpus for the job, then runs every candidate engine against the reference on freshly generated
+  inputs. New mismatches are shrunk and added to the corpus."""
+  candidates = candidates if candidates is not None else engines(job)
+  reference = candidates[reference_name(candidates)]
+  others = {name: engine for name, engine in candidates.items() if engine is not reference}
+  mismatches: list[Mismatch] = []
+  
+  # past failures first, every engine sees every saved input
+  for saved in load_corpus(job, corpus_dir):
+    for name, engine in others.items():
+      if diff := differs(reference, engine, saved['texts']):
+        mismatches.append(Mismatch(job=str(job), engine=name, texts=saved['texts'], expected=diff[0], actual=diff[1]))
+        
+  if (job.year, job.day) not in generators.GENERATORS:
+    return mismatches
+    
+  rng = random.Random(f'{job}-{seed}')
+  max_size = generators.SMALL_SIZES[(job.year, job.day)]
+  for _ in range(cases):
+    size, case_seed = rng.randint(1, max_size), rng.randrange(2**32)
+    texts = generators.generate(job.year, job.day, size, seed=case_seed)
+    for name, engine in others.items():
+      def fails(candidate: list[str], engine: Engine = engine) -> bool:
+        return differs(reference, engine, candidate) is not None
+        
+      if not fails(texts):
+        continue
+      texts_min = shrink(shrink_size(job, size, case_seed, fails), fails)
+      expected, actual = typing.cast(tuple[str, str], differs(reference, engine, texts_min))
+      mismatch = Mismatch(job=str(job), engine=name, texts=texts_min, expected=expected, actual=actual)
+      save_mismatch(mismatch, corpus_dir)
+      mismatches.append(mismatch)
+      
+  return mismatches
+
+def format_mismatch(mismatch: Mismatch, corpus_dir: pathlib.Path = CORPUS_DIR) -> str:
+  shown = ' | '.join(text if len(text) <= 200 else text[:200] + '...' for text in mismatch['texts'])
+  return (
+    f'{mismatch["job"]} {mismatch["engine"]}  MISMATCH expected {mismatch["expected"]} got {mismatch["actual"]}\n'
+    f'  input: {shown!r}\n'
+    f'  saved: {corpus_path(mismatch, corpus_dir)}'
+  )
+
+class Tests(unittest.TestCase):
+  def test_ddmin(self):
+    self.assertEqual(ddmin(list(range(100)), lambda items: 17 in items and 42 in items), [17, 42])
+    self.assertEqual(len(ddmin(list('abc'), lambda items: True)), 1)
+    
+  def test_shrink(self):
+    texts = ['1\n2\n3\n4\n5\n', '((()))']
+    self.assertEqual(shrink(texts, lambda t: '3' in t[0] and ')' in t[1]), ['3\n', ')'])
+    
+  def test_engines(self):
+    found = engines(Job(2015, 9, 2))
+    self.assertEqual(sorted(found), ['by-day', 'reference', 'solve'])
+    self.assertEqual(reference_name(found), 'reference')
+    
+    texts = generators.generate(2015, 9, 4)
+    self.assertEqual(found['solve'](texts), found['reference'](texts))
+    self.assertEqual(found['solve'](texts), found['by-day'](texts))
+    
+    # without ENGINES, solve is its own reference
+    self.assertEqual(reference_name(engines(Job(2015, 8, 1))), 'solve')
+    
+  def test_check(self):
+    # an engine that is wrong whenever the input goes down at least three times
+    def broken(texts: list[str]) -> int:
+      floor = texts[0].count('(') - texts[0].count(')')
+      return floor + 1 if texts[0].count(')') >= 3 else floor
+      
+    candidates: dict[str, Engine] = {'solve': lambda texts: texts[0].count('(') - texts[0].count(')'), 'broken': broken}
+    with tempfile.TemporaryDirectory() as tmp:
+      corpus_dir = pathlib.Path(tmp)
+      mismatches = check(Job(2015, 1, 1), cases=5, corpus_dir=corpus_dir, candidates=candidates)
+      self.assertTrue(mismatches)
+      self.assertEqual(mismatches[0]['texts'], [')))'])
+      
+      # the corpus is replayed even with no new cases
+      replayed = check(Job(2015, 1, 1), cases=0, corpus_dir=corpus_dir, candidates=candidates)
+      self.assertEqual(len(replayed), len(load_corpus(Job(2015, 1, 1), corpus_dir)))
+      self.assertIn('MISMATCH', format_mismatch(replayed[0], corpus_dir))
+      
+  def test_reference_errors_are_not_mismatches(self):
+    def rejects(texts: list[str]) -> int:
+      raise ValueError('invalid input')
+    def unsupported(texts: list[str]) -> int:
+      raise Unsupported()
+    self.assertIsNone(differs(rejects, lambda texts: 1, ['']))
+    self.assertIsNotNone(differs(lambda texts: 1, rejects, ['']))
+    self.assertIsNone(differs(lambda texts: 1, unsupported, ['']))
+    
+  def test_by_day_unsupported(self):
+    # part 2 of day 17 has no answer when no combination fills the eggnog, part 1 is simply 0
+    by_day = engines(Job(2015, 17, 1))['by-day']
+    self.assertRaises(Unsupported, by_day, ['7\n'])
+    self.assertIsNone(differs(engines(Job(2015, 17, 1))['solve'], by_day, ['7\n']))
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,404 @@
+"""Seeded generators for synthetic puzzle inputs at arbitrary scale.
+
+Every generator takes a random.Random and a size and yields the input text in chunks, so multi-gigabyte inputs can be
+written without being held in memory. What size counts is documented per day and is always the dimension the solution's
+cost grows with. Days whose input is a literal in the solution (04, 10, 11, 20, 22, 25) have no generator.
+"""
+import unittest
+import tempfile
+import pathlib
+import random
+import typing
+import json
+import math
+import io
+
+from aoc.runner import DEFAULT_INPUTS_DIR, Job, input_dir
+from aoc import solutions
+
+CHUNK_SIZE = 1 << 16
+
+# sizes every solution handles in well under a second, for tests and fuzzing
+SMALL_SIZES: dict[tuple[int, int], int] = {
+  (2015, 1): 10_000, (2015, 2): 100, (2015, 3): 1000, (2015, 5): 50, (2015, 6): 3, (2015, 7): 200, (2015, 8): 100,
+  (2015, 9): 5, (2015, 12): 300, (2015, 13): 4, (2015, 14): 20, (2015, 15): 2, (2015, 16): 50, (2015, 17): 15,
+  (2015, 18): 100, (2015, 19): 30, (2015, 21): 5, (2015, 23): 40, (2015, 24): 12,
+}
+
+Generator: typing.TypeAlias = typing.Callable[[random.Random, int], typing.Iterator[str]]
+
+GENERATORS: dict[tuple[int, int], dict[str, Generator]] = {}
+
+def generator(year: int, day: int, name: str = solutions.DEFAULT_INPUTS[0]) -> typing.Callable[[Generator], Generator]:
+  def register(fn: Generator) -> Generator:
+    GENERATORS.setdefault((year, day), {})[name] = fn
+    return fn
+  return register
+
+def available(year: int) -> list[int]:
+  return sorted(day for y, day in GENERATORS if y == year)
+
+def make_rng(year: int, day: int, name: str, size: int, seed: int) -> random.Random:
+  return random.Random(f'{year}-{day:02}-{name}-{size}-{seed}')
+
+def generate(year: int, day: int, size: int, *, seed: int = 0) -> list[str]:
+  """Returns the generated input texts in the order the day's solutions expect their streams."""
+  return [
+    ''.join(fn(make_rng(year, day, name, size, seed), size))
+    for name, fn in GENERATORS[(year, day)].items()
+  ]
+
+def write_inputs(
+  year: int,
+  day: int,
+  size: int,
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  seed: int = 0,
+) -> list[pathlib.Path]:
+  """Writes generated inputs in the runner's <year>/<day>/<name> layout, streaming chunks straight to disk."""
+  directory = input_dir(Job(year, day, 1), inputs_dir)
+  directory.mkdir(parents=True, exist_ok=True)
+  
+  paths: list[pathlib.Path] = []
+  for name, fn in GENERATORS[(year, day)].items():
+    path = directory / name
+    with open(path, 'w') as f:
+      f.writelines(fn(make_rng(year, day, name, size, seed), size))
+    paths.append(path)
+  return paths
+
+def write_stream(year: int, day: int, size: int, out: typing.TextIO, *, seed: int = 0) -> None:
+  """Streams the generated input of a single-input day to out, e.g. stdout to pipe it into a solution."""
+  generators = GENERATORS[(year, day)]
+  if len(generators) != 1:
+    raise ValueError(f'{year} day {day} reads {len(generators)} inputs, write them to a directory instead')
+  [(name, fn)] = generators.items()
+  for chunk in fn(make_rng(year, day, name, size, seed), size):
+    out.write(chunk)
+
+def make_name(i: int) -> str:
+  """Distinct capitalized alphabetic names: Aa, Ba, ..., Za, Ab, ..."""
+  name = chr(ord('A') + i % 26)
+  i //= 26
+  while True:
+    name += chr(ord('a') + i % 26)
+    i //= 26
+    if not i:
+      return name
+
+def make_wire(i: int) -> str:
+  # at least two letters so the generated wires never collide with a and b
+  return make_name(i).lower()
+
+def chunked(lines: typing.Iterable[str]) -> typing.Iterator[str]:
+  buffer: list[str] = []
+  buffered = 0
+  for line in lines:
+    buffer.append(line)
+    buffered += len(line)
+    if buffered >= CHUNK_SIZE:
+      yield ''.join(buffer)
+      buffer.clear()
+      buffered = 0
+  if buffer:
+    yield ''.join(buffer)
+
+@generator(2015, 1)
+def day01(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: parentheses.
+  
+  Opens with a climb a fair walk rarely undoes, so the first basement visit comes near the end and part 2 has to scan
+  the whole input. Topped up with ')' if the walk never got there.
+  """
+  floor = climb = min(size, 3 * math.isqrt(size))
+  reached = False
+  yield '(' * climb
+  for start in range(climb, size, CHUNK_SIZE):
+    chunk = ''.join(rng.choices('()', k=min(CHUNK_SIZE, size - start)))
+    if not reached and floor < len(chunk):
+      # only chunks that could take us below ground need walking
+      for ch in chunk:
+        floor += 1 if ch == '(' else -1
+        reached = reached or floor < 0
+    else:
+      floor += 2 * chunk.count('(') - len(chunk)
+    yield chunk
+  if not reached:
+    yield ')' * (floor + 1)
+
+@generator(2015, 2)
+def day02(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: LxWxH presents."""
+  return chunked(f'{rng.randint(1, 30)}x{rng.randint(1, 30)}x{rng.randint(1, 30)}\n' for _ in range(size))
+
+@generator(2015, 3)
+def day03(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: moves."""
+  for start in range(0, size, CHUNK_SIZE):
+    yield ''.join(rng.choices('^v<>', k=min(CHUNK_SIZE, size - start)))
+
+@generator(2015, 5)
+def day05(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: length of each of 1000 strings, the pair checks are quadratic in it."""
+  letters = 'abcdefghijklmnopqrstuvwxyz'
+  return chunked(''.join(rng.choices(letters, k=size)) + '\n' for _ in range(1000))
+
+@generator(2015, 6)
+def day06(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: instructions. The solutions have a fixed 1000x1000 grid, so rectangles stay inside it."""
+  def instruction() -> str:
+    x1, x2 = sorted(rng.randrange(1000) for _ in range(2))
+    y1, y2 = sorted(rng.randrange(1000) for _ in range(2))
+    action = rng.choice(['turn on', 'turn off', 'toggle'])
+    return f'{action} {x1},{y1} through {x2},{y2}\n'
+  return chunked(instruction() for _ in range(size))
+
+@generator(2015, 7)
+def day07(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: wires. Every gate only reads wires defined before it, the lines are shuffled."""
+  wires = ['b']
+  lines = [f'{rng.randrange(1 << 16)} -> b']
+  for i in range(max(size - 2, 1)):
+    wire = make_wire(i + 26)
+    x, y = rng.choice(wires), rng.choice(wires + ['1'])
+    match rng.randrange(6):
+      case 0: lines.append(f'{rng.randrange(1 << 16)} -> {wire}')
+      case 1: lines.append(f'{x} AND {y} -> {wire}')
+      case 2: lines.append(f'{x} OR {y} -> {wire}')
+      case 3: lines.append(f'{x} LSHIFT {rng.randint(1, 15)} -> {wire}')
+      case 4: lines.append(f'{x} RSHIFT {rng.randint(1, 15)} -> {wire}')
+      case _: lines.append(f'NOT {x} -> {wire}')
+    wires.append(wire)
+  lines.append(f'{wires[-1]} -> a')
+  rng.shuffle(lines)
+  return chunked(line + '\n' for line in lines)
+
+@generator(2015, 8)
+def day08(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: string literals."""
+  def literal() -> str:
+    parts: list[str] = []
+    for _ in range(rng.randint(0, 30)):
+      match rng.randrange(8):
+        case 0: parts.append('\\\\')
+        case 1: parts.append('\\"')
+        case 2: parts.append(f'\\x{rng.randrange(256):02x}')
+        case _: parts.append(rng.choice('abcdefghijklmnopqrstuvwxyz'))
+    return '"' + ''.join(parts) + '"\n'
+  return chunked(literal() for _ in range(size))
+
+@generator(2015, 9)
+def day09(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: cities, every pair connected. The reference route search is factorial in it, the state search 2^size."""
+  cities = [make_name(i) for i in range(size)]
+  return chunked(
+    f'{a} to {b} = {rng.randint(1, 200)}\n'
+    for i, a in enumerate(cities)
+    for b in cities[i + 1:]
+  )
+
+@generator(2015, 12)
+def day12(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: JSON values, nested up to 100 deep to stay clear of the recursion limit."""
+  remaining = size
+  
+  def value(depth: int) -> typing.Any:
+    nonlocal remaining
+    remaining -= 1
+    kind = rng.randrange(6) if depth < 100 and remaining > 0 else rng.randrange(2)
+    match kind:
+      case 0: return rng.randint(-100, 100)
+      case 1: return rng.choice(['red', 'green', 'blue', 'orange', 'violet'])
+      case 2 | 3:
+        return [value(depth + 1) for _ in range(min(remaining, rng.randint(1, 8)))]
+      case _:
+        return {make_name(i).lower(): value(depth + 1) for i in range(min(remaining, rng.randint(1, 8)))}
+        
+  values: list[typing.Any] = []
+  while remaining > 0:
+    values.append(value(1))
+  yield json.dumps(values)
+
+@generator(2015, 13)
+def day13(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: guests, every ordered pair given. The reference seating search is factorial in it, the state search
+  2^size."""
+  guests = [make_name(i) for i in range(size)]
+  return chunked(
+    f'{a} would {rng.choice(["gain", "lose"])} {rng.randint(0, 100)} happiness units by sitting next to {b}.\n'
+    for a in guests
+    for b in guests
+    if a != b
+  )
+
+@generator(2015, 14)
+def day14(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: reindeer."""
+  return chunked(
+    f'{make_name(i)} can fly {rng.randint(1, 30)} km/s for {rng.randint(1, 20)} seconds, '
+    f'but then must rest for {rng.randint(10, 200)} seconds.\n'
+    for i in range(size)
+  )
+
+@generator(2015, 15)
+def day15(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: ingredients. The recipe search grows as 100^(size - 1)."""
+  def ingredient(i: int) -> str:
+    # like the real inputs, each ingredient is strong in one property and weak in the rest, and the first one alone
+    # makes a 500 calorie cookie so part 2 always has an answer
+    capacity, durability, flavor, texture = (rng.randint(2, 5) if k == i % 4 else rng.randint(-1, 3) for k in range(4))
+    return (
+      f'{make_name(i)}: capacity {capacity}, durability {durability}, flavor {flavor}, texture {texture}, '
+      f'calories {5 if i == 0 else rng.randint(1, 9)}\n'
+    )
+  return chunked(ingredient(i) for i in range(size))
+
+@generator(2015, 16)
+def day16(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: aunts."""
+  compounds = [
+    'children', 'cats', 'samoyeds', 'pomeranians', 'akitas', 'vizslas', 'goldfish', 'trees', 'cars', 'perfumes',
+  ]
+  return chunked(
+    f'Sue {i}: ' + ', '.join(f'{c}: {rng.randint(0, 10)}' for c in rng.sample(compounds, 3)) + '\n'
+    for i in range(1, size + 1)
+  )
+
+@generator(2015, 17)
+def day17(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: containers."""
+  return chunked(f'{rng.randint(5, 50)}\n' for _ in range(size))
+
+@generator(2015, 18)
+def day18(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: side of the square grid. The solutions currently read exactly 100x100."""
+  return chunked(''.join(rng.choices('#.', k=size)) + '\n' for _ in range(size))
+
+@generator(2015, 19)
+def day19(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: elements in the medicine molecule.
+  
+  Every pair of adjacent elements folds into its left element, so greedily undoing the longest replacement always
+  gets back to e, in exactly size steps.
+  """
+  elements = [make_name(i) for i in range(8)]
+  for element in elements:
+    yield f'e => {element}\n'
+  for left in elements:
+    for right in elements:
+      yield f'{left} => {left}{right}\n'
+  yield '\n'
+  yield from chunked(rng.choice(elements) for _ in range(size))
+  yield '\n'
+
+@generator(2015, 21, 'boss.txt')
+def day21_boss(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: unused, the boss is always a fair fight for some loadout."""
+  yield f'Hit Points: {rng.randint(80, 120)}\nDamage: {rng.randint(7, 10)}\nArmor: {rng.randint(1, 3)}\n'
+
+@generator(2015, 21, 'shop.txt')
+def day21_shop(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: items per table. The last weapon wins in one hit and the cheapest loses, so both parts have answers."""
+  def table(header: str, kind: str, items: list[tuple[int, int, int]]) -> str:
+    rows = ''.join(f'{kind} {i:<8} {cost:>4} {damage:>6} {armor:>6}\n' for i, (cost, damage, armor) in enumerate(items))
+    return f'{header}:    Cost  Damage  Armor\n{rows}\n'
+    
+  weapons = [(rng.randint(8, 100), rng.randint(4, 9), 0) for _ in range(max(size - 1, 1))] + [(1000, 1000, 0)]
+  armor = [(rng.randint(13, 110), 0, rng.randint(1, 5)) for _ in range(size)]
+  rings = [
+    (rng.randint(20, 100), rng.randint(1, 3), 0) if rng.randrange(2) else (rng.randint(20, 80), 0, rng.randint(1, 3))
+    for _ in range(size)
+  ]
+  yield table('Weapons', 'Weapon', weapons)
+  yield table('Armor', 'Armor', armor)
+  yield table('Rings', 'Ring', rings)
+
+@generator(2015, 23)
+def day23(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: instructions building up a, followed by the Collatz loop that counts its steps into b."""
+  a_limit = 10**9 # keeps the Collatz run exact in the solutions' float registers
+  lines = ['inc a']
+  a_part1 = a_part2 = 1 # the two parts start a at 0 and 1
+  for _ in range(max(size - 1, 0)):
+    if a_part2 * 3 < a_limit and rng.randrange(4) == 0:
+      lines.append('tpl a')
+      a_part1, a_part2 = a_part1 * 3, a_part2 * 3
+    elif a_part2 + 1 < a_limit:
+      lines.append('inc a')
+      a_part1, a_part2 = a_part1 + 1, a_part2 + 1
+    else:
+      lines.append('jmp +1')
+  lines += ['jio a, +8', 'inc b', 'jie a, +4', 'tpl a', 'inc a', 'jmp +2', 'hlf a', 'jmp -7']
+  return chunked(line + '\n' for line in lines)
+
+@generator(2015, 24)
+def day24(rng: random.Random, size: int) -> typing.Iterator[str]:
+  """size: packages, distinct weights that can always be split into three or four equal groups.
+  
+  Each weight is at most one more than the sum of the lighter ones, so every total up to the sum is reachable.
+  """
+  limit = max(64, 20 * size)
+  weights = [1]
+  while sum(weights) < limit and len(weights) < size - 1:
+    weights.append(rng.randint(weights[-1] + 1, sum(weights) + 1))
+  if len(weights) < size - 1:
+    weights += sorted(rng.sample(range(weights[-1] + 1, limit + 1), size - 1 - len(weights)))
+    
+  # the last weight makes the total divisible by both 3 and 4
+  total = sum(weights)
+  last = weights[-1] + 1
+  last += (-(total + last)) % 12
+  weights.append(last)
+  return chunked(f'{w}\n' for w in weights)
+
+class Tests(unittest.TestCase):
+  def test_make_name(self):
+    names = [make_name(i) for i in range(26 * 27)]
+    self.assertEqual(names[:2], ['Aa', 'Ba'])
+    self.assertEqual(len(set(names)), len(names))
+    self.assertTrue(all(name.isalpha() for name in names))
+    
+  def test_seeded(self):
+    self.assertEqual(generate(2015, 2, 100, seed=1), generate(2015, 2, 100, seed=1))
+    self.assertNotEqual(generate(2015, 2, 100, seed=1), generate(2015, 2, 100, seed=2))
+    
+  def test_sizes(self):
+    self.assertGreaterEqual(len(generate(2015, 1, 3 * CHUNK_SIZE + 1)[0]), 3 * CHUNK_SIZE + 1)
+    self.assertEqual(len(generate(2015, 2, 1000)[0].splitlines()), 1000)
+    self.assertEqual(len(generate(2015, 9, 6)[0].splitlines()), 15)
+    self.assertEqual(len(generate(2015, 24, 30)[0].splitlines()), 30)
+    
+  def test_solvable(self):
+    # small inputs for every day, solved by both parts
+    self.assertEqual(sorted(day for _, day in SMALL_SIZES), available(2015))
+    for (_, day), size in SMALL_SIZES.items():
+      texts = generate(2015, day, size)
+      for part in (1, 2):
+        with self.subTest(day=day, part=part):
+          module = solutions.load(2015, day, part)
+          streams = [io.StringIO(text) for text in texts]
+          if day == 18:
+            # a hundred steps over the grid take seconds, parsing is what the generator has to get right
+            self.assertEqual(len(module.parse(*streams)), size)
+          else:
+            self.assertIsNotNone(module.solve(*streams))
+          
+  def test_day19_steps(self):
+    module = solutions.load(2015, 19, 2)
+    self.assertEqual(module.solve(io.StringIO(generate(2015, 19, 30)[0])), 30)
+    
+  def test_write_stream(self):
+    out = io.StringIO()
+    write_stream(2015, 2, 100, out, seed=3)
+    self.assertEqual(out.getvalue(), generate(2015, 2, 100, seed=3)[0])
+    self.assertRaises(ValueError, lambda: write_stream(2015, 21, 5, io.StringIO()))
+    
+  def test_write_inputs(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      paths = write_inputs(2015, 21, 3, inputs_dir=pathlib.Path(tmp))
+      self.assertEqual([p.name for p in paths], ['boss.txt', 'shop.txt'])
+      self.assertEqual([p.read_text() for p in paths], generate(2015, 21, 3))
+
+if __name__ == '__main__':
+  unittest.main()
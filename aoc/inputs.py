@@ -0,0 +1,79 @@
+"""One way to hand any solution its input, whether that is a file, stdin or a buffer already in memory.
+
+Every solve() takes text streams, so all a source has to become is an open TextIO. Nothing is read ahead: a solution
+that consumes its stream as it goes (01, 02, 03, 05 and 08 among others) can be piped inputs larger than memory.
+"""
+import contextlib
+import unittest
+import tempfile
+import pathlib
+import typing
+import sys
+import os
+import io
+
+from aoc.runner import DEFAULT_INPUTS_DIR, Job, input_paths
+from aoc import solutions, generators
+
+STDIN = '-'
+
+# a path, STDIN, raw bytes, or a stream that is already open such as an io.StringIO
+Source: typing.TypeAlias = typing.Union[str, os.PathLike[str], bytes, typing.TextIO]
+
+@contextlib.contextmanager
+def open_source(source: Source) -> typing.Iterator[typing.TextIO]:
+  if isinstance(source, str) and source == STDIN:
+    yield sys.stdin
+  elif isinstance(source, (str, os.PathLike)):
+    with open(source) as f:
+      yield f
+  elif isinstance(source, bytes):
+    yield io.TextIOWrapper(io.BytesIO(source))
+  else:
+    # streams the caller opened stay theirs to close
+    yield source
+
+def solve(job: Job, *sources: Source, inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR) -> typing.Any:
+  """Solves the job from the given sources, or from its files under inputs_dir when there are none. Days whose
+  input is a literal in the solution take a single source in its place."""
+  module = solutions.load(*job)
+  if not sources:
+    sources = tuple(input_paths(job, inputs_dir))
+  if sum(1 for source in sources if isinstance(source, str) and source == STDIN) > 1:
+    raise ValueError('stdin can only be one of the sources')
+    
+  with contextlib.ExitStack() as stack:
+    streams = [stack.enter_context(open_source(source)) for source in sources]
+    return module.solve(*streams)
+
+class Tests(unittest.TestCase):
+  def test_sources(self):
+    text = generators.generate(2015, 2, 50)[0]
+    expected = solutions.load(2015, 2, 1).solve(io.StringIO(text))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+      path = pathlib.Path(tmp) / 'input.txt'
+      path.write_text(text)
+      self.assertEqual(solve(Job(2015, 2, 1), path), expected)
+      self.assertEqual(solve(Job(2015, 2, 1), str(path)), expected)
+      
+    self.assertEqual(solve(Job(2015, 2, 1), text.encode()), expected)
+    self.assertEqual(solve(Job(2015, 2, 1), io.StringIO(text)), expected)
+    
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(text)
+    try:
+      self.assertEqual(solve(Job(2015, 2, 1), STDIN), expected)
+    finally:
+      sys.stdin = stdin
+      
+  def test_literal_days(self):
+    self.assertEqual(solve(Job(2015, 10, 1), b'1\n'), 82350)
+    self.assertEqual(solve(Job(2015, 11, 1), io.StringIO('abcdefgh')), 'abcdffaa')
+    self.assertEqual(solve(Job(2015, 25, 1), b'Enter the code at row 4, column 2.'), 32451966)
+    
+  def test_stdin_once(self):
+    self.assertRaises(ValueError, lambda: solve(Job(2015, 21, 1), STDIN, STDIN))
+
+if __name__ == '__main__':
+  unittest.main()
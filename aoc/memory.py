@@ -0,0 +1,151 @@
+import concurrent.futures
+import multiprocessing
+import contextlib
+import tracemalloc
+import threading
+import unittest
+import tempfile
+import resource
+import pathlib
+import typing
+import sys
+
+from aoc.runner import DEFAULT_INPUTS_DIR, Job, input_paths
+from aoc import solutions
+
+DEFAULT_TOP = 10
+SAMPLE_INTERVAL_SECONDS = 0.005
+SNAPSHOT_GROWTH = 1.1 # only re-snapshot once traced memory grows by 10%, snapshots are not cheap
+
+class Site(typing.TypedDict):
+  location: str # file:line
+  size_bytes: int
+  count: int
+
+class MemoryReport(typing.TypedDict):
+  job: Job
+  answer: typing.Any
+  peak_bytes: int # tracemalloc peak while solving
+  rss_peak_bytes: int # high-water mark of the whole process
+  sites: list[Site] # largest allocation sites live near the peak
+
+def rss_peak_bytes() -> int:
+  rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return rss if sys.platform == 'darwin' else rss * 1024 # kilobytes everywhere else
+
+class _PeakSampler(threading.Thread):
+  """Snapshots tracemalloc from the side whenever traced memory reaches a new high, so the allocation sites reported
+  are the ones alive around the peak rather than whatever survives the call."""
+  
+  def __init__(self) -> None:
+    super().__init__(daemon=True)
+    self.snapshot: typing.Optional[tracemalloc.Snapshot] = None
+    self.snapshot_bytes = 0
+    self.done = threading.Event()
+    
+  def sample(self) -> None:
+    current, _ = tracemalloc.get_traced_memory()
+    if tracemalloc.is_tracing() and current > self.snapshot_bytes * SNAPSHOT_GROWTH:
+      self.snapshot = tracemalloc.take_snapshot()
+      self.snapshot_bytes = current
+      
+  def run(self) -> None:
+    while not self.done.wait(SAMPLE_INTERVAL_SECONDS):
+      self.sample()
+
+def top_sites(snapshot: tracemalloc.Snapshot, top: int = DEFAULT_TOP) -> list[Site]:
+  snapshot = snapshot.filter_traces([
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+  ])
+  return [
+    Site(location=f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}', size_bytes=stat.size, count=stat.count)
+    for stat in snapshot.statistics('lineno')[:top]
+  ]
+
+def trace(
+  fn: typing.Callable[..., typing.Any],
+  *args: typing.Any,
+  top: int = DEFAULT_TOP,
+) -> tuple[typing.Any, int, list[Site]]:
+  """Calls fn(*args) under tracemalloc, returning (result, peak traced bytes, top allocation sites)."""
+  # the sampler starts first so its own bookkeeping stays out of the trace
+  sampler = _PeakSampler()
+  sampler.start()
+  tracemalloc.start()
+  try:
+    result = fn(*args)
+  finally:
+    # short calls finish before the first sample, fall back to what is still alive now
+    sampler.sample()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    snapshot = sampler.snapshot
+    tracemalloc.stop()
+    sampler.done.set()
+    sampler.join()
+    
+  return result, peak_bytes, top_sites(snapshot, top) if snapshot else []
+
+def memory_job(job: Job, *, inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR, top: int = DEFAULT_TOP) -> MemoryReport:
+  module = solutions.load(*job)
+  with contextlib.ExitStack() as stack:
+    streams = [stack.enter_context(open(path)) for path in input_paths(job, inputs_dir)]
+    answer, peak_bytes, sites = trace(module.solve, *streams, top=top)
+    
+  return MemoryReport(job=job, answer=answer, peak_bytes=peak_bytes, rss_peak_bytes=rss_peak_bytes(), sites=sites)
+
+def memory_job_isolated(
+  job: Job,
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  top: int = DEFAULT_TOP,
+) -> MemoryReport:
+  """Like memory_job, but in a freshly spawned process so the RSS high-water mark belongs to this job alone."""
+  context = multiprocessing.get_context('spawn')
+  with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+    return pool.submit(memory_job, job, inputs_dir=inputs_dir, top=top).result()
+
+def format_report(report: MemoryReport) -> str:
+  lines = [
+    f'{report["job"]}: {report["answer"]}  peak {report["peak_bytes"] / 2**20:.2f} MiB  '
+    f'rss {report["rss_peak_bytes"] / 2**20:.2f} MiB'
+  ]
+  for site in report['sites']:
+    lines.append(f'  {site["size_bytes"] / 2**10:10.1f} KiB {site["count"]:8} blocks  {site["location"]}')
+  return '\n'.join(lines)
+
+class Tests(unittest.TestCase):
+  def test_trace(self):
+    def allocate() -> int:
+      blocks = [bytearray(1024) for _ in range(2048)]
+      return len(blocks)
+      
+    result, peak_bytes, sites = trace(allocate, top=3)
+    self.assertEqual(result, 2048)
+    self.assertGreater(peak_bytes, 2 * 2**20)
+    self.assertLessEqual(len(sites), 3)
+    
+  def test_sites_seen_near_peak(self):
+    def allocate_and_drop() -> None:
+      blocks = [bytearray(1024) for _ in range(8192)]
+      threading.Event().wait(SAMPLE_INTERVAL_SECONDS * 10)
+      del blocks
+      
+    _, _, sites = trace(allocate_and_drop)
+    self.assertTrue(sites)
+    self.assertGreater(sites[0]['size_bytes'], 4 * 2**20)
+    self.assertIn('memory.py', sites[0]['location'])
+    
+  def test_memory_job_isolated(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      inputs_dir = pathlib.Path(tmp)
+      (inputs_dir / '2015' / '03').mkdir(parents=True)
+      (inputs_dir / '2015' / '03' / 'input.txt').write_text('^>v<' * 100)
+      
+      report = memory_job_isolated(Job(2015, 3, 1), inputs_dir=inputs_dir)
+      self.assertEqual(report['answer'], 4)
+      self.assertGreater(report['rss_peak_bytes'], report['peak_bytes'])
+      self.assertIn('peak', format_report(report))
+
+if __name__ == '__main__':
+  unittest.main()
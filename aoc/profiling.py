@@ -0,0 +1,155 @@
+import contextlib
+import unittest
+import tempfile
+import pathlib
+import cProfile
+import pstats
+import typing
+import time
+import sys
+import io
+import os
+
+from aoc.runner import DEFAULT_INPUTS_DIR, Job, Result, input_paths
+from aoc import solutions
+
+DEFAULT_PROFILE_DIR = pathlib.Path('profiles')
+DEFAULT_TOP = 20
+MAX_STACK_DEPTH = 64
+
+Func: typing.TypeAlias = tuple[str, int, str] # (file, line, name) as used by pstats
+
+def func_label(func: Func) -> str:
+  file, line, name = func
+  if file == '~':
+    return name # built-in
+  return f'{name} ({os.path.basename(file)}:{line})'
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, int]:
+  """Approximates collapsed stacks (frame;frame;frame -> self microseconds) from the profile's call graph.
+  
+  cProfile only records caller/callee pairs, so each callee's time is split between its call paths in
+  proportion to the time spent in it from each caller. Recursive calls are folded into their first frame.
+  """
+  # func -> (primitive calls, total calls, self time, cumulative time, {caller: (same fields for that edge)})
+  raw: dict[Func, tuple[int, int, float, float, dict[Func, tuple[int, int, float, float]]]] = stats.stats # type: ignore
+  
+  children: dict[Func, list[tuple[Func, float]]] = {}
+  for callee, (_, _, _, _, callers) in raw.items():
+    for caller, (_, _, _, edge_ct) in callers.items():
+      children.setdefault(caller, []).append((callee, edge_ct))
+  
+  stacks: dict[str, int] = {}
+  
+  def walk(func: Func, path: list[Func], share: float) -> None:
+    _, _, tt, ct, _ = raw[func]
+    path.append(func)
+    
+    self_us = int(tt * share * 1_000_000)
+    if self_us > 0:
+      key = ';'.join(func_label(f) for f in path)
+      stacks[key] = stacks.get(key, 0) + self_us
+    
+    if len(path) < MAX_STACK_DEPTH:
+      for child, edge_ct in children.get(func, []):
+        child_ct = raw[child][3]
+        if child in path or not child_ct:
+          continue
+        walk(child, path, share * edge_ct / child_ct)
+    
+    path.pop()
+  
+  for func, (_, _, _, _, callers) in raw.items():
+    if not callers:
+      walk(func, [], 1.0)
+  
+  return stacks
+
+def write_collapsed(stacks: dict[str, int], path: pathlib.Path) -> None:
+  with open(path, 'w') as f:
+    for stack, us in sorted(stacks.items()):
+      f.write(f'{stack} {us}\n')
+
+def profile_job(
+  job: Job,
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  out_dir: pathlib.Path = DEFAULT_PROFILE_DIR,
+  top: int = DEFAULT_TOP,
+  report: typing.TextIO = sys.stdout,
+) -> Result:
+  """Runs the job under cProfile, writing <job>.pstats and <job>.collapsed.txt and printing the top functions. A job
+  that fails is reported in the result's error, with nothing written."""
+  profiler = cProfile.Profile()
+  try:
+    module = solutions.load(*job)
+    with contextlib.ExitStack() as stack:
+      streams = [stack.enter_context(open(path)) for path in input_paths(job, inputs_dir)]
+      start = time.perf_counter()
+      answer = profiler.runcall(module.solve, *streams)
+      seconds = time.perf_counter() - start
+  except Exception as e:
+    return Result(job=job, answer=None, seconds=0.0, cached=False, error=f'{type(e).__name__}: {e}')
+  
+  out_dir.mkdir(parents=True, exist_ok=True)
+  name = f'{job.year}-{job.day:02}.{job.part}'
+  pstats_path = out_dir / f'{name}.pstats'
+  collapsed_path = out_dir / f'{name}.collapsed.txt'
+  
+  profiler.dump_stats(pstats_path)
+  stats = pstats.Stats(profiler, stream=report)
+  write_collapsed(collapsed_stacks(stats), collapsed_path)
+  
+  print(f'== {job}: top {top} by cumulative time ==', file=report)
+  stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+  print(f'== {job}: top {top} by self time ==', file=report)
+  stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+  print(f'profile written to {pstats_path} and {collapsed_path}', file=report)
+  
+  return Result(job=job, answer=answer, seconds=seconds, cached=False, error=None)
+
+class Tests(unittest.TestCase):
+  def test_collapsed_stacks(self):
+    def leaf() -> int:
+      return sum(range(20_000))
+    
+    def branch() -> int:
+      return leaf() + leaf()
+    
+    def root() -> int:
+      return branch() + leaf()
+    
+    profiler = cProfile.Profile()
+    profiler.runcall(root)
+    stacks = collapsed_stacks(pstats.Stats(profiler, stream=io.StringIO()))
+    
+    frames = [stack.split(';') for stack in stacks]
+    self.assertTrue(any(
+      len(f) >= 3 and f[-3].startswith('root') and f[-2].startswith('branch') and f[-1].startswith('leaf')
+      for f in frames
+    ))
+    self.assertTrue(any(len(f) >= 2 and f[-2].startswith('root') and f[-1].startswith('leaf') for f in frames))
+    
+  def test_profile_job(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      inputs_dir = pathlib.Path(tmp) / 'inputs'
+      (inputs_dir / '2015' / '03').mkdir(parents=True)
+      (inputs_dir / '2015' / '03' / 'input.txt').write_text('^>v<' * 100)
+      
+      report = io.StringIO()
+      result = profile_job(Job(2015, 3, 1), inputs_dir=inputs_dir, out_dir=pathlib.Path(tmp), top=5, report=report)
+      
+      self.assertEqual(result['answer'], 4)
+      self.assertTrue((pathlib.Path(tmp) / '2015-03.1.pstats').exists())
+      self.assertIn('count_visited', (pathlib.Path(tmp) / '2015-03.1.collapsed.txt').read_text())
+      self.assertIn('top 5 by self time', report.getvalue())
+      
+      # a bad input is reported rather than raised, so the jobs after it still run
+      (inputs_dir / '2015' / '03' / 'input.txt').write_text('^>x<')
+      result = profile_job(Job(2015, 3, 2), inputs_dir=inputs_dir, out_dir=pathlib.Path(tmp), report=report)
+      self.assertIsNone(result['answer'])
+      self.assertIn('RuntimeError', typing.cast(str, result['error']))
+      self.assertFalse((pathlib.Path(tmp) / '2015-03.2.pstats').exists())
+
+if __name__ == '__main__':
+  unittest.main()
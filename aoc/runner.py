@@ -0,0 +1,144 @@
+import contextlib
+import itertools
+import tempfile
+import unittest
+import pathlib
+import typing
+import time
+
+from aoc.cache import MISSING, Cache, entry_key, file_digest
+from aoc import solutions
+
+DEFAULT_INPUTS_DIR = solutions.ROOT / 'inputs'
+
+class Job(typing.NamedTuple):
+  year: int
+  day: int
+  part: int
+  
+  def __str__(self) -> str:
+    return f'{self.year} {self.day:02}.{self.part}'
+
+class Result(typing.TypedDict):
+  job: Job
+  answer: typing.Any
+  seconds: float
+  cached: bool
+  error: typing.Optional[str]
+
+def input_dir(job: Job, inputs_dir: pathlib.Path) -> pathlib.Path:
+  return inputs_dir / str(job.year) / f'{job.day:02}'
+
+def input_paths(job: Job, inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR) -> list[pathlib.Path]:
+  return [input_dir(job, inputs_dir) / name for name in solutions.input_names(solutions.load(*job))]
+
+def read_inputs(job: Job, inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR) -> list[str]:
+  texts: list[str] = []
+  for path in input_paths(job, inputs_dir):
+    with open(path) as f:
+      texts.append(f.read())
+  return texts
+
+def run_job(
+  job: Job,
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  cache: typing.Optional[Cache] = None,
+) -> Result:
+  try:
+    module = solutions.load(*job)
+    paths = input_paths(job, inputs_dir)
+    
+    key: typing.Optional[str] = None
+    if cache:
+      start = time.perf_counter()
+      key = entry_key('answer', *job, file_digest(paths))
+      answer = cache.get(key)
+      if answer is not MISSING:
+        return Result(job=job, answer=answer, seconds=time.perf_counter() - start, cached=True, error=None)
+    
+    with contextlib.ExitStack() as stack:
+      streams = [stack.enter_context(open(path)) for path in paths]
+      
+      start = time.perf_counter()
+      answer = module.solve(*streams)
+      seconds = time.perf_counter() - start
+      
+    if cache and key:
+      cache.put(key, answer)
+  except Exception as e:
+    return Result(job=job, answer=None, seconds=0.0, cached=False, error=f'{type(e).__name__}: {e}')
+  
+  return Result(job=job, answer=answer, seconds=seconds, cached=False, error=None)
+
+def run(
+  jobs: typing.Iterable[Job],
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  cache: typing.Optional[Cache] = None,
+) -> typing.Iterator[Result]:
+  for job in jobs:
+    yield run_job(job, inputs_dir=inputs_dir, cache=cache)
+
+def make_jobs(year: int, days: typing.Iterable[int], parts: typing.Iterable[int]) -> list[Job]:
+  return [Job(year, day, part) for day, part in itertools.product(days, parts)]
+
+def parse_numbers(spec: str) -> list[int]:
+  """Parses selections like "1-5,7,9" into [1, 2, 3, 4, 5, 7, 9]."""
+  numbers: list[int] = []
+  for chunk in spec.split(','):
+    if not chunk:
+      continue
+    if '-' in chunk:
+      start, stop = chunk.split('-')
+      numbers.extend(range(int(start), int(stop) + 1))
+    else:
+      numbers.append(int(chunk))
+  return sorted(set(numbers))
+
+def format_result(result: Result) -> str:
+  if result['error']:
+    return f'{result["job"]}  ERROR {result["error"]}'
+  return f'{result["job"]}  {result["answer"]}  ({result["seconds"] * 1000:.2f} ms{", cached" if result["cached"] else ""})'
+
+class Tests(unittest.TestCase):
+  def test_parse_numbers(self):
+    self.assertEqual(parse_numbers('1'), [1])
+    self.assertEqual(parse_numbers('1-3'), [1, 2, 3])
+    self.assertEqual(parse_numbers('1-3,7,2'), [1, 2, 3, 7])
+    
+  def test_run_job(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      inputs_dir = pathlib.Path(tmp)
+      (inputs_dir / '2015' / '01').mkdir(parents=True)
+      (inputs_dir / '2015' / '01' / 'input.txt').write_text('(()(()(')
+      
+      result = run_job(Job(2015, 1, 1), inputs_dir=inputs_dir)
+      self.assertEqual(result['answer'], 3)
+      self.assertIsNone(result['error'])
+      
+      # missing input
+      result = run_job(Job(2015, 2, 1), inputs_dir=inputs_dir)
+      self.assertIsNone(result['answer'])
+      self.assertIn('FileNotFoundError', typing.cast(str, result['error']))
+      
+  def test_run_job_cached(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      inputs_dir = pathlib.Path(tmp) / 'inputs'
+      (inputs_dir / '2015' / '01').mkdir(parents=True)
+      (inputs_dir / '2015' / '01' / 'input.txt').write_text('(((')
+      cache = Cache(pathlib.Path(tmp) / 'cache')
+      
+      self.assertFalse(run_job(Job(2015, 1, 1), inputs_dir=inputs_dir, cache=cache)['cached'])
+      result = run_job(Job(2015, 1, 1), inputs_dir=inputs_dir, cache=cache)
+      self.assertTrue(result['cached'])
+      self.assertEqual(result['answer'], 3)
+      
+      # new input, new answer
+      (inputs_dir / '2015' / '01' / 'input.txt').write_text('((')
+      result = run_job(Job(2015, 1, 1), inputs_dir=inputs_dir, cache=cache)
+      self.assertFalse(result['cached'])
+      self.assertEqual(result['answer'], 2)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,100 @@
+import concurrent.futures
+import tempfile
+import unittest
+import pathlib
+import typing
+import signal
+import json
+
+from aoc.runner import DEFAULT_INPUTS_DIR, Job, Result, run_job
+from aoc.cache import CACHE_DIR, Cache
+HISTORY_PATH = CACHE_DIR / 'history.json'
+
+class JobTimeout(Exception): pass
+
+History: typing.TypeAlias = dict[str, float]
+
+def load_history(path: pathlib.Path = HISTORY_PATH) -> History:
+  try:
+    with open(path) as f:
+      return json.load(f)
+  except (FileNotFoundError, json.JSONDecodeError):
+    return {}
+
+def save_history(history: History, path: pathlib.Path = HISTORY_PATH) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with open(path, 'w') as f:
+    json.dump(history, f, indent=2, sort_keys=True)
+
+def record(history: History, result: Result) -> None:
+  if not result['error'] and not result['cached']:
+    history[str(result['job'])] = result['seconds']
+
+def longest_first(jobs: typing.Iterable[Job], history: History) -> list[Job]:
+  # jobs we have never timed go first, they may well be the slowest
+  return sorted(jobs, key=lambda job: -history.get(str(job), float('inf')))
+
+def _run_job_with_timeout(
+  job: Job,
+  inputs_dir: pathlib.Path,
+  timeout: typing.Optional[float],
+  cache: typing.Optional[Cache],
+) -> Result:
+  if not timeout:
+    return run_job(job, inputs_dir=inputs_dir, cache=cache)
+  
+  # runs in a worker process, so the alarm only interrupts this job
+  def on_alarm(signum: int, frame: typing.Any) -> None:
+    raise JobTimeout(f'exceeded {timeout}s')
+  
+  previous = signal.signal(signal.SIGALRM, on_alarm)
+  signal.setitimer(signal.ITIMER_REAL, timeout)
+  try:
+    return run_job(job, inputs_dir=inputs_dir, cache=cache)
+  finally:
+    signal.setitimer(signal.ITIMER_REAL, 0)
+    signal.signal(signal.SIGALRM, previous)
+
+def run_parallel(
+  jobs: typing.Iterable[Job],
+  *,
+  inputs_dir: pathlib.Path = DEFAULT_INPUTS_DIR,
+  workers: typing.Optional[int] = None,
+  timeout: typing.Optional[float] = None,
+  history: typing.Optional[History] = None,
+  cache: typing.Optional[Cache] = None,
+) -> typing.Iterator[Result]:
+  """Yields results as they finish, dispatching the historically slowest jobs first."""
+  ordered = longest_first(jobs, history if history is not None else load_history())
+  
+  with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+    futures = [executor.submit(_run_job_with_timeout, job, inputs_dir, timeout, cache) for job in ordered]
+    for future in concurrent.futures.as_completed(futures):
+      yield future.result()
+
+class Tests(unittest.TestCase):
+  def test_longest_first(self):
+    jobs = [Job(2015, 1, 1), Job(2015, 4, 2), Job(2015, 20, 1)]
+    history = {'2015 01.1': 0.001, '2015 04.2': 2.5}
+    self.assertEqual(longest_first(jobs, history), [Job(2015, 20, 1), Job(2015, 4, 2), Job(2015, 1, 1)])
+    
+  def test_run_parallel(self):
+    results = list(run_parallel([Job(2015, 10, 1), Job(2015, 25, 1)], workers=2, timeout=0.01, history={}))
+    self.assertEqual(len(results), 2)
+    for result in results:
+      self.assertIn('JobTimeout', typing.cast(str, result['error']))
+    
+  def test_history(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      path = pathlib.Path(tmp) / 'history.json'
+      self.assertEqual(load_history(path), {})
+      
+      history: History = {}
+      record(history, Result(job=Job(2015, 1, 1), answer=1, seconds=0.5, cached=False, error=None))
+      record(history, Result(job=Job(2015, 1, 2), answer=None, seconds=0.0, cached=False, error='RuntimeError'))
+      record(history, Result(job=Job(2015, 2, 1), answer=1, seconds=0.0, cached=True, error=None))
+      save_history(history, path)
+      self.assertEqual(load_history(path), {'2015 01.1': 0.5})
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,134 @@
+import importlib.machinery
+import importlib.util
+import importlib.abc
+import unittest
+import pathlib
+import typing
+import types
+import sys
+import re
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+DEFAULT_INPUTS = ['input.txt']
+
+# aoc.y2015 -> 2015/, aoc.y2015.day18 -> 2015/18.*.py, aoc.y2015.day18.part2 -> 2015/18.2.py
+MODULE_NAME_PATTERN = re.compile(r'aoc\.y(\d{4})(?:\.day(\d{2})(?:\.part(\d))?)?')
+SOLUTION_NAME_PATTERN = re.compile(r'\d{2}\.\d\.py')
+
+class SolutionNotFound(Exception): pass
+
+def solution_path(year: int, day: int, part: int) -> pathlib.Path:
+  return ROOT / str(year) / f'{day:02}.{part}.py'
+
+def module_name(year: int, day: int, part: int) -> str:
+  return f'aoc.y{year}.day{day:02}.part{part}'
+
+def year_directories() -> list[pathlib.Path]:
+  return sorted(path for path in ROOT.glob('[0-9][0-9][0-9][0-9]') if path.is_dir())
+
+def shared_module_paths(year: int) -> list[pathlib.Path]:
+  """The modules next to a year's solutions that they import by name, like 2015/search.py."""
+  return sorted(path for path in (ROOT / str(year)).glob('*.py') if not SOLUTION_NAME_PATTERN.fullmatch(path.name))
+
+def shared_modules(year: int) -> list[str]:
+  return [path.stem for path in shared_module_paths(year)]
+
+class SolutionFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+  """Exposes the NN.P.py solution scripts, whose names are not valid identifiers, as aoc.yYYYY.dayNN.partP.
+  
+  Top level imports no other finder resolves are looked up in the year directories, so the modules solutions share
+  there import the same way they do when a script is run directly, with its own directory first on sys.path.
+  """
+  
+  def __init__(self, search_path: typing.Optional[list[pathlib.Path]] = None) -> None:
+    self.search_path = search_path
+    
+  def find_spec(
+    self,
+    fullname: str,
+    path: typing.Optional[typing.Sequence[str]],
+    target: typing.Optional[types.ModuleType] = None,
+  ) -> typing.Optional[importlib.machinery.ModuleSpec]:
+    if '.' not in fullname:
+      directories = self.search_path if self.search_path is not None else year_directories()
+      return importlib.machinery.PathFinder.find_spec(fullname, [str(directory) for directory in directories])
+    
+    match = MODULE_NAME_PATTERN.fullmatch(fullname)
+    if not match:
+      return None
+    
+    year, day, part = match.groups()
+    if part:
+      file = solution_path(int(year), int(day), int(part))
+      return importlib.util.spec_from_file_location(fullname, file) if file.exists() else None
+    
+    # year and day are empty packages that only hold their parts
+    directory = ROOT / year
+    if not directory.is_dir() or (day and not any(directory.glob(f'{day}.[0-9].py'))):
+      return None
+    return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+  
+  def create_module(self, spec: importlib.machinery.ModuleSpec) -> typing.Optional[types.ModuleType]:
+    return None
+  
+  def exec_module(self, module: types.ModuleType) -> None:
+    module.__path__ = []
+
+def install() -> None:
+  if not any(isinstance(finder, SolutionFinder) for finder in sys.meta_path):
+    sys.meta_path.append(SolutionFinder())
+
+def load(year: int, day: int, part: int) -> types.ModuleType:
+  path = solution_path(year, day, part)
+  if not path.exists():
+    raise SolutionNotFound(f'No solution for {year} day {day} part {part}: {path}')
+  
+  install()
+  return importlib.import_module(module_name(year, day, part))
+
+def input_names(module: types.ModuleType) -> list[str]:
+  """Returns the input files the module's solve() takes, in argument order."""
+  return typing.cast(list[str], getattr(module, 'INPUTS', DEFAULT_INPUTS))
+
+def available(year: int) -> list[tuple[int, int]]:
+  parts: list[tuple[int, int]] = []
+  for path in sorted((ROOT / str(year)).glob('[0-9][0-9].[0-9].py')):
+    day, part, _ = path.name.split('.')
+    parts.append((int(day), int(part)))
+  return parts
+
+class Tests(unittest.TestCase):
+  def test_import(self):
+    import aoc.y2015.day18.part2 as day18_part2
+    from aoc.y2015.day14 import part1 as day14_part1
+    
+    self.assertEqual(day18_part2.__name__, 'aoc.y2015.day18.part2')
+    self.assertTrue(callable(day18_part2.solve))
+    self.assertTrue(callable(day14_part1.calc_distance))
+    self.assertIs(load(2015, 18, 2), day18_part2)
+    
+  def test_import_has_no_side_effects(self):
+    argv = sys.argv
+    sys.argv = [argv[0], '--not-a-solution-flag']
+    try:
+      for day, part in available(2015):
+        sys.modules.pop(module_name(2015, day, part), None)
+        load(2015, day, part)
+    finally:
+      sys.argv = argv
+      
+  def test_shared_modules(self):
+    install()
+    self.assertIn('search', shared_modules(2015))
+    self.assertNotIn('18.2', shared_modules(2015))
+    search = importlib.import_module('search')
+    self.assertEqual(pathlib.Path(typing.cast(str, search.__file__)), ROOT / '2015' / 'search.py')
+    self.assertIs(load(2015, 9, 1).search, search)
+    
+  def test_not_found(self):
+    self.assertRaises(SolutionNotFound, lambda: load(2015, 26, 1))
+    self.assertRaises(ModuleNotFoundError, lambda: importlib.import_module('aoc.y2015.day26'))
+    self.assertIsNone(SolutionFinder([ROOT / '2015']).find_spec('not_a_shared_module', None))
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,194 @@
+import xml.etree.ElementTree as ElementTree
+import concurrent.futures
+import traceback
+import importlib
+import unittest
+import tempfile
+import pkgutil
+import pathlib
+import typing
+import types
+import time
+
+from aoc.runner import Job
+from aoc.cache import CACHE_DIR
+from aoc import scheduler, solutions
+
+TEST_HISTORY_PATH = CACHE_DIR / 'test-history.json'
+
+# a unit is either a solution, one of the modules the solutions share, named like search, or one of the harness's own
+# modules, named like aoc.bench
+Unit: typing.TypeAlias = typing.Union[Job, str]
+
+class Case(typing.NamedTuple):
+  unit: Unit
+  name: str # test method on the unit's Tests class
+  
+  def __str__(self) -> str:
+    return f'{self.unit} {self.name}'
+
+class CaseResult(typing.TypedDict):
+  case: Case
+  status: str # passed, failure, error or skipped, as junit names them
+  seconds: float
+  message: typing.Optional[str]
+
+def harness_units() -> list[str]:
+  import aoc
+  return [f'aoc.{m.name}' for m in pkgutil.iter_modules(aoc.__path__) if not m.name.startswith('_')]
+
+def load_unit(unit: Unit) -> types.ModuleType:
+  if isinstance(unit, str):
+    solutions.install() # shared modules next to the solutions are only found through it
+    return importlib.import_module(unit)
+  return solutions.load(*unit)
+
+def discover(units: typing.Iterable[Unit]) -> list[Case]:
+  """Lists every test method of every unit's Tests class, units without one are skipped."""
+  cases: list[Case] = []
+  for unit in units:
+    tests = getattr(load_unit(unit), 'Tests', None)
+    if tests is None:
+      continue
+    cases.extend(Case(unit, name) for name in unittest.defaultTestLoader.getTestCaseNames(tests))
+  return cases
+
+class _Result(unittest.TestResult):
+  def __init__(self) -> None:
+    super().__init__()
+    self.status = 'passed'
+    self.message: typing.Optional[str] = None
+    
+  def addFailure(self, test: unittest.TestCase, err: typing.Any) -> None:
+    self.status, self.message = 'failure', ''.join(traceback.format_exception(*err))
+    
+  def addError(self, test: unittest.TestCase, err: typing.Any) -> None:
+    self.status, self.message = 'error', ''.join(traceback.format_exception(*err))
+    
+  def addSkip(self, test: unittest.TestCase, reason: str) -> None:
+    self.status, self.message = 'skipped', reason
+    
+  def addSubTest(self, test: unittest.TestCase, subtest: unittest.TestCase, err: typing.Any) -> None:
+    if err is not None:
+      self.status, self.message = 'failure', f'{subtest}\n' + ''.join(traceback.format_exception(*err))
+
+def run_case(case: Case) -> CaseResult:
+  result = _Result()
+  start = time.perf_counter()
+  try:
+    load_unit(case.unit).Tests(case.name).run(result)
+  except Exception as e:
+    # the unit itself failed to import
+    result.status, result.message = 'error', f'{type(e).__name__}: {e}'
+  return CaseResult(case=case, status=result.status, seconds=time.perf_counter() - start, message=result.message)
+
+def run_parallel(
+  cases: typing.Iterable[Case],
+  *,
+  workers: typing.Optional[int] = None,
+  history: typing.Optional[scheduler.History] = None,
+) -> typing.Iterator[CaseResult]:
+  """Yields results as they finish, dispatching the historically slowest tests first."""
+  history = history if history is not None else {}
+  ordered = sorted(cases, key=lambda case: -history.get(str(case), float('inf')))
+  
+  with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+    futures = [executor.submit(run_case, case) for case in ordered]
+    for future in concurrent.futures.as_completed(futures):
+      yield future.result()
+
+def junit_xml(results: list[CaseResult], *, seconds: float) -> ElementTree.ElementTree:
+  def count(status: str, of: list[CaseResult]) -> str:
+    return str(sum(1 for r in of if r['status'] == status))
+    
+  by_unit: dict[str, list[CaseResult]] = {}
+  for result in results:
+    by_unit.setdefault(str(result['case'].unit), []).append(result)
+    
+  root = ElementTree.Element(
+    'testsuites',
+    tests=str(len(results)),
+    failures=count('failure', results),
+    errors=count('error', results),
+    skipped=count('skipped', results),
+    time=f'{seconds:.3f}',
+  )
+  for unit, unit_results in sorted(by_unit.items()):
+    suite = ElementTree.SubElement(
+      root,
+      'testsuite',
+      name=unit,
+      tests=str(len(unit_results)),
+      failures=count('failure', unit_results),
+      errors=count('error', unit_results),
+      skipped=count('skipped', unit_results),
+      time=f'{sum(r["seconds"] for r in unit_results):.3f}',
+    )
+    for result in sorted(unit_results, key=lambda r: r['case'].name):
+      case = ElementTree.SubElement(
+        suite,
+        'testcase',
+        classname=f'{unit}.Tests',
+        name=result['case'].name,
+        time=f'{result["seconds"]:.3f}',
+      )
+      if result['status'] != 'passed':
+        message = result['message'] or ''
+        last_line = message.strip().splitlines()[-1] if message.strip() else ''
+        detail = ElementTree.SubElement(case, result['status'], message=last_line)
+        detail.text = message
+  return ElementTree.ElementTree(root)
+
+def format_result(result: CaseResult) -> str:
+  return f'{result["case"]}  {result["status"].upper()}  ({result["seconds"] * 1000:.2f} ms)'
+
+def format_summary(results: list[CaseResult], *, seconds: float) -> str:
+  counts = {status: sum(1 for r in results if r['status'] == status) for status in ('failure', 'error', 'skipped')}
+  cpu_seconds = sum(r['seconds'] for r in results)
+  lines = [
+    f'{result["case"]}  {result["status"].upper()}\n{result["message"]}'
+    for result in results
+    if result['status'] in ('failure', 'error')
+  ]
+  lines.append(
+    f'{len(results)} tests, {counts["failure"]} failures, {counts["error"]} errors, {counts["skipped"]} skipped '
+    f'in {seconds:.2f} s ({cpu_seconds:.2f} s of test time)'
+  )
+  return '\n'.join(lines)
+
+class Tests(unittest.TestCase):
+  def test_discover(self):
+    cases = discover([Job(2015, 6, 1), Job(2015, 4, 1), 'aoc.runner'])
+    self.assertIn(Case(Job(2015, 6, 1), 'test_count_lit_cnt'), cases)
+    self.assertFalse(any(case.unit == Job(2015, 4, 1) for case in cases)) # no Tests class
+    self.assertTrue(any(case.unit == 'aoc.runner' for case in cases))
+    self.assertIn('aoc.bench', harness_units())
+    
+  def test_run_parallel(self):
+    cases = [Case(Job(2015, 10, 1), 'test_look_and_say'), Case(Job(2015, 10, 1), 'test_missing')]
+    results = sorted(run_parallel(cases, workers=2), key=lambda r: r['case'].name)
+    self.assertEqual([r['status'] for r in results], ['passed', 'error'])
+    
+  def test_junit_xml(self):
+    results = [
+      CaseResult(case=Case(Job(2015, 6, 1), 'test_a'), status='passed', seconds=0.5, message=None),
+      CaseResult(
+        case=Case(Job(2015, 6, 1), 'test_b'),
+        status='failure',
+        seconds=0.25,
+        message='Traceback\nAssertionError: 1 != 2',
+      ),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+      path = pathlib.Path(tmp) / 'junit.xml'
+      junit_xml(results, seconds=1.0).write(path)
+      root = ElementTree.parse(path).getroot()
+      
+    self.assertEqual((root.get('tests'), root.get('failures')), ('2', '1'))
+    failure = root.find('testsuite/testcase[@name="test_b"]/failure')
+    assert failure is not None
+    self.assertEqual(failure.get('message'), 'AssertionError: 1 != 2')
+    self.assertIn('1 failures', format_summary(results, seconds=1.0))
+
+if __name__ == '__main__':
+  unittest.main()